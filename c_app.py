@@ -11,11 +11,13 @@
 #     os.environ["PATH"] = dll_dir + os.pathsep + os.environ["PATH"]
 
 import platform
+import multiprocessing
 from PySide6 import QtCore
 from PySide6.QtWidgets import QApplication
 import datetime
 import c_mainwindow
 import c_jobControl
+import c_capture
 import xml.etree.ElementTree as elemenTree
 import re
 import time
@@ -31,64 +33,83 @@ c_modules_Right = {}
 
 # Persistent camera connection settings
 CAMERA_PERSISTENT = True
-_camera_connected = {'Left': False, 'Right': False}
-_FIRST_SHOT_DONE = {'Left': False, 'right': False}
+
+# 좌/우 카메라 병렬 촬영 (_capture_both)
+# - 두 카메라는 독립 장치이므로 _capture_side 2개를 워커 스레드 2개에서 동시에 실행하고,
+#   각 촬영이 끝나는 즉시 done 플래그를 세팅합니다. (c_capture.DualCapture)
+# - 카메라별 lock으로 같은 카메라에 대한 연결/촬영 호출은 항상 직렬화됩니다.
+CAPTURE_PARALLEL = True
+
+
+def _camera_connect_handler(side: str):
+    # Call UI connect handlers (flags are set by DualCapture)
+    if side == 'Left':
+        mainWindow.on_pb_Camera_Connect_Left_clicked()
+    elif side == 'Right':
+        mainWindow.on_pb_Camera_Connect_Right_clicked()
+
+
+def _shoot(side: str):
+    """
+    촬영 1회 (DualCapture가 카메라 lock 안에서 호출)
+    - 카메라 저장(mainWindow._save_barcode_image) 후, 메모리 파이프라인이 활성이면 프레임을 메모리로 적재
+      (mainWindow.grab_barcode_frame hook이 있으면 파일 저장 없이 프레임만 받음)
+    - 적재에 실패한 side는 기존 파일 경로(SaveAndScan)로 디코드됩니다. (_scan_barcodes)
+    """
+    pipeline = jobControl.barcode_pipeline
+    if not pipeline.active or pipeline.reads_saved_image:
+        mainWindow._save_barcode_image(side)
+    if pipeline.active:
+        try:
+            pipeline.capture(side)
+        except Exception as e:
+            print(f'[Camera] {side} frame not loaded into pipeline, using file scan: {e}')
+            pipeline.discard(side)
+
+
+_camera = c_capture.DualCapture(shoot=_shoot, connect=_camera_connect_handler,
+                                parallel=CAPTURE_PARALLEL, persistent=CAMERA_PERSISTENT)
+_camera_connected = _camera.connected
+_FIRST_SHOT_DONE = _camera.first_shot_done
+_camera_locks = _camera.locks
+_capture_latency_ms = _camera.latency_ms   # 마지막 촬영 소요 시간 (ms)
+
 
 def _connect_camera(side: str):
-    # Call UI connect handlers and set flags
-    try:
-        if side == 'Left':
-            mainWindow.on_pb_Camera_Connect_Left_clicked()
-            _camera_connected['Left'] = True
-            print('[Camera] Left connect requested (persistent)')
-        elif side == 'Right':
-            mainWindow.on_pb_Camera_Connect_Right_clicked()
-            _camera_connected['Right'] = True
-            print('[Camera] Right connect requested (persistent)')
-    except Exception as e:
-        print(f'[Camera] Failed to connect {side}: {e}')
+    _camera.connect(side)
 
 def _ensure_camera_connected(side: str):
-    if not _camera_connected.get(side, False):
-        _connect_camera(side)
+    _camera.ensure_connected(side)
+
+
+def _save_barcode_image(side: str):
+    """카메라별 lock 안에서 촬영 1회 (done 플래그는 호출 측에서 세팅)"""
+    with _camera_locks[side]:
+        _shoot(side)
+
+
+def _scan_barcodes(side: str, value_order: int):
+    """
+    촬영된 이미지를 디코드해 모듈 테이블의 value_order 칸에 반영
+    - 메모리 파이프라인: 보관된 프레임을 바로 디코드 (SaveAndScan의 파일 재디코드/결과 파일 왕복 없음)
+    - 기존 경로(파이프라인 비활성 또는 프레임 적재 실패): SaveAndScan_<side> → barcode/<side>.txt → Parse_Barcode_File
+    """
+    if jobControl.barcode_pipeline.has_frame(side):
+        jobControl.barcode_pipeline.decode(side, value_order)
+    elif side == 'Left':
+        mainWindow.SaveAndScan_Left()
+        mainWindow.Parse_Barcode_File(side='Left', value_order=value_order)
+    else:
+        mainWindow.SaveAndScan_Right()
+        mainWindow.Parse_Barcode_File(side='Right', value_order=value_order)
 
 
 def _capture_side(side: str):
-    if CAMERA_PERSISTENT:
-        _ensure_camera_connected(side)
-    try:
-        # 촬영 요청
-        mainWindow._save_barcode_image(side)
-        # NOTE:
-        # - 동기(Blocking) 촬영이라면, 이 시점에서 이미 저장 완료 상태이므로 아래에서 Done 플래그를 바로 True로 세팅해도 됨.
-        # - 비동기(Non-Blocking) 촬영이라면, 아래의 True 세팅을 제거하고,
-        #   mainWindow._save_barcode_image 내부(또는 그 함수가 트리거하는 저장 완료 시그널의 슬롯)에서
-        #   _FIRST_SHOT_DONE[side] = True, jobControl.clsInfo['left/right_capture_done']=True 를 세팅하세요.
-        _FIRST_SHOT_DONE[side] = True
-        if side == 'Left':
-            jobControl.clsInfo['left_capture_done'] = True
-        else:
-            jobControl.clsInfo['right_capture_done'] = True
-    except Exception as e:
-        print(f'[Camera] Capture failed on {side}, retrying with connect: {e}')
-        _connect_camera(side)
-        mainWindow._save_barcode_image(side)
-        _FIRST_SHOT_DONE[side] = True
-        if side == 'Left':
-            jobControl.clsInfo['left_capture_done'] = True
-        else:
-            jobControl.clsInfo['right_capture_done'] = True
+    _camera.capture_side(side)
 
 def _capture_both():
-    # 촬영 시작 전 초기화
-    _FIRST_SHOT_DONE['Left'] = False
-    _FIRST_SHOT_DONE['Right'] = False
-    jobControl.clsInfo['left_capture_done'] = False
-    jobControl.clsInfo['right_capture_done'] = False
-
-    # 순차 촬영(필요 시 병렬화 가능하나, 하드웨어/스레딩 안전성 검토 필요)
-    _capture_side("Left")
-    _capture_side("Right")
+    # 촬영 시작 전 초기화 + 좌/우 동시 촬영
+    _camera.capture_both()
 
 
 @QtCore.Slot(str, str, dict)
@@ -236,6 +257,7 @@ def slotParse(objName, msgType, values):
                 jobControl.clsInfo['left_capture_done'] = False
                 jobControl.clsInfo['right_capture_done'] = False
                 jobControl.clsInfo['1st_image_scan'] = False
+                jobControl.barcode_pipeline.reset()
 
             elif 'msg' in values and values['msg'] == 'Barcode read':
                 mainWindow.update_text_browser(objName=objName, msgType=msgType, values=values)
@@ -243,11 +265,11 @@ def slotParse(objName, msgType, values):
                 if CAMERA_PERSISTENT:
                     _capture_both()
                 else:
-                    mainWindow._save_barcode_image("Left")
+                    _save_barcode_image("Left")
                     _FIRST_SHOT_DONE['Left'] = True
                     jobControl.clsInfo['left_capture_done'] = True
 
-                    mainWindow._save_barcode_image("Right")
+                    _save_barcode_image("Right")
                     _FIRST_SHOT_DONE['Right'] = True
                     jobControl.clsInfo['right_capture_done'] = True
 
@@ -256,15 +278,13 @@ def slotParse(objName, msgType, values):
 
 
             elif 'msg' in values and values['msg'] == 'Pusher front':
-                mainWindow.SaveAndScan_Left()
-                mainWindow.Parse_Barcode_File(side='Left', value_order=3)
+                _scan_barcodes('Left', value_order=3)
                 mainWindow.update_ui_array(side='Left', step=2)
                 mainWindow.open_barcode_compare()
                 jobControl.clsInfo['1st_left_barcode'] = True
 
             elif 'msg' in values and values['msg'] == '1st_left_barcode_OK':
-                mainWindow.SaveAndScan_Right()
-                mainWindow.Parse_Barcode_File(side='Right', value_order=3)
+                _scan_barcodes('Right', value_order=3)
                 mainWindow.update_ui_array(side='Right', step=2)
                 mainWindow.open_barcode_compare()
                 jobControl.clsInfo['1st_right_barcode'] = True
@@ -294,21 +314,19 @@ def slotParse(objName, msgType, values):
                     _capture_both()
                 else:
                     # mainWindow.on_pb_Camera_Connect_Left_clicked()
-                    mainWindow._save_barcode_image("Left")
+                    _save_barcode_image("Left")
                     # mainWindow.on_pb_Camera_Connect_Right_clicked()
-                    mainWindow._save_barcode_image("Right")
+                    _save_barcode_image("Right")
                 jobControl.clsInfo['3rd_shot'] = True
 
             elif 'msg' in values and values['msg'] == '3rd left barcode':
-                mainWindow.SaveAndScan_Left()
-                mainWindow.Parse_Barcode_File(side='Left', value_order=6)
+                _scan_barcodes('Left', value_order=6)
                 mainWindow.update_ui_array(side='Left', step=5)
                 mainWindow.open_barcode_compare()
                 jobControl.clsInfo['3rd_left_barcode'] = True
 
             elif 'msg' in values and values['msg'] == '3rd_left_barcode_OK':
-                mainWindow.SaveAndScan_Right()
-                mainWindow.Parse_Barcode_File(side='Right', value_order=6)
+                _scan_barcodes('Right', value_order=6)
                 mainWindow.update_ui_array(side='Right', step=5)
                 mainWindow.open_barcode_compare()
                 jobControl.clsInfo['3rd_right_barcode'] = True
@@ -383,22 +401,29 @@ def update_mainwindow_dict():
     print(f'c_app_right: {mainWindow.modules_Right}')
     jobControl.clsInfo['sensor_dict update'] = True
 
-app = QApplication([])
-mainWindow = c_mainwindow.MainWindow(appVer, baseDir, objName= 'mainWindow')
-mainWindow.signalMessage.connect(slotParse)
+# 디코드 풀(c_barcode_decode)의 워커 프로세스(spawn)가 이 모듈을 다시 import해도 UI가 뜨지 않도록 가드
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+
+    app = QApplication([])
+    mainWindow = c_mainwindow.MainWindow(appVer, baseDir, objName= 'mainWindow')
+    mainWindow.signalMessage.connect(slotParse)
 
-systemName = platform.system()
+    systemName = platform.system()
 
-if systemName == 'Linux' :
-    mainWindow.showFullscreen()
+    if systemName == 'Linux' :
+        mainWindow.showFullscreen()
 
-elif systemName == 'Windows':
-    pass
+    elif systemName == 'Windows':
+        pass
 
 
-jobControl = c_jobControl.JobController(baseDir, objName='jobManager', mainWindow=mainWindow)
-jobControl.signalMessage.connect(slotParse)
+    jobControl = c_jobControl.JobController(baseDir, objName='jobManager', mainWindow=mainWindow)
+    jobControl.signalMessage.connect(slotParse)
+    _camera.attach(jobControl.clsInfo, jobControl.tracer)
 
 
-mainWindow.show()
-app.exec()
+    mainWindow.show()
+    app.exec()
+    _camera.shutdown()
+    jobControl.barcode_pipeline.stop()
@@ -0,0 +1,223 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from pylibdmtx import pylibdmtx
+except ImportError:   # 디코드 풀은 pylibdmtx가 있을 때만 사용 (없으면 mainWindow 디코더 유지)
+    pylibdmtx = None
+
+# (key, x0, y0, x1, y1) - 프레임 픽셀 좌표, x1/y1 미포함
+Roi = Tuple[str, int, int, int, int]
+
+
+# region 워커 프로세스 측 (모듈 수준 함수만 pickle 가능)
+_worker_decode: Optional[Callable] = None
+_worker_locate: Optional[Callable] = None
+_worker_timeout_ms: Optional[int] = None
+
+
+def _dmtx_decode(pixels: bytes, width: int, height: int, timeout_ms=None) -> Optional[str]:
+    """패치 1개 DataMatrix 디코드 (첫 번째 코드만)"""
+    found = pylibdmtx.decode((pixels, width, height), max_count=1, timeout=timeout_ms)
+    return found[0].data.decode('utf-8', 'replace') if found else None
+
+
+def _dmtx_locate(pixels: bytes, width: int, height: int, timeout_ms=None, max_count=None) -> list:
+    """
+    전체 프레임 검색: [(text, x0, y0, x1, y1), ...] (ROI 보정용)
+    - libdmtx의 rect.top은 이미지 아래쪽 기준이므로 위쪽 기준 좌표로 변환합니다.
+    """
+    found = pylibdmtx.decode((pixels, width, height), max_count=max_count, timeout=timeout_ms)
+    result = []
+    for item in found:
+        rect = item.rect
+        y1 = height - rect.top
+        result.append((item.data.decode('utf-8', 'replace'),
+                       rect.left, y1 - rect.height, rect.left + rect.width, y1))
+    return result
+
+
+def _worker_init(decode_func, timeout_ms, locate_func=None):
+    """워커 시작 시 1회: 디코더 라이브러리 로드 + 빈 패치로 워밍업 (이후 호출은 초기화 비용 없음)"""
+    global _worker_decode, _worker_locate, _worker_timeout_ms
+    _worker_decode = decode_func
+    _worker_locate = locate_func
+    _worker_timeout_ms = timeout_ms
+    try:
+        decode_func(bytes(16 * 16), 16, 16, timeout_ms)
+    except Exception:
+        pass
+
+
+def _worker_decode_patch(key: str, pixels: bytes, width: int, height: int):
+    start = time.perf_counter()
+    try:
+        text = _worker_decode(pixels, width, height, _worker_timeout_ms)
+    except Exception as e:
+        print(f"[DecodePool] {key} decode error: {e}")
+        text = None
+    return key, text, (time.perf_counter() - start) * 1000, os.getpid()
+
+
+def _worker_locate_frame(pixels: bytes, width: int, height: int, max_count: int):
+    return _worker_locate(pixels, width, height, None, max_count)
+
+
+def _worker_ping():
+    return os.getpid()
+# endregion
+
+
+def frame_size(frame) -> Tuple[int, int]:
+    """(width, height). frame은 numpy 배열(H, W[, C]) 또는 (pixels, width, height) 튜플"""
+    if hasattr(frame, 'shape'):
+        return int(frame.shape[1]), int(frame.shape[0])
+    return int(frame[1]), int(frame[2])
+
+
+def extract_patch(frame, x0: int, y0: int, x1: int, y1: int) -> Tuple[bytes, int, int]:
+    """ROI 영역을 (pixels, width, height)로 잘라냄 (pylibdmtx 입력 형식, 채널 수는 bytes 길이로 판별됨)"""
+    width, height = frame_size(frame)
+    x0, y0 = max(0, x0), max(0, y0)
+    x1, y1 = min(width, x1), min(height, y1)
+    if x1 <= x0 or y1 <= y0:
+        return b'', 0, 0
+    if hasattr(frame, 'shape'):
+        return frame[y0:y1, x0:x1].tobytes(), x1 - x0, y1 - y0
+    pixels, _, _ = frame
+    view = memoryview(pixels)
+    bpp = len(view) // (width * height)
+    stride = width * bpp
+    rows = [view[y * stride + x0 * bpp: y * stride + x1 * bpp] for y in range(y0, y1)]
+    return b''.join(rows), x1 - x0, y1 - y0
+
+
+def layout_rois(keys: List[str], width: int, height: int, overlap: float = 0.1) -> List[Roi]:
+    """
+    보정된 ROI가 없을 때의 기본 캐리어 배치: 모듈을 프레임의 긴 축 방향으로 같은 간격으로 나눈 띠.
+    - overlap: 이웃 띠와 겹치는 비율 (경계에 걸친 코드 대비)
+    """
+    count = len(keys)
+    if count == 0:
+        return []
+    vertical = height >= width
+    span = height if vertical else width
+    step = span / count
+    pad = int(step * overlap)
+    rois = []
+    for i, key in enumerate(keys):
+        a = max(0, int(i * step) - pad)
+        b = min(span, int((i + 1) * step) + pad)
+        rois.append((key, 0, a, width, b) if vertical else (key, a, 0, b, height))
+    return rois
+
+
+class DecodePool:
+    """
+    모듈 ROI 단위 DataMatrix 병렬 디코드 (상주 프로세스 풀).
+    - 워커는 시작 시 디코더를 로드/워밍업한 뒤 계속 유지되므로 사이클마다 초기화 비용이 없습니다.
+    - submit(side, frame, rois): ROI 패치를 잘라 워커에 분배하고, 모든 패치가 끝나면
+      {'Module1': text 또는 None, ...}(ROI 순서 = 모듈 순서)로 완료되는 Future를 반환합니다.
+      GUI 스레드는 기다리지 않으며, 좌/우 프레임을 연달아 submit하면 두 쪽 디코드가 겹쳐서 진행됩니다.
+    - retry_rois를 주면 1차에서 읽지 못한 모듈만 확대 ROI로 1회 더 디코드합니다.
+    - locate(frame, max_count): 전체 프레임 검색 (ROI 보정용, 코드 위치 포함)
+    - 워커는 spawn 방식으로 시작합니다. (메인 스크립트는 if __name__ == '__main__' 가드 필요)
+    """
+
+    def __init__(self, workers: Optional[int] = None, timeout_ms: Optional[int] = None,
+                 decode_func: Callable = _dmtx_decode, locate_func: Callable = _dmtx_locate):
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.timeout_ms = timeout_ms
+        self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context('spawn'),
+                                             initializer=_worker_init,
+                                             initargs=(decode_func, timeout_ms, locate_func))
+        self._lock = threading.Lock()
+        self.last_stats: Dict[str, dict] = {}   # side -> {'wall_ms', 'patch_ms': {key: ms}, 'workers'}
+
+    @staticmethod
+    def available() -> bool:
+        return pylibdmtx is not None
+
+    def warm_up(self):
+        """워커를 모두 미리 띄움 (초기화/워밍업을 첫 사이클 전에 끝냄)"""
+        for future in [self._executor.submit(_worker_ping) for _ in range(self.workers)]:
+            future.result()
+
+    def submit(self, side: str, frame, rois: List[Roi], retry_rois: Optional[Dict[str, Roi]] = None) -> Future:
+        result: Future = Future()
+        start = time.perf_counter()
+        if not rois:
+            result.set_result({})
+            return result
+        retry_rois = dict(retry_rois or {})
+        texts: Dict[str, Optional[str]] = {}
+        patch_ms: Dict[str, float] = {}
+        retried: List[str] = []
+        pids = set()
+        remaining = [len(rois)]
+        order = [roi[0] for roi in rois]
+
+        def _finish(key, text, ms, pid):
+            with self._lock:
+                texts[key] = text
+                patch_ms[key] = patch_ms.get(key, 0.0) + ms
+                pids.add(pid)
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished:
+                self.last_stats[side] = {'wall_ms': (time.perf_counter() - start) * 1000, 'patch_ms': patch_ms,
+                                         'workers': len(pids - {None}), 'retried': retried}
+                try:
+                    result.set_result({key: texts.get(key) for key in order})
+                except InvalidStateError:   # 호출 측에서 취소 (디코드 타임아웃/reset)
+                    pass
+
+        def _submit(roi, retry=False):
+            key, x0, y0, x1, y1 = roi
+            pixels, width, height = extract_patch(frame, x0, y0, x1, y1)
+            try:
+                future = self._executor.submit(_worker_decode_patch, key, pixels, width, height)
+            except Exception as e:   # BrokenProcessPool / 종료 후 호출 → 해당 모듈은 미인식 처리
+                print(f"[DecodePool] {side} {key} submit failed: {e}")
+                _finish(key, None, 0.0, None)
+                return
+            future.add_done_callback(lambda f: _done(key, f, retry))
+
+        def _done(key, future, retry):
+            if result.cancelled():
+                return
+            try:
+                key, text, ms, pid = future.result()
+            except Exception as e:
+                print(f"[DecodePool] {side} {key} failed: {e}")
+                key, text, ms, pid = key, None, 0.0, None
+            if text is None and not retry and key in retry_rois:
+                # 미인식 모듈만 확대 ROI로 재시도 (남은 작업 수는 그대로 유지)
+                with self._lock:
+                    patch_ms[key] = ms
+                    retried.append(key)
+                _submit(retry_rois.pop(key), retry=True)
+                return
+            _finish(key, text, ms, pid)
+
+        for roi in rois:
+            _submit(roi)
+        return result
+
+    def locate(self, frame, max_count: Optional[int] = None) -> Future:
+        """전체 프레임 검색 → [(text, x0, y0, x1, y1), ...] Future"""
+        width, height = frame_size(frame)
+        pixels, _, _ = extract_patch(frame, 0, 0, width, height)
+        return self._executor.submit(_worker_locate_frame, pixels, width, height, max_count)
+
+    def shutdown(self):
+        """
+        대기 중인 패치는 취소하고 워커 종료까지 기다림 (진행 중인 패치 1개 분량, 수 ms)
+        - wait=False로 두면 인터프리터 종료 시 executor wakeup pipe가 먼저 닫혀 OSError(EBADF)가 출력될 수 있습니다.
+        """
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,485 @@
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+import c_barcode_decode
+import c_barcode_roi
+import c_frame_pool
+
+try:
+    import numpy
+except ImportError:   # 아카이브 시 numpy 배열 저장에만 사용
+    numpy = None
+
+try:
+    from PIL import Image
+except ImportError:   # 저장된 촬영 이미지를 프레임으로 읽을 때만 사용 (없으면 기존 파일 경로 유지)
+    Image = None
+
+
+class SavedImageSource:
+    """
+    mainWindow._save_barcode_image가 방금 저장한 촬영 이미지를 메모리 프레임으로 읽는 기본 grab hook.
+    (mainWindow에 grab_barcode_frame이 없을 때 사용. 파일을 한 번만 읽고, 이후 디코드는 메모리에서 진행)
+    - path_format: '{side}'를 포함한 이미지 경로 (sysInfo.xml barcodePipeline의 image 속성)
+    - 프레임은 8bit 그레이스케일: numpy 배열 (H, W) 또는 numpy가 없으면 (pixels, width, height) 튜플
+    - 파일 수정 시각이 이전 촬영과 같으면(저장 실패/저장 미완료) RuntimeError를 올려 기존 파일 경로로 디코드하게 합니다.
+    """
+
+    def __init__(self, path_format: str):
+        self.path_format = path_format
+        self._stamps: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def available() -> bool:
+        return Image is not None
+
+    def path(self, side: str) -> str:
+        return self.path_format.format(side=side)
+
+    def _open(self, side: str):
+        path = self.path(side)
+        stamp = os.stat(path).st_mtime_ns
+        with self._lock:
+            if self._stamps.get(side) == stamp:
+                raise RuntimeError(f"{path} was not updated by the last capture")
+            self._stamps[side] = stamp
+        with Image.open(path) as image:
+            return image.convert('L')
+
+    def grab(self, side: str):
+        image = self._open(side)
+        if numpy is not None:
+            return numpy.asarray(image)
+        width, height = image.size
+        return image.tobytes(), width, height
+
+    def grab_into(self, side: str, out):
+        """프레임 풀 버퍼(out)에 읽어 out 기반 프레임 반환 (크기가 다르면 새 프레임 반환 → 호출 측에서 풀 크기 재설정)"""
+        image = self._open(side)
+        width, height = image.size
+        if hasattr(out, 'shape'):
+            if tuple(out.shape) != (height, width):
+                return numpy.asarray(image)
+            out[...] = numpy.asarray(image)
+            return out
+        pixels = image.tobytes()
+        if len(out) != len(pixels):
+            return pixels, width, height
+        out[:] = pixels
+        return out, width, height
+
+
+class BarcodePipeline:
+    """
+    메모리 내 촬영 → 디코드 → 모듈 테이블 반영 파이프라인.
+    기존 경로: _save_barcode_image(파일 저장) → SaveAndScan_Left/Right → barcode/Left.txt → Parse_Barcode_File
+    파이프라인: capture(side)로 프레임을 메모리에 보관 → decode(side, value_order)가 디코더에 버퍼를 직접 넘기고
+               결과를 mainWindow.modules_Left/Right의 value_order 칸에 바로 기록합니다.
+    - 프레임/디코더는 mainWindow의 다음 메서드를 사용합니다 (둘 다 있어야 활성화, 없으면 기존 파일 경로 유지):
+      * grab_barcode_frame(side) -> frame            : 카메라 버퍼 (numpy 배열, bytes 등 디코더가 받는 형식)
+        mainWindow에 없으면 source(SavedImageSource)가 _save_barcode_image로 저장된 이미지를 읽어 대신합니다.
+        (reads_saved_image=True: 호출 측에서 촬영 저장 후 capture)
+        (좌/우 병렬 촬영 시 캡처 워커 스레드에서 호출되므로 위젯/QPixmap을 직접 건드리면 안 됩니다.
+         화면 갱신이 필요하면 signal 등으로 GUI 스레드에 넘기세요. grab_barcode_frame_into도 동일)
+      * decode_barcode_frame(side, frame) -> dict    : {'Module1': '<barcode>', ...} (읽지 못한 모듈은 생략/None)
+      set_decoder()로 다른 디코더를 지정할 수 있습니다.
+    - 프레임 버퍼 풀(c_frame_pool.FramePool)이 지정되고 mainWindow가
+      grab_barcode_frame_into(side, out) -> frame 을 제공하면, 촬영마다 새 버퍼를 만들지 않고
+      풀에서 받은 버퍼(out)에 촬영합니다. 버퍼는 디코드(와 아카이브)가 끝나면 풀로 돌아갑니다.
+      * 풀 크기를 모르면 첫 촬영은 grab_barcode_frame으로 받고 그 크기로 버퍼를 미리 할당합니다.
+    - 디코드 풀(c_barcode_decode.DecodePool)이 지정되면 위 디코더 대신 모듈 ROI 단위로 프로세스 풀에서 디코드합니다.
+      * capture(side) 직후 바로 디코드를 시작하므로 좌/우 디코드가 촬영 직후부터 겹쳐서 진행되고,
+        decode(side)는 (대부분 이미 끝난) 결과만 받아 테이블에 반영합니다.
+      * ROI는 모델별 ROI 맵(c_barcode_roi.RoiMap, settings.xml 옆 roi_map.json)을 사용합니다.
+        맵에 해당 side가 없으면 첫 프레임을 전체 검색해 보정/저장하고, 그 사이클 결과도 검색 결과로 채웁니다.
+        보정된 ROI에서 읽지 못한 모듈만 확대 ROI로 한 번 더 디코드합니다.
+    - 사용(enabled) 모듈 중 결과가 없는 모듈은 'Scan Failed'로 기록합니다. (do_test의 판정 규칙과 동일)
+    - 디스크 저장은 선택 사항인 비동기 아카이브입니다. (archive=True이면 프레임과 결과를 백그라운드 스레드에서 저장)
+    """
+    SIDES = ('Left', 'Right')
+    DECODE_TIMEOUT = 10.0   # 풀 디코드 결과 대기 한도 (sec)
+
+    def __init__(self, main_window, archive_dir: str, enabled=True, archive=False, keep=200,
+                 source: Optional[SavedImageSource] = None):
+        self.main_window = main_window
+        self.archive_dir = archive_dir
+        self.enabled = enabled
+        self.archive = archive
+        self.keep = keep
+        self._grab: Optional[Callable] = getattr(main_window, 'grab_barcode_frame', None)
+        self._decoder: Optional[Callable] = getattr(main_window, 'decode_barcode_frame', None)
+        self._grab_into: Optional[Callable] = getattr(main_window, 'grab_barcode_frame_into', None)
+        self.reads_saved_image = self._grab is None and source is not None
+        if self.reads_saved_image:
+            self._grab = source.grab
+            self._grab_into = source.grab_into
+        self._frames: Dict[str, object] = {}
+        self._buffers: Dict[str, object] = {}       # side -> 프레임 풀 버퍼 (디코드 후 반환)
+        self._pending: Dict[str, Future] = {}       # side -> 디코드 풀 결과 Future
+        self.decode_pool: Optional[c_barcode_decode.DecodePool] = None
+        self.roi_map = c_barcode_roi.RoiMap()
+        self.frame_pool: Optional[c_frame_pool.FramePool] = None
+        self._lock = threading.Lock()
+        self._archive_executor: Optional[ThreadPoolExecutor] = None
+        self.last_results: Dict[str, dict] = {}     # side -> {'Module1': 'abc', ...} (마지막 디코드 결과)
+        self.last_missing: Dict[str, list] = {}     # side -> 결과가 없었던 사용 모듈 목록
+        self.last_decode_ms: Dict[str, float] = {}
+
+    @property
+    def active(self) -> bool:
+        return bool(self.enabled and (self._grab is not None or self._pooled_grab_ready())
+                    and (self._decoder is not None or self.decode_pool is not None))
+
+    def _pooled_grab_ready(self) -> bool:
+        return self._grab_into is not None and self.frame_pool is not None and self.frame_pool.shape is not None
+
+    def set_decoder(self, decoder: Optional[Callable]):
+        """decoder(side, frame) -> {'ModuleN': text} 지정 (None이면 mainWindow.decode_barcode_frame 사용)"""
+        self._decoder = decoder or getattr(self.main_window, 'decode_barcode_frame', None)
+
+    def set_decode_pool(self, pool: Optional[c_barcode_decode.DecodePool]):
+        self.decode_pool = pool
+
+    def set_frame_pool(self, pool: Optional[c_frame_pool.FramePool]):
+        self.frame_pool = pool
+
+    def module_keys(self, side: str) -> list:
+        """ROI를 나눌 사용(enabled) 모듈 키 (ModuleN 번호 순)"""
+        modules = getattr(self.main_window, f'modules_{side}', {}) or {}
+        keys = [key for key, v in modules.items() if isinstance(v, list) and v and v[0] is True]
+        return sorted(keys, key=lambda k: int(re.sub(r'\D', '', k) or 0))
+
+    def load_roi_map(self, settings_path: str):
+        """모델 선택 시 호출: settings.xml 옆의 ROI 맵을 메모리로 로드 (없으면 첫 촬영에서 보정)"""
+        self.roi_map = c_barcode_roi.RoiMap.for_settings(settings_path)
+
+    def _submit_decode(self, side: str, frame) -> Future:
+        width, height = c_barcode_decode.frame_size(frame)
+        keys = self.module_keys(side)
+        rois = self.roi_map.rois(side, keys, width, height)
+        if rois is not None:
+            retry = {roi[0]: c_barcode_roi.RoiMap.widen(roi, c_barcode_roi.RoiMap.RETRY_FACTOR, width, height)
+                     for roi in rois}
+            return self.decode_pool.submit(side, frame, rois, retry_rois=retry)
+        if not keys or self.roi_map.path is None:
+            return self.decode_pool.submit(side, frame, c_barcode_decode.layout_rois(keys, width, height))
+        return self._calibrate(side, frame, keys, width, height)
+
+    def _calibrate(self, side: str, frame, keys: list, width: int, height: int) -> Future:
+        """
+        ROI 맵이 없는 side: 전체 프레임 검색 → 맵 보정/저장 → 검색 결과를 이번 디코드 결과로 사용.
+        - 검출 개수가 모듈 수와 다르면 보정하지 않고 기본 배치로 디코드합니다.
+        - 반환 Future는 어떤 경우에도 완료됩니다. (executor 완료 콜백 안의 예외는 삼켜지므로 직접 처리)
+        """
+        result: Future = Future()
+
+        def _forward(future):
+            if result.cancelled():
+                return
+            error = future.exception()
+            if error is not None:
+                result.set_exception(error)
+            else:
+                result.set_result(future.result())
+
+        def _located(future):
+            if result.cancelled():   # decode() 타임아웃/reset으로 취소됨 → 보정/디코드 생략
+                return
+            try:
+                try:
+                    detections = future.result()
+                except Exception as e:
+                    print(f"[BarcodePipeline] {side} locate failed: {e}")
+                    detections = []
+                texts = self.roi_map.calibrate(side, keys, detections, width, height)
+                if texts is None:
+                    fallback = self.decode_pool.submit(side, frame, c_barcode_decode.layout_rois(keys, width, height))
+                    fallback.add_done_callback(_forward)
+                    return
+                try:
+                    self.roi_map.save()
+                except OSError as e:
+                    print(f"[BarcodePipeline] Failed to save ROI map {self.roi_map.path}: {e}")
+                result.set_result(texts)
+            except InvalidStateError:
+                pass
+            except Exception as e:
+                print(f"[BarcodePipeline] {side} calibration failed: {e}")
+                if not result.done():
+                    result.set_exception(e)
+
+        try:
+            self.decode_pool.locate(frame, max_count=len(keys)).add_done_callback(_located)
+        except Exception as e:   # BrokenProcessPool / 종료 후 호출
+            print(f"[BarcodePipeline] {side} locate submit failed: {e}")
+            result.set_result({})
+        return result
+
+    def capture(self, side: str):
+        """
+        카메라 프레임을 메모리로 받아 보관 (파일 저장 없음). 프레임을 받지 못하면 RuntimeError.
+        - 디코드 풀이 있으면 여기서 바로 ROI 디코드를 시작합니다. (호출한 촬영 워커 스레드에서 패치 분배)
+        """
+        frame, buffer = self._grab_frame(side)
+        pending = None
+        if self.decode_pool is not None:
+            pending = self._submit_decode(side, frame)
+        with self._lock:
+            old_buffer = self._buffers.pop(side, None)
+            old_pending = self._pending.pop(side, None)
+            self._frames[side] = frame
+            if buffer is not None:
+                self._buffers[side] = buffer
+            if pending is not None:
+                self._pending[side] = pending
+        self._discard(old_buffer, old_pending)   # 같은 side 재촬영 시 이전 디코드 취소 + 버퍼 반환
+        return frame
+
+    def _grab_frame(self, side: str):
+        """(frame, 풀 버퍼 또는 None). 풀 버퍼에 직접 촬영할 수 있으면 버퍼를 사용"""
+        if self._pooled_grab_ready():
+            buffer = self.frame_pool.acquire()
+            try:
+                frame = self._grab_into(side, buffer)
+            except Exception:
+                self.frame_pool.release(buffer)
+                raise
+            if frame is None:
+                self.frame_pool.release(buffer)
+                raise RuntimeError(f"{side} camera returned no frame")
+            shape = c_frame_pool.FramePool.shape_of(frame)
+            if shape and shape != self.frame_pool.shape:
+                # 프레임 크기 변경: 버퍼에 담기지 않은 새 프레임 → 버퍼 반환 후 새 크기로 다시 할당 (다음 촬영부터 사용)
+                self.frame_pool.release(buffer)
+                self.frame_pool.configure(shape)
+                return frame, None
+            return frame, buffer
+        frame = self._grab(side)
+        if frame is None:
+            raise RuntimeError(f"{side} camera returned no frame")
+        if self.frame_pool is not None and self._grab_into is not None:
+            shape = c_frame_pool.FramePool.shape_of(frame)
+            if shape:
+                self.frame_pool.configure(shape)   # 첫 프레임 크기로 버퍼 미리 할당 (다음 촬영부터 사용)
+        return frame, None
+
+    def _discard(self, buffer, pending: Optional[Future] = None):
+        """결과가 더 필요 없는 디코드를 취소하고 버퍼를 바로 반환 (멈춘 디코드가 버퍼를 붙잡지 않도록)"""
+        if pending is not None:
+            pending.cancel()
+        self._release(buffer, pending)
+
+    def _release(self, buffer, pending: Optional[Future] = None):
+        """풀 버퍼 반환 (디코드가 아직 진행 중이면 끝난 뒤 반환)"""
+        if buffer is None or self.frame_pool is None:
+            return
+        if pending is not None and not pending.done():
+            pending.add_done_callback(lambda _f: self.frame_pool.release(buffer))
+            return
+        self.frame_pool.release(buffer)
+
+    def discard(self, side: str):
+        """side의 보관 프레임 폐기 (촬영 적재 실패 → 그 side는 기존 파일 경로로 디코드)"""
+        with self._lock:
+            self._frames.pop(side, None)
+            pending = self._pending.pop(side, None)
+            buffer = self._buffers.pop(side, None)
+        self._discard(buffer, pending)
+
+    def has_frame(self, side: str) -> bool:
+        with self._lock:
+            return side in self._frames
+
+    def decode(self, side: str, value_order: int) -> dict:
+        """
+        보관된 프레임을 디코드해 modules_<side>[key][value_order - 1]에 기록하고 결과 dict를 반환.
+        - 프레임이 없으면(촬영 실패) 사용 모듈을 모두 'Scan Failed'로 기록합니다.
+        """
+        with self._lock:
+            frame = self._frames.pop(side, None)
+            pending = self._pending.pop(side, None)
+            buffer = self._buffers.pop(side, None)
+        start = time.perf_counter()
+        results = {}
+        if frame is not None:
+            try:
+                if pending is not None:
+                    results = pending.result(timeout=self.DECODE_TIMEOUT)
+                else:
+                    results = self._decoder(side, frame) or {}
+            except Exception as e:
+                print(f"[BarcodePipeline] {side} decode failed: {e!r}")
+                results = {}
+        if pending is not None and not pending.done():
+            pending.cancel()   # 타임아웃: 늦게 끝나는 디코드를 기다리지 않고 버퍼를 바로 반환
+        self.last_decode_ms[side] = (time.perf_counter() - start) * 1000
+        self.apply_results(side, results, value_order)
+        if self.archive and frame is not None:
+            self._submit_archive(side, frame, results, value_order, buffer, pending)
+        else:
+            self._release(buffer, pending)
+        return results
+
+    def apply_results(self, side: str, results: dict, value_order: int):
+        """디코드 결과를 모듈 테이블에 반영 (사용 모듈 중 결과가 없으면 'Scan Failed')"""
+        modules = getattr(self.main_window, f'modules_{side}')
+        index = value_order - 1
+        missing = []
+        found = 0
+        for key, v in modules.items():
+            if not isinstance(v, list) or len(v) <= index or v[0] is not True:
+                continue
+            text = results.get(key)
+            if text:
+                v[index] = text
+                found += 1
+            else:
+                v[index] = 'Scan Failed'
+                missing.append(key)
+        self.last_results[side] = dict(results)
+        self.last_missing[side] = missing
+        pool_stats = self.decode_pool.last_stats.get(side) if self.decode_pool is not None else None
+        detail = (f" (pool {pool_stats['wall_ms']:.1f} ms, {pool_stats['workers']} workers"
+                  + (f", retried {pool_stats['retried']}" if pool_stats.get('retried') else "") + ")"
+                  if pool_stats else "")
+        if self.frame_pool is not None and self.frame_pool.shape is not None:
+            detail += f" [{self.frame_pool.describe()}]"
+        print(f"[BarcodePipeline] {side} decoded {found} modules, "
+              f"waited {self.last_decode_ms.get(side, 0):.1f} ms{detail}" + (f", missing {missing}" if missing else ""))
+
+    def reset(self):
+        """사이클 시작 시 이전 프레임 폐기 (진행 중인 디코드는 취소)"""
+        with self._lock:
+            released = [(self._buffers.get(side), self._pending.get(side))
+                        for side in set(self._buffers) | set(self._pending)]
+            self._frames.clear()
+            self._pending.clear()
+            self._buffers.clear()
+        for buffer, pending in released:
+            self._discard(buffer, pending)
+
+    def _submit_archive(self, side, frame, results, value_order, buffer=None, pending=None):
+        if self._archive_executor is None:
+            self._archive_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='barcode-archive')
+        self._archive_executor.submit(self._write_archive, side, frame, dict(results), value_order, time.time(),
+                                      buffer, pending)
+
+    def _write_archive(self, side, frame, results, value_order, wall, buffer=None, pending=None):
+        try:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            base = os.path.join(self.archive_dir,
+                                f"{time.strftime('%Y%m%d_%H%M%S', time.localtime(wall))}_{int(wall * 1000) % 1000:03d}"
+                                f"_{side}_{value_order}")
+            with open(base + '.json', 'w', encoding='utf-8') as f:
+                info = {'side': side, 'value_order': value_order, 'results': results}
+                if isinstance(frame, tuple) or hasattr(frame, 'shape'):
+                    info['frame'] = list(c_barcode_decode.frame_size(frame))
+                json.dump(info, f, ensure_ascii=False)
+            saver = getattr(self.main_window, 'save_barcode_frame', None)
+            if saver is not None:
+                saver(frame, base)
+            elif numpy is not None and isinstance(frame, numpy.ndarray):
+                numpy.save(base + '.npy', frame)
+            elif isinstance(frame, (bytes, bytearray, memoryview, tuple)):
+                pixels = frame[0] if isinstance(frame, tuple) else frame   # (pixels, width, height)
+                with open(base + '.raw', 'wb') as f:
+                    f.write(pixels)
+            self._prune()
+        except Exception as e:
+            print(f"[BarcodePipeline] Failed to archive {side} frame: {e}")
+        finally:
+            self._release(buffer, pending)
+
+    def _prune(self):
+        """오래된 아카이브를 keep 개수만큼만 남기고 삭제"""
+        if not self.keep:
+            return
+        names = sorted(f[:-len('.json')] for f in os.listdir(self.archive_dir) if f.endswith('.json'))
+        stale = set(names[:-self.keep])
+        if not stale:
+            return
+        for name in os.listdir(self.archive_dir):
+            if os.path.splitext(name)[0] in stale:
+                try:
+                    os.remove(os.path.join(self.archive_dir, name))
+                except OSError:
+                    pass
+
+    def stop(self):
+        if self.decode_pool is not None:
+            self.decode_pool.shutdown()
+        if self._archive_executor is not None:
+            self._archive_executor.shutdown(wait=True)
+            self._archive_executor = None
+
+
+def pipeline_from_config(baseDir, get_xml_info, main_window) -> BarcodePipeline:
+    """
+    sysInfo.xml의 <barcodePipeline mode="memory" archive="0" dir="barcode/archive" keep="200"
+                                   image="barcode/{side}.png" decoder="auto" workers="" timeoutMs=""
+                                   frameSlots="4" frameSize=""/> 설정으로 생성.
+    - mode="file"이면 기존 파일 경로만 사용합니다.
+    - mainWindow에 grab_barcode_frame이 없으면 _save_barcode_image가 저장한 image 경로의 파일을 읽어 프레임으로 씁니다.
+      (PIL 필요. image는 mainWindow가 실제로 저장하는 경로와 같아야 하며 baseDir 기준 상대 경로 가능)
+    - decoder="pool"이면 모듈 ROI 병렬 디코드 풀, "hook"이면 mainWindow.decode_barcode_frame,
+      "auto"(기본)는 pylibdmtx가 있으면 풀을 사용합니다. 풀은 백그라운드에서 미리 띄워 둡니다.
+      mainWindow에 grab_barcode_frame / grab_barcode_frame_into가 없으면 풀을 만들지 않습니다.
+    - mainWindow.grab_barcode_frame_into(또는 저장 이미지 source)가 있으면 frameSlots개 프레임 버퍼 풀을 사용합니다.
+      (0이면 사용 안 함)
+      frameSize="WxH" 또는 "WxHxC"를 주면 시작 시 미리 할당하고, 없으면 첫 촬영 프레임 크기로 할당합니다.
+    """
+    cfg: Optional[dict] = None
+    try:
+        cfg = get_xml_info(baseDir, 'barcodePipeline')
+    except Exception:
+        cfg = None
+    cfg = cfg if isinstance(cfg, dict) else {}
+    enabled = str(cfg.get('mode', 'memory')).lower() != 'file'
+    archive = str(cfg.get('archive', '0')).lower() in ('1', 'true', 'yes', 'on')
+    archive_dir = cfg.get('dir') or os.path.join('barcode', 'archive')
+    if not os.path.isabs(archive_dir):
+        archive_dir = os.path.join(baseDir, archive_dir)
+    try:
+        keep = int(cfg.get('keep', 200))
+    except ValueError:
+        keep = 200
+    source = None
+    if enabled and getattr(main_window, 'grab_barcode_frame', None) is None and SavedImageSource.available():
+        image = cfg.get('image') or os.path.join('barcode', '{side}.png')
+        source = SavedImageSource(image if os.path.isabs(image) else os.path.join(baseDir, image))
+    pipeline = BarcodePipeline(main_window, archive_dir, enabled=enabled, archive=archive, keep=keep, source=source)
+
+    if enabled and pipeline._grab_into is not None:
+        try:
+            slots = int(cfg.get('frameSlots', 4))
+            size = [int(v) for v in str(cfg.get('frameSize') or '').lower().split('x') if v.strip()]
+        except ValueError:
+            slots, size = 4, []
+        shape = (size[1], size[0]) + tuple(size[2:]) if len(size) >= 2 else None
+        if slots > 0:
+            pipeline.set_frame_pool(c_frame_pool.FramePool(slots, shape))
+
+    decoder = str(cfg.get('decoder', 'auto')).lower()
+    # 촬영 hook/저장 이미지 source가 없으면 파이프라인이 활성화될 수 없으므로 워커(spawn 시 c_app 재import)를 띄우지 않음
+    can_grab = pipeline._grab is not None or pipeline._grab_into is not None
+    if not can_grab:
+        if decoder == 'pool':
+            print("[BarcodePipeline] decoder='pool' ignored: no grab_barcode_frame hook and PIL is not available")
+    elif enabled and decoder in ('auto', 'pool') and c_barcode_decode.DecodePool.available():
+        try:
+            workers = int(cfg['workers']) if cfg.get('workers') else None
+            timeout_ms = int(cfg['timeoutMs']) if cfg.get('timeoutMs') else None
+        except ValueError:
+            workers = timeout_ms = None
+        pool = c_barcode_decode.DecodePool(workers=workers, timeout_ms=timeout_ms)
+        pipeline.set_decode_pool(pool)
+        threading.Thread(target=pool.warm_up, name='DecodePoolWarmUp', daemon=True).start()
+    elif decoder == 'pool':
+        print("[BarcodePipeline] decoder='pool' requested but pylibdmtx is not available")
+    return pipeline
@@ -0,0 +1,121 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+ROI_MAP_FILE = 'roi_map.json'
+
+# (key, x0, y0, x1, y1) - c_barcode_decode.Roi와 동일
+Roi = Tuple[str, int, int, int, int]
+
+
+class RoiMap:
+    """
+    모델별 모듈 ROI 맵 (settings.xml과 같은 폴더의 roi_map.json).
+    - 모델 선택 시 load()로 메모리에 올리고, 디코드는 모듈 주변의 작은 패치만 사용합니다.
+    - 맵이 없으면 첫 촬영 프레임의 전체 검색 결과(코드 위치)로 calibrate()해 1회 저장합니다.
+    - 파일 형식:
+      {"version": 1, "margin": 0.5,
+       "sides": {"Left": {"frame": [w, h], "rois": {"Module1": [x0, y0, x1, y1], ...}}, ...}}
+    """
+    VERSION = 1
+    MARGIN = 0.5          # 코드 크기 대비 ROI 여유 (양쪽)
+    RETRY_FACTOR = 2.5    # 미인식 모듈 재시도 시 ROI 확대 배율
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.margin = self.MARGIN
+        self._sides: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_settings(cls, settings_path: str) -> 'RoiMap':
+        """settings.xml 경로 기준으로 맵을 로드 (파일이 없거나 읽을 수 없으면 빈 맵)"""
+        roi_map = cls(os.path.join(os.path.dirname(settings_path), ROI_MAP_FILE))
+        roi_map.load()
+        return roi_map
+
+    def load(self) -> bool:
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != self.VERSION:
+                print(f"[RoiMap] Unsupported version in {self.path}: {data.get('version')}")
+                return False
+            sides = {}
+            for side, entry in data.get('sides', {}).items():
+                sides[side] = {'frame': tuple(entry['frame']),
+                               'rois': {key: tuple(int(v) for v in box) for key, box in entry['rois'].items()}}
+            with self._lock:
+                self.margin = float(data.get('margin', self.MARGIN))
+                self._sides = sides
+            counts = ', '.join(f"{side}:{len(entry['rois'])}" for side, entry in sides.items())
+            print(f"[RoiMap] Loaded {self.path} ({counts})")
+            return True
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"[RoiMap] Failed to load {self.path}: {e}")
+            return False
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {'version': self.VERSION, 'margin': self.margin,
+                    'sides': {side: {'frame': list(entry['frame']),
+                                     'rois': {key: list(box) for key, box in entry['rois'].items()}}
+                              for side, entry in self._sides.items()}}
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp, self.path)
+
+    def rois(self, side: str, keys: List[str], width: int, height: int) -> Optional[List[Roi]]:
+        """
+        보정된 ROI 목록 (keys 순서). 맵에 없는 모듈이 있거나 프레임 크기가 다르면 None (기본 배치 사용)
+        """
+        with self._lock:
+            entry = self._sides.get(side)
+        if entry is None or entry['frame'] != (width, height):
+            return None
+        boxes = entry['rois']
+        if any(key not in boxes for key in keys):
+            return None
+        return [(key,) + boxes[key] for key in keys]
+
+    def has_side(self, side: str) -> bool:
+        with self._lock:
+            return side in self._sides
+
+    @staticmethod
+    def widen(roi: Roi, factor: float, width: int, height: int) -> Roi:
+        """ROI를 중심 기준으로 factor배 확대 (프레임 경계로 자름)"""
+        key, x0, y0, x1, y1 = roi
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        hw, hh = (x1 - x0) * factor / 2, (y1 - y0) * factor / 2
+        return (key, max(0, int(cx - hw)), max(0, int(cy - hh)), min(width, int(cx + hw)), min(height, int(cy + hh)))
+
+    def calibrate(self, side: str, keys: List[str], detections: List[tuple],
+                  width: int, height: int) -> Optional[Dict[str, str]]:
+        """
+        전체 프레임 검색 결과로 side의 ROI를 보정하고 {key: text}를 반환.
+        - detections: [(text, x0, y0, x1, y1), ...] (프레임 좌표)
+        - 모듈은 캐리어 긴 축 방향 순서로 배치되므로, 코드를 그 축 기준으로 정렬해 keys에 차례로 대응시킵니다.
+        - 검출 개수가 모듈 수와 다르면 보정하지 않고 None
+        """
+        if not keys or len(detections) != len(keys):
+            print(f"[RoiMap] {side} calibration skipped: {len(detections)} codes for {len(keys)} modules")
+            return None
+        vertical = height >= width
+        ordered = sorted(detections, key=lambda d: ((d[2] + d[4]) / 2, (d[1] + d[3]) / 2) if vertical
+                         else ((d[1] + d[3]) / 2, (d[2] + d[4]) / 2))
+        rois, texts = {}, {}
+        for key, (text, x0, y0, x1, y1) in zip(keys, ordered):
+            pad_x, pad_y = int((x1 - x0) * self.margin), int((y1 - y0) * self.margin)
+            rois[key] = (max(0, x0 - pad_x), max(0, y0 - pad_y), min(width, x1 + pad_x), min(height, y1 + pad_y))
+            texts[key] = text
+        with self._lock:
+            self._sides[side] = {'frame': (width, height), 'rois': rois}
+        print(f"[RoiMap] {side} calibrated {len(rois)} modules")
+        return texts
@@ -0,0 +1,106 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+
+class DualCapture:
+    """
+    좌/우 카메라 촬영 (c_app의 _capture_side / _capture_both).
+    - shoot(side): 실제 촬영 1회 (c_app: mainWindow._save_barcode_image + barcode_pipeline 프레임 적재)
+    - connect(side): 카메라 연결 핸들러 (연결 플래그는 여기서 세팅)
+    - 두 카메라는 독립 장치이므로 parallel=True이면 _capture_side 2개를 워커 스레드 2개에서 동시에 실행합니다.
+      (전체 소요 시간 = 좌/우 합계가 아닌 둘 중 느린 쪽)
+    - 카메라별 lock으로 같은 카메라에 대한 연결/촬영 호출은 항상 직렬화됩니다.
+    - 각 촬영이 끝나는 즉시 first_shot_done / clsInfo['left|right_capture_done'] / latency_ms를 세팅하고
+      tracer가 있으면 'capture <side>' 구간을 기록합니다.
+    """
+    SIDES = ('Left', 'Right')
+
+    def __init__(self, shoot: Callable[[str], None], connect: Callable[[str], None],
+                 parallel=True, persistent=True):
+        self.shoot = shoot
+        self.connect_handler = connect
+        self.parallel = parallel
+        self.persistent = persistent
+        self.clsInfo: dict = {}
+        self.tracer = None
+        self.locks = {side: threading.Lock() for side in self.SIDES}
+        self.connected = {side: False for side in self.SIDES}
+        self.first_shot_done = {side: False for side in self.SIDES}
+        self.latency_ms: Dict[str, Optional[float]] = {side: None for side in self.SIDES}   # 마지막 촬영 소요 시간
+        self._executor = ThreadPoolExecutor(max_workers=len(self.SIDES), thread_name_prefix='capture')
+
+    def attach(self, clsInfo: dict, tracer=None):
+        """done 플래그를 세팅할 jobControl.clsInfo / CycleTracer 지정 (JobController 생성 후 호출)"""
+        self.clsInfo = clsInfo
+        self.tracer = tracer
+
+    def connect(self, side: str):
+        try:
+            with self.locks[side]:
+                self.connect_handler(side)
+            self.connected[side] = True
+            print(f'[Camera] {side} connect requested (persistent)')
+        except Exception as e:
+            print(f'[Camera] Failed to connect {side}: {e}')
+
+    def ensure_connected(self, side: str):
+        if not self.connected.get(side, False):
+            self.connect(side)
+
+    def reset(self):
+        """촬영 시작 전 done 플래그 초기화"""
+        for side in self.SIDES:
+            self.first_shot_done[side] = False
+            self.clsInfo[f'{side.lower()}_capture_done'] = False
+
+    def timed_capture(self, side: str):
+        """
+        카메라 lock 안에서 촬영 1회 + 소요 시간 기록 + done 플래그 세팅 (캡처 워커 스레드에서 호출 가능)
+        NOTE:
+        - 동기(Blocking) 촬영이라면, 이 시점에서 이미 저장 완료 상태이므로 Done 플래그를 바로 True로 세팅해도 됨.
+        - 비동기(Non-Blocking) 촬영이라면, 아래의 True 세팅을 제거하고,
+          mainWindow._save_barcode_image 내부(또는 그 함수가 트리거하는 저장 완료 시그널의 슬롯)에서
+          first_shot_done[side] = True, clsInfo['left/right_capture_done']=True 를 세팅하세요.
+        """
+        start = time.perf_counter_ns()
+        with self.locks[side]:
+            self.shoot(side)
+        end = time.perf_counter_ns()
+        self.latency_ms[side] = (end - start) / 1e6
+        self.first_shot_done[side] = True
+        self.clsInfo[f'{side.lower()}_capture_done'] = True
+        if self.tracer is not None:
+            self.tracer.span(f'capture {side}', start, end, cat='capture')
+        print(f'[Camera] {side} capture done ({self.latency_ms[side]:.1f} ms)')
+
+    def capture_side(self, side: str):
+        if self.persistent:
+            self.ensure_connected(side)
+        try:
+            # 촬영 요청
+            self.timed_capture(side)
+        except Exception as e:
+            print(f'[Camera] Capture failed on {side}, retrying with connect: {e}')
+            self.connect(side)
+            self.timed_capture(side)
+
+    def capture_both(self):
+        """좌/우 촬영 (parallel이면 동시에). 한쪽 재촬영까지 실패하면 다른 쪽이 끝난 뒤 예외를 다시 올림"""
+        self.reset()
+        if not self.parallel:
+            for side in self.SIDES:
+                self.capture_side(side)
+            return
+        start = time.perf_counter()
+        futures = [self._executor.submit(self.capture_side, side) for side in self.SIDES]
+        errors = [future.exception() for future in futures]
+        print(f"[Camera] capture both {(time.perf_counter() - start) * 1000:.1f} ms ("
+              + ' / '.join(f"{side} {self.latency_ms[side] or 0:.1f} ms" for side in self.SIDES) + ")")
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
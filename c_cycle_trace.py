@@ -0,0 +1,257 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import c_udp_frame
+
+
+class CycleTracer:
+    """
+    검사 사이클(do_test) / 스크립트 로딩 구간의 시간 측정기.
+    - do_test의 idx_examine 전이, 수신 메시지(Script save finished, sensor_ID, barcode_info, Pusher down finished ...),
+      송신 UDP 명령을 모두 time.perf_counter_ns()로 기록합니다.
+    - 세션 종료 시 다음 파일을 out_dir에 저장합니다.
+      * <kind>_YYYYmmdd_HHMMSS_trace.json : Chrome/Perfetto(chrome://tracing, ui.perfetto.dev)에서 열 수 있는 trace
+      * <kind>_YYYYmmdd_HHMMSS_summary.txt : 단계별 소요 시간 표
+      * cycle_times.csv : 세션마다 한 줄씩 누적 (빌드 간 사이클 타임 추적용)
+    - 세션은 종류(kind)별로 따로 열립니다. (모델 선택 직후의 script_load와 검사 mapping이 겹쳐도 서로 닫지 않음)
+      step()은 mapping 세션에만, inbound/outbound/span은 열린 모든 세션에 기록합니다.
+    - 세션이 활성화되어 있지 않을 때의 이벤트는 무시합니다.
+    """
+    PID = 1
+
+    def __init__(self, out_dir, enabled=True, keep=200, build=''):
+        self.out_dir = out_dir
+        self.enabled = enabled
+        self.keep = keep
+        self.build = build
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()      # 겹친 세션의 저장 스레드가 cycle_times.csv에 동시에 쓰지 않도록
+        self._sessions: Dict[str, dict] = {}    # kind -> session
+        self._step_names: Dict[int, str] = {}
+
+    def set_step_names(self, names: Dict[int, str]):
+        self._step_names = dict(names)
+
+    @property
+    def active(self) -> bool:
+        return bool(self._sessions)
+
+    def is_active(self, kind: str) -> bool:
+        return kind in self._sessions
+
+    def _tid(self, session):
+        ident = threading.get_ident()
+        tid = session['tids'].get(ident)
+        if tid is None:
+            tid = len(session['tids']) + 1
+            session['tids'][ident] = tid
+            session['thread_names'][tid] = threading.current_thread().name
+        return tid
+
+    def begin(self, kind='mapping'):
+        """kind 세션 시작. 같은 kind의 이전 세션이 열려 있으면 'incomplete'로 닫습니다."""
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        with self._lock:
+            previous = self._sessions.pop(kind, None)
+            if previous is not None:
+                self._close_step(previous, now)
+            self._sessions[kind] = {
+                'kind': kind,
+                't0': time.perf_counter_ns(),
+                'wall': time.time(),
+                'events': [],
+                'steps': [],         # [(idx, start_ns, end_ns)]
+                'cur_step': None,    # (idx, start_ns, tid)
+                'tids': {},
+                'thread_names': {},
+                'inbound': {},
+                'tx_count': 0,
+                'tx_bytes': 0,
+            }
+        if previous is not None:
+            self._finish(previous, now, 'incomplete', None)
+
+    def step(self, idx, kind='mapping'):
+        """do_test 단계 전이 기록 (이전 단계 구간을 닫고 새 구간을 엽니다)"""
+        now = time.perf_counter_ns()
+        with self._lock:
+            session = self._sessions.get(kind)
+            if session is None:
+                return
+            self._close_step(session, now)
+            session['cur_step'] = (idx, now, self._tid(session))
+
+    def _close_step(self, session, now):
+        cur = session['cur_step']
+        if cur is None:
+            return
+        idx, start, tid = cur
+        session['steps'].append((idx, start, now))
+        session['events'].append({
+            'name': f"{idx} {self._step_names.get(idx, '')}".strip(), 'cat': 'step', 'ph': 'X',
+            'ts': (start - session['t0']) / 1000.0, 'dur': (now - start) / 1000.0,
+            'pid': self.PID, 'tid': tid, 'args': {'idx_examine': idx}})
+        session['cur_step'] = None
+
+    def inbound(self, source, where, msg):
+        """수신 메시지 기록 (메시지 종류는 ':' 앞부분 기준)"""
+        now = time.perf_counter_ns()
+        kind = str(msg).split(':', 1)[0].strip()[:40]
+        with self._lock:
+            for session in self._sessions.values():
+                session['inbound'][kind] = session['inbound'].get(kind, 0) + 1
+                session['events'].append({
+                    'name': f"RX {kind}", 'cat': 'rx', 'ph': 'i', 's': 't',
+                    'ts': (now - session['t0']) / 1000.0, 'pid': self.PID, 'tid': self._tid(session),
+                    'args': {'source': source, 'where': where, 'msg': str(msg)[:120]}})
+
+    def span(self, name, start_ns, end_ns, cat='span', args=None):
+        """호출 스레드 기준 구간 기록 (start_ns/end_ns는 time.perf_counter_ns 값, 예: 좌/우 카메라 촬영)"""
+        with self._lock:
+            for session in self._sessions.values():
+                session['events'].append({
+                    'name': name, 'cat': cat, 'ph': 'X',
+                    'ts': (start_ns - session['t0']) / 1000.0, 'dur': (end_ns - start_ns) / 1000.0,
+                    'pid': self.PID, 'tid': self._tid(session), 'args': args or {}})
+
+    def outbound(self, addr, payload, ok=True):
+        """송신 UDP 명령 기록 (TCPServer tx listener)"""
+        now = time.perf_counter_ns()
+        if not self._sessions:
+            return
+        size = len(payload)
+        if c_udp_frame.is_frame(payload):
+            head = c_udp_frame.describe(payload).rsplit(' #', 1)[0]
+        else:
+            head = bytes(payload[:48]).split(b'\n', 1)[0].decode('utf-8', 'replace')
+            if head.startswith('SCRIPT_CHUNK'):
+                head = 'SCRIPT_CHUNK'
+        with self._lock:
+            for session in self._sessions.values():
+                session['tx_count'] += 1
+                session['tx_bytes'] += size
+                session['events'].append({
+                    'name': f"TX {head}", 'cat': 'tx',
+                    'ph': 'i', 's': 't', 'ts': (now - session['t0']) / 1000.0, 'pid': self.PID,
+                    'tid': self._tid(session), 'args': {'addr': f"{addr[0]}:{addr[1]}", 'bytes': size, 'ok': ok}})
+
+    def end(self, kind='mapping', result=None, reason=None):
+        """
+        kind 세션 종료 후 trace/summary 파일을 백그라운드로 저장. 요약 문자열을 반환.
+        - 세션 확인과 종료를 lock 안에서 한 번에 처리하므로, 열린 세션이 없으면(이미 닫힘/다른 kind) None.
+        """
+        now = time.perf_counter_ns()
+        with self._lock:
+            session = self._sessions.pop(kind, None)
+            if session is None:
+                return None
+            self._close_step(session, now)
+        return self._finish(session, now, result, reason)
+
+    def _finish(self, session, now, result, reason):
+        """닫힌 세션 요약 출력 + trace/summary 파일 백그라운드 저장"""
+        session['t_end'] = now
+        session['result'] = result
+        session['reason'] = reason
+        summary = self._format_summary(session)
+        print(summary)
+        threading.Thread(target=self._write, args=(session, summary), name="CycleTraceWriter").start()
+        return summary
+
+    def _format_summary(self, session) -> str:
+        total_ms = (session['t_end'] - session['t0']) / 1e6
+        stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(session['wall']))
+        lines = [f"[{session['kind']}] {stamp}  result={session['result']}  reason={session['reason']}  "
+                 f"total={total_ms:.1f} ms",
+                 f"{'idx':>4}  {'step':<28}{'ms':>10}{'%':>7}"]
+        for idx, start, end in session['steps']:
+            ms = (end - start) / 1e6
+            pct = (ms / total_ms * 100.0) if total_ms else 0.0
+            lines.append(f"{idx:>4}  {self._step_names.get(idx, '')[:28]:<28}{ms:>10.1f}{pct:>7.1f}")
+        slowest = self._slowest(session)
+        if slowest:
+            lines.append(f"slowest: {slowest[0]} {self._step_names.get(slowest[0], '')} {slowest[1]:.1f} ms")
+        if session['inbound']:
+            lines.append('inbound: ' + ', '.join(f"{k} x{v}" for k, v in sorted(session['inbound'].items())))
+        lines.append(f"outbound: {session['tx_count']} datagrams, {session['tx_bytes']} bytes")
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _slowest(session):
+        best = None
+        for idx, start, end in session['steps']:
+            ms = (end - start) / 1e6
+            if best is None or ms > best[1]:
+                best = (idx, ms)
+        return best
+
+    def _write(self, session, summary):
+        with self._write_lock:
+            self._write_files(session, summary)
+
+    def _write_files(self, session, summary):
+        try:
+            os.makedirs(self.out_dir, exist_ok=True)
+            base = f"{session['kind']}_{time.strftime('%Y%m%d_%H%M%S', time.localtime(session['wall']))}"
+            meta = [{'name': 'thread_name', 'ph': 'M', 'pid': self.PID, 'tid': tid, 'args': {'name': name}}
+                    for tid, name in session['thread_names'].items()]
+            trace = {'traceEvents': meta + session['events'], 'displayTimeUnit': 'ms',
+                     'otherData': {'kind': session['kind'], 'build': self.build,
+                                   'result': session['result'], 'reason': session['reason']}}
+            with open(os.path.join(self.out_dir, base + '_trace.json'), 'w', encoding='utf-8') as f:
+                json.dump(trace, f)
+            with open(os.path.join(self.out_dir, base + '_summary.txt'), 'w', encoding='utf-8') as f:
+                f.write(summary + '\n')
+
+            csv_path = os.path.join(self.out_dir, 'cycle_times.csv')
+            new_file = not os.path.exists(csv_path)
+            slowest = self._slowest(session) or ('', 0.0)
+            steps = ';'.join(f"{idx}={(end - start) / 1e6:.1f}" for idx, start, end in session['steps'])
+            with open(csv_path, 'a', encoding='utf-8') as f:
+                if new_file:
+                    f.write('time,build,kind,total_ms,result,reason,slowest_idx,slowest_ms,steps_ms\n')
+                f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(session['wall']))},{self.build},"
+                        f"{session['kind']},{(session['t_end'] - session['t0']) / 1e6:.1f},{session['result']},"
+                        f"{session['reason'] or ''},{slowest[0]},{slowest[1]:.1f},{steps}\n")
+            self._prune()
+        except Exception as e:
+            print(f"[CycleTracer] Failed to write trace: {e}")
+
+    def _prune(self):
+        """오래된 trace/summary 파일을 keep 개수만큼만 남기고 삭제"""
+        if not self.keep:
+            return
+        traces = sorted(f for f in os.listdir(self.out_dir) if f.endswith('_trace.json'))
+        for name in traces[:-self.keep]:
+            for suffix in ('_trace.json', '_summary.txt'):
+                try:
+                    os.remove(os.path.join(self.out_dir, name[:-len('_trace.json')] + suffix))
+                except OSError:
+                    pass
+
+
+def tracer_from_config(baseDir, get_xml_info, build='') -> CycleTracer:
+    """
+    sysInfo.xml의 <trace enabled="1" dir="trace" keep="200"/> 설정으로 CycleTracer 생성.
+    - 기본은 꺼짐입니다. enabled="1"이면 <baseDir>/trace(dir)에 최근 200개(keep) 사이클을 저장합니다.
+    """
+    cfg: Optional[dict] = None
+    try:
+        cfg = get_xml_info(baseDir, 'trace')
+    except Exception:
+        cfg = None
+    cfg = cfg if isinstance(cfg, dict) else {}
+    enabled = str(cfg.get('enabled', '0')).lower() in ('1', 'true', 'yes', 'on')
+    out_dir = cfg.get('dir') or 'trace'
+    if not os.path.isabs(out_dir):
+        out_dir = os.path.join(baseDir, out_dir)
+    try:
+        keep = int(cfg.get('keep', 200))
+    except ValueError:
+        keep = 200
+    return CycleTracer(out_dir, enabled=enabled, keep=keep, build=build)
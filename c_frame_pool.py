@@ -0,0 +1,105 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy
+except ImportError:   # numpy가 없으면 bytearray 버퍼 사용
+    numpy = None
+
+# (height, width) 또는 (height, width, channels)
+Shape = Tuple[int, ...]
+
+
+class FramePool:
+    """
+    카메라 촬영용 프레임 버퍼 풀 (고정 개수, 미리 할당).
+    - 버퍼는 numpy.uint8 배열(shape 그대로) 또는 numpy가 없으면 bytearray(전체 바이트 수)입니다.
+    - acquire(shape)로 빈 버퍼를 받아 촬영에 쓰고, 디코드/아카이브가 끝나면 release(buffer)로 돌려줍니다.
+    - 모든 버퍼가 사용 중이면 새로 할당해 반환합니다. (풀 밖 버퍼이며 release 시 그냥 버림, fallback으로 집계)
+    - 프레임 크기가 바뀌면 빈 버퍼를 새 크기로 다시 할당하고, 사용 중이던 이전 크기 버퍼는 반환 시 버립니다.
+    """
+
+    def __init__(self, slots: int = 4, shape: Optional[Shape] = None):
+        self.slots = max(0, int(slots))
+        self.shape: Optional[Shape] = None
+        self._lock = threading.Lock()
+        self._free: List[object] = []
+        self._pooled: Dict[int, object] = {}    # id(buffer) -> buffer (현재 크기로 할당된 풀 버퍼)
+        self.in_use = 0
+        self.peak = 0
+        self.acquired = 0
+        self.fallback = 0
+        if shape:
+            self.configure(shape)
+
+    @staticmethod
+    def allocate(shape: Shape):
+        if numpy is not None:
+            return numpy.empty(shape, dtype=numpy.uint8)
+        size = 1
+        for dim in shape:
+            size *= dim
+        return bytearray(size)
+
+    @staticmethod
+    def shape_of(frame) -> Optional[Shape]:
+        """촬영된 프레임의 shape (numpy 배열 또는 (pixels, width, height) 튜플)"""
+        if hasattr(frame, 'shape'):
+            return tuple(int(v) for v in frame.shape)
+        try:
+            pixels, width, height = frame
+            channels = len(pixels) // (int(width) * int(height))
+        except (TypeError, ValueError, ZeroDivisionError):
+            return None
+        return (int(height), int(width)) if channels == 1 else (int(height), int(width), channels)
+
+    def configure(self, shape: Shape):
+        """slots개 버퍼를 shape 크기로 미리 할당 (같은 크기면 그대로 유지)"""
+        shape = tuple(int(v) for v in shape)
+        with self._lock:
+            if shape == self.shape:
+                return
+            self.shape = shape
+            self._free = [self.allocate(shape) for _ in range(self.slots)]
+            self._pooled = {id(buf): buf for buf in self._free}
+            self.in_use = 0
+        print(f"[FramePool] {self.slots} buffers of {shape} preallocated")
+
+    def acquire(self, shape: Optional[Shape] = None):
+        """빈 버퍼 반환 (shape를 주면 풀 크기를 맞춤). 풀이 비었으면 새로 할당"""
+        if shape is not None and tuple(shape) != self.shape:
+            self.configure(shape)
+        with self._lock:
+            if self.shape is None:
+                raise ValueError("FramePool shape is not configured")
+            self.acquired += 1
+            if self._free:
+                buf = self._free.pop()
+                self.in_use += 1
+                self.peak = max(self.peak, self.in_use)
+                return buf
+            self.fallback += 1
+            shape = self.shape
+        print(f"[FramePool] exhausted ({self.slots} in use), allocating a temporary buffer")
+        return self.allocate(shape)
+
+    def release(self, buf):
+        """acquire한 버퍼 반환 (풀 밖/이전 크기 버퍼는 무시)"""
+        if buf is None:
+            return
+        with self._lock:
+            if self._pooled.get(id(buf)) is not buf:
+                return
+            if any(free is buf for free in self._free):
+                return    # 중복 반환
+            self._free.append(buf)
+            self.in_use -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'slots': self.slots, 'in_use': self.in_use, 'peak': self.peak,
+                    'acquired': self.acquired, 'fallback': self.fallback, 'shape': self.shape}
+
+    def describe(self) -> str:
+        s = self.stats()
+        return f"frames {s['in_use']}/{s['slots']} (peak {s['peak']}, fallback {s['fallback']}/{s['acquired']})"
@@ -1,11 +1,273 @@
-import threading, re, traceback, os, time, ast
-import c_udp_server, util_base, c_udp_ioboard
+import threading, re, traceback, os, time
+import c_udp_server, c_udp_async_server, util_base, c_udp_ioboard, c_cycle_trace, c_script_transfer
+import c_message_dispatch, c_payload, c_udp_frame, c_barcode_pipeline
 from PySide6 import QtCore
 import xml.etree.ElementTree as ET
+from dataclasses import dataclass
 from typing import Dict, Iterable, Optional
 
+
+# do_test idx_examine 단계 이름 (trace/summary 표기용)
+EXAMINE_STEP_NAMES = {
+    0: 'STStart', 1: 'Write cards connection', 2: 'Script loaded check', 3: 'Mapping start',
+    4: 'Barcode read (1st shot)', 5: 'Pusher front', 6: '1st left barcode', 7: '1st right barcode',
+    8: 'idle', 9: 'barcode sending finished', 10: 'sensor ID wait', 11: '2nd barcode / Pusher back',
+    12: 'c_save', 13: 'sensor_dict update', 14: 'pairwise compare', 15: '3rd Barcode shot',
+    16: '3rd shot wait', 17: '3rd left barcode', 18: '3rd right barcode', 19: 'all OK', 100: 'finish',
+}
+
+
+@dataclass(frozen=True)
+class ModelSettings:
+    """
+    모델별 settings.xml 스냅샷(불변).
+    - make_dictionary / reset_job_context에서 1회 생성하고, 검사 사이클 중에는 settings.xml을 다시 읽지 않습니다.
+    - writecard_qty: writecard1~4 qty (파싱 실패 시 0)
+    - carrier_columns: <carrier columns="..."> (기본값 2)
+    - barcode_length: <barcode length="..."> (없으면 None)
+    - script_path: <script filePath>가 정의된 경우 '<model>_script.txt' 경로, 없으면 None
+    """
+    family: str
+    model: str
+    settings_path: str
+    writecard_qty: tuple = (0, 0, 0, 0)
+    carrier_columns: int = 2
+    barcode_length: Optional[int] = None
+    script_path: Optional[str] = None
+
+    @classmethod
+    def load(cls, baseDir, family, model) -> 'ModelSettings':
+        """
+        settings.xml을 1회 파싱하여 스냅샷을 생성.
+        - 파일이 없으면 FileNotFoundError, 파싱 실패 시 ET.ParseError를 그대로 전달합니다.
+        """
+        model_dir = os.path.join(baseDir, 'models', family, model)
+        settings_path = os.path.join(model_dir, 'settings.xml')
+        root = ET.parse(settings_path).getroot()
+
+        def _int_attr(tag, *names):
+            node = root.find(f".//{tag}")
+            if node is None:
+                return None
+            for name in names:
+                try:
+                    if node.get(name) is not None:
+                        return int(node.get(name))
+                except ValueError:
+                    return None
+            return None
+
+        qty = tuple(_int_attr(f'writecard{i}', 'qty') or 0 for i in range(1, 5))
+        carrier_columns = _int_attr('carrier', 'columns', 'column') or 2
+        barcode_length = _int_attr('barcode', 'length')
+
+        script_path = None
+        script_el = root.find(".//script")
+        if script_el is not None and 'filePath' in script_el.attrib:
+            script_path = os.path.join(model_dir, f"{model}_script.txt")
+
+        return cls(family=family, model=model, settings_path=settings_path, writecard_qty=qty,
+                   carrier_columns=carrier_columns, barcode_length=barcode_length, script_path=script_path)
+
+    def qty(self, card_number: int) -> int:
+        try:
+            return self.writecard_qty[int(card_number) - 1]
+        except (IndexError, ValueError):
+            return 0
+
+
+class ExamineFlags(dict):
+    """
+    clsInfo 전용 dict. 값이 갱신될 때마다 대기 중인 do_test 스레드를 즉시 깨웁니다.
+    - slotParse, update_sensorID_from_client, update_barcode_from_client, c_app 촬영 핸들러 등
+      clsInfo[...] = ... 로 플래그를 세우는 모든 경로가 그대로 이벤트 신호가 됩니다.
+    - setdefault/pop/del/popitem/clear로 값이 바뀌는 경우도 같은 신호가 됩니다.
+    - version: 갱신 횟수. wait_change(seen, timeout)은 version이 seen과 달라질 때까지(또는 timeout까지) 대기합니다.
+      (조건 평가 전에 version을 읽어 두면 평가 도중의 갱신도 놓치지 않습니다)
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cond = threading.Condition()
+        self.version = 0
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.notify()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.notify()
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return super().__getitem__(key)
+        value = super().setdefault(key, default)
+        self.notify()
+        return value
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.notify()
+
+    def pop(self, key, *default):
+        if key not in self:
+            return super().pop(key, *default)   # 없는 key: 기본값 반환 또는 KeyError (상태 변화 없음)
+        value = super().pop(key)
+        self.notify()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self.notify()
+        return item
+
+    def clear(self):
+        super().clear()
+        self.notify()
+
+    def notify(self):
+        with self._cond:
+            self.version += 1
+            self._cond.notify_all()
+
+    def wait_change(self, seen: int, timeout: Optional[float] = None) -> bool:
+        """version이 seen에서 바뀌면 True, timeout이 지나면 False."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.version != seen, timeout)
+
+
+class BankAddressRegistry:
+    """
+    Bank1~5의 송신 주소 ('ip', port)를 메모리에서 해석하는 레지스트리.
+    - sysInfo.xml의 <clients><bank> 설정을 1회 파싱해 보관하고, 파일 mtime이 바뀐 경우에만 다시 읽습니다.
+    - 설정 주소와 서버가 수신으로 학습한 주소(live)를 병합합니다.
+      * Bank1~4: 설정 주소 우선, 설정이 없으면 writeCard(TCPServer.client_sockets)가 학습한 주소
+      * Bank5  : ioBoard가 학습한 주소 우선, 없으면 설정 주소 (기존 send 경로의 우선순위 유지)
+    - udpPort/port가 없으면 서버 portNumber로 폴백합니다. (경고는 재로딩마다 Bank별 1회만 출력)
+    """
+    MTIME_CHECK_INTERVAL = 1.0
+
+    def __init__(self, baseDir, writeCard=None, ioBoard=None, warn=None):
+        self.baseDir = baseDir
+        self.sysinfo_path = os.path.join(baseDir, 'sysInfo.xml')
+        self.writeCard = writeCard
+        self.ioBoard = ioBoard
+        self._warn = warn
+        self._configured: Dict[int, tuple] = {}
+        self._options: Dict[int, dict] = {}
+        self._mtime = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """다음 조회 시 sysInfo.xml을 강제로 다시 읽도록 합니다."""
+        with self._lock:
+            self._mtime = None
+            self._next_check = 0.0
+
+    def _load(self, mtime):
+        configured: Dict[int, tuple] = {}
+        options: Dict[int, dict] = {}
+        fallback_banks = []
+        try:
+            root = ET.parse(self.sysinfo_path).getroot()
+            clients = root.find('clients')
+            fallback_port = None
+            for bank in (clients.findall('bank') if clients is not None else []):
+                try:
+                    bank_no = int(bank.get('number'))
+                except (TypeError, ValueError):
+                    continue
+                ip = bank.get('ip')
+                if not ip or bank_no in configured:
+                    continue
+                options[bank_no] = dict(bank.attrib)
+                port_str = bank.get('udpPort') or bank.get('port') or bank.get('udp_port')
+                if port_str and str(port_str).isdigit():
+                    configured[bank_no] = (ip, int(port_str))
+                    continue
+
+                # 포트가 없으면 서버 포트로 폴백(주의: 대상 장치가 해당 포트에서 수신 중이어야 유효)
+                if fallback_port is None:
+                    try:
+                        server_info = util_base.get_xml_info(self.baseDir, 'server')
+                        fallback_port = int(server_info.get('portNumber')) if server_info and server_info.get(
+                            'portNumber') else 0
+                    except Exception:
+                        fallback_port = 0
+                if fallback_port:
+                    configured[bank_no] = (ip, fallback_port)
+                    fallback_banks.append((bank_no, fallback_port))
+        except Exception as e:
+            print(f"[JobControl] Failed to read bank addresses from sysInfo.xml: {e}")
+
+        with self._lock:
+            self._configured = configured
+            self._options = options
+            self._mtime = mtime
+
+        if self._warn:
+            for bank_no, port in fallback_banks:
+                try:
+                    self._warn(f"[Warning] Bank{bank_no} udpPort/port 미설정 → 서버 포트({port})로 폴백 전송 시도")
+                except Exception:
+                    pass
+
+    def _reload_if_changed(self):
+        now = time.monotonic()
+        if now < self._next_check and self._mtime is not None:
+            return
+        self._next_check = now + self.MTIME_CHECK_INTERVAL
+        try:
+            mtime = os.stat(self.sysinfo_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime is None or mtime != self._mtime:
+            self._load(mtime)
+
+    def configured(self, bank_number: int):
+        """sysInfo.xml에 설정된 Bank 주소만 반환 (없으면 None)"""
+        self._reload_if_changed()
+        return self._configured.get(int(bank_number))
+
+    def options(self, bank_number: int) -> dict:
+        """sysInfo.xml <bank>의 속성 전체 (scriptTransfer, scriptWindow 등 Bank별 옵션)"""
+        self._reload_if_changed()
+        return self._options.get(int(bank_number), {})
+
+    def live(self, bank_number: int):
+        """서버가 수신으로 학습한 Bank 주소를 반환 (없으면 None)"""
+        bank_number = int(bank_number)
+        try:
+            if bank_number == 5:
+                if self.ioBoard is not None:
+                    return self.ioBoard.get_connected_sockets().get('Bank5')
+            elif self.writeCard is not None:
+                return self.writeCard.client_sockets.get(f'Bank{bank_number}')
+        except Exception:
+            pass
+        return None
+
+    def resolve(self, bank_number: int):
+        """송신에 사용할 ('ip', port)를 반환. 어떤 경로로도 특정할 수 없으면 None."""
+        bank_number = int(bank_number)
+        if bank_number == 5:
+            return self.live(5) or self.configured(5)
+        return self.configured(bank_number) or self.live(bank_number)
+
+
 class JobController(QtCore.QObject):
     EXIT_THREAD = False
+    SCRIPT_CHUNK_SIZE = 768        # 스크립트 청크 크기(bytes)
+    SCRIPT_CHUNK_INTERVAL = 0.05   # Bank별 청크 송신 간격(sec, 구형 전송 방식)
+    SCRIPT_WINDOW = 8              # 윈도우 전송 기본 윈도우 크기(청크 수)
+    SCRIPT_RTO = 0.2               # 윈도우 전송 재전송 타임아웃(sec)
+    SCRIPT_TRANSFER_TIMEOUT = 30   # 윈도우 전송 Bank별 전체 타임아웃(sec)
+    SCRIPT_QUERY_TIMEOUT = 0.5     # 'Script query' 해시 응답 대기 시간(sec)
+    SCRIPT_QUERY_ATTEMPTS = 3      # 'Script query' 1회 확인 시 최대 송신 횟수 (UDP 손실 대비 재질의)
+    SCRIPT_QUERY_LEGACY_AFTER = 3  # 연속으로 응답 없는 확인 횟수가 이 값에 이르면 구형 펌웨어로 보고 질의 생략
+    MOTION_SEND_TIMEOUT = 0.5      # 동작 명령(Pusher front/back) 실제 송신 결과 대기 시간(sec)
     signalMessage = QtCore.Signal(str, str, dict)
 
     def __init__(self, baseDir, objName='', mainWindow=None):
@@ -21,7 +283,7 @@ class JobController(QtCore.QObject):
             self.clients_info = []
         self.io_socket = None
 
-        self.clsInfo = {'is_examine': False, 'Writecard 1 Ready': False, 'Writecard 2 Ready': False,
+        self.clsInfo = ExamineFlags({'is_examine': False, 'Writecard 1 Ready': False, 'Writecard 2 Ready': False,
                         'Writecard 3 Ready': False, 'Writecard 4 Ready': False,
                         'Left_Recon_Script': False, 'Right_Recon_Script': False,
                         'IOBoard_Ready': False, 'is_abortTest': False,
@@ -36,21 +298,32 @@ class JobController(QtCore.QObject):
                         'button_unpushed': False,
                         'pusher_down_tes': None, 'button_unpushed_ts': None, 'pusher_sequence_decided': False,
                         'early_button_unpushed': False,
-                        'force_abort': False}
+                        'force_abort': False})
         self.job_modules_Left = {}
         self.job_modules_Right = {}
         self.left_ready_printed = False
         self.right_ready_printed = False
         self.settings_xml_info = os.path.join(self.baseDir, 'models', self.p_mainWindow.cb_customerName.currentText(),
                                               self.p_mainWindow.cb_selectedModel.currentText(), 'settings.xml')
+        # 현재 모델의 settings.xml 스냅샷 (make_dictionary / reset_job_context에서 갱신)
+        self.model_settings: Optional[ModelSettings] = None
         self._test_thread = None
         self._barcode_read_requested = False
 
+        # slotParse 메시지 라우팅 테이블 (수신 스레드 시작 전에 구성)
+        self.dispatcher = self._build_dispatcher()
+
         try:
-            # Write Card 1~4 서버
-            self.writeCard = c_udp_server.TCPServer(objName='writeCard', baseDir=self.baseDir,
-                                                    mainWindow=self.p_mainWindow)
+            # Write Card 1~4 서버 (<server engine="asyncio">이면 asyncio 기반 서버 사용)
+            server_cls = c_udp_server.TCPServer
+            server_info = util_base.get_xml_info(self.baseDir, 'server')
+            if isinstance(server_info, dict) and str(server_info.get('engine', '')).lower() == 'asyncio':
+                server_cls = c_udp_async_server.AsyncUDPServer
+            self.writeCard = server_cls(objName='writeCard', baseDir=self.baseDir, mainWindow=self.p_mainWindow)
             self.writeCard.signalMessage.connect(self.slotParse, type=QtCore.Qt.ConnectionType.DirectConnection)
+            # 바이너리 프레임 ACK/NACK은 문자열 변환 없이 윈도우 전송으로 바로 전달
+            self.writeCard.set_frame_handler(c_udp_frame.MSG_SCRIPT_ACK, self._on_script_ack_frame)
+            self.writeCard.set_frame_handler(c_udp_frame.MSG_SCRIPT_NACK, self._on_script_ack_frame)
 
             # IO Board 서버(attach 모드)
             self.ioBoard = c_udp_ioboard.IOBoardServer(objName='ioBoard', baseDir=self.baseDir,
@@ -75,6 +348,45 @@ class JobController(QtCore.QObject):
         self._pending_script_by_wc: Dict[object, bytes] = {}
         self._pending_lock = threading.Lock()
 
+        # 진행 중인 윈도우 스크립트 전송 { "Bank1": WindowedScriptSender, ... } (SCRIPT_ACK 라우팅용)
+        self._script_senders: Dict[str, c_script_transfer.WindowedScriptSender] = {}
+
+        # 현재 모델 스크립트의 송신 준비 데이터그램 (파일이 바뀌지 않으면 사이클 간 재사용)
+        self._prepared_script: Optional[c_script_transfer.PreparedScript] = None
+
+        # 스크립트 해시 캐시
+        # - _delivered_script_hash: Bank별 마지막으로 전송 완료한 스크립트 sha256
+        # - _script_hash_waiters: 'Script query' 응답 대기 { "Bank1": (Event, [reported_hash]) }
+        # - _script_query_misses: Bank별 연속 무응답 확인 횟수 (응답을 받으면 0)
+        # - _script_query_unsupported: SCRIPT_QUERY_LEGACY_AFTER번 연속 무응답인 Bank (구형 펌웨어, 이후 질의 생략)
+        #   해시 응답이 한 번이라도 오거나 Bank 연결이 끊기면 해제
+        self._delivered_script_hash: Dict[str, str] = {}
+        self._script_hash_waiters: Dict[str, tuple] = {}
+        self._script_query_misses: Dict[str, int] = {}
+        self._script_query_unsupported = set()
+        # 'Script hash' 응답의 caps=... 로 보고된 Bank별 지원 기능 (예: {'deflate', 'window', 'json'})
+        self._script_caps: Dict[str, set] = {}
+        # 직전 사이클 종료 시점의 UDP 수신 소켓 커널 drop 수 (_log_socket_stats)
+        self._udp_drops: Optional[int] = None
+
+        # Bank1~5 송신 주소 레지스트리 (sysInfo.xml 1회 파싱 + live 주소 병합)
+        self.bank_registry = BankAddressRegistry(
+            self.baseDir,
+            writeCard=getattr(self, 'writeCard', None),
+            ioBoard=getattr(self, 'ioBoard', None),
+            warn=lambda m: self.signalMessage.emit(self.objectName(), 'ui', {'msg': m}))
+
+        # 사이클 타임 측정(trace JSON + 단계별 요약)
+        self.tracer = c_cycle_trace.tracer_from_config(self.baseDir, util_base.get_xml_info,
+                                                       build=str(getattr(mainWindow, 'appVer', '') or ''))
+        self.tracer.set_step_names(EXAMINE_STEP_NAMES)
+
+        # 촬영 → 디코드 메모리 파이프라인 (저장 이미지를 읽을 수 없거나 mode="file"이면 기존 barcode/*.txt 경로)
+        self.barcode_pipeline = c_barcode_pipeline.pipeline_from_config(self.baseDir, util_base.get_xml_info,
+                                                                        mainWindow)
+        if getattr(self, 'writeCard', None) is not None:
+            self.writeCard.add_tx_listener(self.tracer.outbound)
+
 
 
     @QtCore.Slot()
@@ -108,125 +420,151 @@ class JobController(QtCore.QObject):
         except Exception as e:
             self.logger.error(f"Error in slotParse: {str(e)}")
 
-        # 1) Write Card 1~4 처리
-        if objName.startswith('writeCard'):
-            try:
-                # UDP 전환: 연결 이벤트 사용 안 함
-                if msgType == 'job':
-                    msg = values.get('msg', '')
-
-                    if msg.startswith("Script save"):
-                        self.update_job_module_status(values)
+        # 수신 메시지 타임스탬프 기록(사이클 진행 중일 때만)
+        if msgType == 'job' and self.tracer.active:
+            self.tracer.inbound(objName, values.get('where'), values.get('msg', ''))
 
-                    elif msg.startswith("sensor_ID"):
-                        dict_str = values['msg'][len("sensor_ID: "):].strip()
-                        try:
-                            sensor_ID_dict = ast.literal_eval(dict_str)
-                        except Exception as e:
-                            print(f"Failed to parse sensor_ID: {e}")
-                            sensor_ID_dict = {}
-                        self.update_sensorID_from_client(Writecard_num=values['where'], sensor_ID=sensor_ID_dict)
-
-                    elif msg.startswith("barcode_info"):
-                        prefix = "barcode_info: OrderedDict("
-                        if values['msg'].startswith(prefix):
-                            dict_str = values['msg'][len(prefix):-1].strip()
-                        else:
-                            dict_str = values['msg'][len("barcode_info: "):].strip()
-                        try:
-                            barcode_info_dict = ast.literal_eval(dict_str)
-                        except Exception as e:
-                            print(f"Failed to parse barcode_info: {e}")
-                            barcode_info_dict = {}
-                        self.update_barcode_from_client(Writecard_num=values['where'], barcode_info=barcode_info_dict)
-
-                    elif msg == 'Scan Stop':
-                        # 카메라/클라이언트에서 오는 스캔 중단
-                        self.clsInfo['barcode_stop'] = True
-                        print('[slotParse] barcode_stop latched (Scan Stop)')
+        if msgType != 'job':
+            return
 
-            except Exception as e:
-                self.logger.error(f"Error in slotParse: {str(e)}")
+        # 메시지 → 핸들러 테이블 조회 (Write Card 1~4 / IO Board 공용 dispatcher)
+        if objName.startswith('writeCard'):
+            source = 'writeCard'
+        elif objName.startswith('ioBoard'):
+            source = 'ioBoard'
+        else:
             return
+        try:
+            self.dispatcher.dispatch(source, values.get('msg', ''), values)
+        except Exception as e:
+            where = '' if source == 'writeCard' else f'({source})'
+            self.logger.error(f"Error in slotParse{where}: {str(e)}")
 
-        # 2) IO Board 처리
-        if objName.startswith('ioBoard'):
+    def _build_dispatcher(self) -> c_message_dispatch.MessageDispatcher:
+        """
+        slotParse 메시지 라우팅 테이블.
+        - 새 펌웨어 메시지는 여기에 한 줄 등록으로 추가합니다.
+        """
+        dispatcher = c_message_dispatch.MessageDispatcher()
+        wc, io = 'writeCard', 'ioBoard'
+
+        # Write Card 1~4
+        dispatcher.register(wc, 'SCRIPT_ACK', lambda v, m: self._on_script_ack(v.get('where', ''), m), prefix=True)
+        dispatcher.register(wc, 'SCRIPT_NACK', lambda v, m: self._on_script_ack(v.get('where', ''), m), prefix=True)
+        dispatcher.register(wc, 'Script hash', lambda v, m: self._on_script_hash(v.get('where', ''), m), prefix=True)
+        dispatcher.register(wc, 'Script save', lambda v, m: self.update_job_module_status(v), prefix=True)
+        dispatcher.register(wc, 'sensor_ID', self._on_sensor_id_message, prefix=True)
+        dispatcher.register(wc, 'barcode_info', self._on_barcode_info_message, prefix=True)
+
+        # IO Board
+        dispatcher.register(io, 'Mapping start', self._on_mapping_start)
+        dispatcher.register(io, 'Pusher down finished', self._on_pusher_down_finished)
+        dispatcher.register(io, 'Pusher back finished', self._on_pusher_back_finished)
+        dispatcher.register(io, 'Button unpushed', self._on_button_unpushed)
+
+        # 공통: 카메라/클라이언트에서 오는 스캔 중단
+        dispatcher.register((wc, io), 'Scan Stop', self._on_scan_stop)
+        return dispatcher
+
+    def _on_sensor_id_message(self, values, msg):
+        # 바이너리 프레임(MSG_SENSOR_ID)은 서버가 디코드한 dict를 values['payload']로 전달
+        sensor_ID_dict = values.get('payload')
+        if sensor_ID_dict is None:
             try:
-                # UDP 전환: 연결 이벤트 사용 안 함
-                if msgType == 'job':
-                    msg = values.get('msg', '')
-
-                    if msg == 'Mapping start':
-                        # 테스트가 이미 진행 중이면 무시
-                        if self.clsInfo.get('is_examine') or (
-                                getattr(self, '_test_thread', None) is not None and self._test_thread.is_alive()):
-                            print("테스트가 이미 실행중입니다. (ignore 'Mapping start')")
-                            return
-
-                        self.clsInfo['pusher_down_finished'] = False
-                        self.clsInfo['button_unpushed'] = False
-                        self.clsInfo['pusher_down_ts'] = None
-                        self.clsInfo['button_unpushed_ts'] = None
-                        self.clsInfo['pusher_sequence_decided'] = False
-                        self.clsInfo['early_button_unpushed'] = False
-                        self.clsInfo['force_abort'] = False
-                        self.clsInfo['pusher back'] = False
-
-                        if not self.clsInfo['is_examine']:
-                            self.clsInfo['sensorID'] = str()
-                            self.clsInfo['is_examine'] = True
-                            self.clsInfo['is_abortTest'] = False
-                            self._test_thread = threading.Thread(target=self.do_test, daemon=True)
-                            self._test_thread.start()
-
-                    elif msg == 'Pusher down finished':
-                        if not self.clsInfo.get('pusher_down_finished'):
-                            self.clsInfo['pusher_down_finished'] = True
-                            self.clsInfo['pusher_down_ts'] = time.perf_counter()
-                            print('[slotParse] Pusher down finished (first)')
-                        self.clsInfo['early_button_unpushed'] = False
-                        self.clsInfo['force_abort'] = False
-
-                    elif msg == 'Pusher back finished':
-                        self.clsInfo['pusher back'] = True
-
-                    elif msg == 'Button unpushed':
-                        if not self.clsInfo.get('button_unpushed'):
-                            self.clsInfo['button_unpushed'] = True
-                            self.clsInfo['button_unpushed_ts'] = time.perf_counter()
-
-                        if not self.clsInfo.get('pusher_down_finished'):
-                            print('[slotParse] Button came before PusherDown → request abort')
-                            self.clsInfo['early_button_unpushed'] = True
-                            self.clsInfo['force_abort'] = True
-                            # [변경] UDP 주소 해석 → 직접 전송
-                            try:
-                                addr = None
-                                try:
-                                    sockets = self.ioBoard.get_connected_sockets()
-                                    addr = sockets.get('Bank5')
-                                except Exception:
-                                    addr = None
-                                if not addr:
-                                    addr = self._get_bank_addr_from_config(5)
-
-                                if addr:
-                                    self.writeCard.send_data(client_socket=addr, data='Pusher back')
-                                    print("[slotParse] Sent 'Pusher back' (early button, UDP addr)")
-                                else:
-                                    print("[slotParse] Bank5 address not found; cannot send 'Pusher back'")
-                            except Exception as e:
-                                print(f"[slotParse] Failed to send 'Pusher back': {e}")
-
-                    elif msg == 'Scan Stop':
-                        self.clsInfo['barcode_stop'] = True
-                        print('[slotParse] barcode_stop latched (Scan Stop)')
+                sensor_ID_dict = c_payload.parse_message(msg, "sensor_ID")
+            except ValueError as e:
+                print(f"Failed to parse sensor_ID: {e}")
+                sensor_ID_dict = {}
+        self.update_sensorID_from_client(Writecard_num=values['where'], sensor_ID=sensor_ID_dict)
+
+    def _on_barcode_info_message(self, values, msg):
+        # JSON / key=value / dict repr / OrderedDict repr 모두 c_payload가 판별 (프레임이면 values['payload'])
+        barcode_info_dict = values.get('payload')
+        if barcode_info_dict is None:
+            try:
+                barcode_info_dict = c_payload.parse_message(msg, "barcode_info")
+            except ValueError as e:
+                print(f"Failed to parse barcode_info: {e}")
+                barcode_info_dict = {}
+        self.update_barcode_from_client(Writecard_num=values['where'], barcode_info=barcode_info_dict)
+
+    def _on_scan_stop(self, values, msg):
+        self.clsInfo['barcode_stop'] = True
+        print('[slotParse] barcode_stop latched (Scan Stop)')
+
+    def _on_mapping_start(self, values, msg):
+        # 테스트가 이미 진행 중이면 무시
+        if self.clsInfo.get('is_examine') or (
+                getattr(self, '_test_thread', None) is not None and self._test_thread.is_alive()):
+            print("테스트가 이미 실행중입니다. (ignore 'Mapping start')")
+            return
 
+        self.clsInfo['pusher_down_finished'] = False
+        self.clsInfo['button_unpushed'] = False
+        self.clsInfo['pusher_down_ts'] = None
+        self.clsInfo['button_unpushed_ts'] = None
+        self.clsInfo['pusher_sequence_decided'] = False
+        self.clsInfo['early_button_unpushed'] = False
+        self.clsInfo['force_abort'] = False
+        self.clsInfo['pusher back'] = False
+
+        if not self.clsInfo['is_examine']:
+            self.clsInfo['sensorID'] = str()
+            self.clsInfo['is_examine'] = True
+            self.clsInfo['is_abortTest'] = False
+            self._test_thread = threading.Thread(target=self.do_test, daemon=True)
+            self._test_thread.start()
+
+    def _on_pusher_down_finished(self, values, msg):
+        if not self.clsInfo.get('pusher_down_finished'):
+            self.clsInfo['pusher_down_finished'] = True
+            self.clsInfo['pusher_down_ts'] = time.perf_counter()
+            print('[slotParse] Pusher down finished (first)')
+        self.clsInfo['early_button_unpushed'] = False
+        self.clsInfo['force_abort'] = False
+
+    def _on_pusher_back_finished(self, values, msg):
+        self.clsInfo['pusher back'] = True
+
+    def _on_button_unpushed(self, values, msg):
+        if not self.clsInfo.get('button_unpushed'):
+            self.clsInfo['button_unpushed'] = True
+            self.clsInfo['button_unpushed_ts'] = time.perf_counter()
+
+        if not self.clsInfo.get('pusher_down_finished'):
+            print('[slotParse] Button came before PusherDown → request abort')
+            self.clsInfo['early_button_unpushed'] = True
+            self.clsInfo['force_abort'] = True
+            # [변경] UDP 주소 해석 → 직접 전송
+            try:
+                addr = self.bank_registry.resolve(5)
+                if not addr:
+                    print("[slotParse] Bank5 address not found; cannot send 'Pusher back'")
+                elif self._send_motion(addr, 'Pusher back'):
+                    print("[slotParse] Sent 'Pusher back' (early button, UDP addr)")
+                else:
+                    print("[slotParse] Failed to send 'Pusher back' (early button)")
             except Exception as e:
-                self.logger.error(f"Error in slotParse(ioBoard): {str(e)}")
-            return
+                print(f"[slotParse] Failed to send 'Pusher back': {e}")
 
+    def _send_motion(self, addr, msg) -> bool:
+        """
+        IO 보드 동작 명령을 송신 큐(최우선)에 넣고 실제 송신 결과를 기다림.
+        - send_async의 Future는 적재 즉시 반환되므로, 결과(sendto 성공 여부)를 MOTION_SEND_TIMEOUT까지 기다려
+          기존 send_data의 bool 판정과 같게 맞춥니다. (큐 중지/송신 실패/타임아웃이면 False)
+        """
+        future = self.writeCard.send_async(addr, msg, priority=c_udp_server.TX_PRIORITY_MOTION)
+        if future is None:
+            return False
+        try:
+            return bool(future.result(timeout=self.MOTION_SEND_TIMEOUT))
+        except Exception as e:
+            print(f"[JobController] '{msg}' to {addr} not sent within {self.MOTION_SEND_TIMEOUT}s: {e!r}")
+            return False
 
+    def get_dispatch_stats(self):
+        """slotParse 메시지 종류별 호출 횟수/처리 시간"""
+        return self.dispatcher.stats()
 
 
 
@@ -375,6 +713,9 @@ class JobController(QtCore.QObject):
             return
 
         if 1 <= bank_no <= 4:
+            # 재연결 시 펌웨어가 바뀌었을 수 있으므로 해시 질의 무응답 기록 해제
+            self._script_query_misses.pop(f'Bank{bank_no}', None)
+            self._script_query_unsupported.discard(f'Bank{bank_no}')
             key = f'Writecard {bank_no} Ready'
             if key in self.clsInfo:
                 self.clsInfo[key] = False
@@ -399,11 +740,23 @@ class JobController(QtCore.QObject):
 
 
     def make_dictionary(self, baseDir, selected_family, selected_model):
-        # 1) settings.xml 경로
+        # 1) settings.xml 스냅샷 생성 (이번 모델에 대해 1회만 파싱)
         settings_path = os.path.join(baseDir, "models", selected_family, selected_model, "settings.xml")
         if not os.path.exists(settings_path):
             print(f"[ERROR] settings.xml 파일이 존재하지 않습니다: {settings_path}")
             return
+        try:
+            self.model_settings = ModelSettings.load(baseDir, selected_family, selected_model)
+        except Exception as e:
+            print(f"[ERROR] settings.xml 파싱 실패: {settings_path} : {e}")
+            self.model_settings = ModelSettings(family=selected_family, model=selected_model,
+                                                settings_path=settings_path)
+        self.settings_xml_info = settings_path
+        # 모델별 모듈 ROI 맵 (settings.xml 옆 roi_map.json, 없으면 첫 촬영에서 보정)
+        self.barcode_pipeline.load_roi_map(settings_path)
+
+        # 스크립트 로딩 구간 측정 시작 ('Script all loaded'에서 종료)
+        self.tracer.begin('script_load')
 
         # [ADD] 새 사이클 시작: Recon 관련 게이트/플래그 초기화
         #  - 'Left/Right Recon Script Loaded'를 다음 사이클에서 다시 emit하기 위함
@@ -412,39 +765,11 @@ class JobController(QtCore.QObject):
         self.clsInfo['Left_Recon_Script'] = False
         self.clsInfo['Right_Recon_Script'] = False
 
-        # 2) writecard1~4 qty 파싱 (파싱 실패 시 0)
-        writecard1_qty = 0
-        writecard2_qty = 0
-        writecard3_qty = 0
-        writecard4_qty = 0
-
-        attrs = util_base.parse_settings_xml(settings_path, "writecard1")
-        if attrs:
-            writecard1_qty = int(attrs.get("qty", 0))
-        attrs = util_base.parse_settings_xml(settings_path, "writecard2")
-        if attrs:
-            writecard2_qty = int(attrs.get("qty", 0))
-        attrs = util_base.parse_settings_xml(settings_path, "writecard3")
-        if attrs:
-            writecard3_qty = int(attrs.get("qty", 0))
-        attrs = util_base.parse_settings_xml(settings_path, "writecard4")
-        if attrs:
-            writecard4_qty = int(attrs.get("qty", 0))
-
-        # 3) carrier columns 파싱 (기본값 2로 가정)
-        carrier_columns = 2
-        try:
-            c_attrs = util_base.parse_settings_xml(settings_path, "carrier")
-            if c_attrs and "columns" in c_attrs:
-                carrier_columns = int(c_attrs.get("columns"))
-            else:
-                tree = ET.parse(settings_path)
-                root = tree.getroot()
-                node = root.find(".//carrier")
-                if node is not None and node.get("columns") is not None:
-                    carrier_columns = int(node.get("columns"))
-        except Exception:
-            pass
+        # 2) writecard1~4 qty (파싱 실패 시 0)
+        writecard1_qty, writecard2_qty, writecard3_qty, writecard4_qty = self.model_settings.writecard_qty
+
+        # 3) carrier columns (기본값 2)
+        carrier_columns = self.model_settings.carrier_columns
 
         # 4) 딕셔너리 초기화
         self.job_modules_Left.clear()
@@ -495,51 +820,50 @@ class JobController(QtCore.QObject):
     def send_scripts_to_clients(self):
         """
         연결된 클라이언트에게 스크립트를 전송 (UDP 버전)
-        - Bank1~4의 주소를 sysInfo.xml에서 읽어와 직접 UDP 전송
-        - 'Script send' 알림 → 파일 청크 전송(1024 bytes) → 'EOF' 전송 순서
+        - Bank1~4의 주소를 주소 레지스트리에서 해석해 직접 UDP 전송
+        - Bank별 스레드에서 'Script send' 알림 → 파일 청크 전송(768 bytes) → 'EOF' 전송 순서로 병렬 수행
         """
         try:
-            family_name = util_base.get_xml_info(self.baseDir, 'recent/familyName')
-            model_name = util_base.get_xml_info(self.baseDir, 'recent/modelName')
-
-            if not family_name or not model_name:
-                self.signalMessage.emit(self.objectName(), 'ui',
-                                        {'msg': "[Error] familyName 또는 modelName 정보를 가져오지 못했습니다."})
-                return
-
-            settings_file_path = os.path.join(self.baseDir, 'models', family_name, model_name, 'settings.xml')
-            if not os.path.exists(settings_file_path):
-                self.signalMessage.emit(self.objectName(), 'ui', {'msg': f"[Error] settings.xml 파일을 찾을 수 없습니다."})
-                self.signalMessage.emit(self.objectName(), 'ui', {'msg': f"[Error] {settings_file_path}"})
-                return
-
-            try:
-                tree = ET.parse(settings_file_path)
-                root = tree.getroot()
+            # make_dictionary에서 만든 스냅샷이 있으면 재사용, 없으면 recent 모델 기준으로 생성
+            model_settings = self.model_settings
+            if model_settings is None:
+                family_name = util_base.get_xml_info(self.baseDir, 'recent/familyName')
+                model_name = util_base.get_xml_info(self.baseDir, 'recent/modelName')
 
-                script_element = root.find(".//script")
-                if script_element is None or 'filePath' not in script_element.attrib:
+                if not family_name or not model_name:
                     self.signalMessage.emit(self.objectName(), 'ui',
-                                            {'msg': "[Error] settings.xml에서 script 태그 또는 filePath키를 찾을 수 없습니다."})
+                                            {'msg': "[Error] familyName 또는 modelName 정보를 가져오지 못했습니다."})
+                    return
+
+                settings_file_path = os.path.join(self.baseDir, 'models', family_name, model_name, 'settings.xml')
+                if not os.path.exists(settings_file_path):
+                    self.signalMessage.emit(self.objectName(), 'ui', {'msg': f"[Error] settings.xml 파일을 찾을 수 없습니다."})
+                    self.signalMessage.emit(self.objectName(), 'ui', {'msg': f"[Error] {settings_file_path}"})
                     return
 
-                script_file_path = os.path.join(self.baseDir, 'models', family_name, model_name,
-                                                f"{model_name}_script.txt")
-                # script_file_path = os.path.join(self.baseDir, 'models', family_name, model_name,
-                #                                 script_element.get('filePath'))
-                if not os.path.exists(script_file_path):
+                try:
+                    model_settings = ModelSettings.load(self.baseDir, family_name, model_name)
+                except ET.ParseError as e:
                     self.signalMessage.emit(self.objectName(), 'ui',
-                                            {'msg': f"[Error] 스크립트 파일을 찾을 수 없습니다. : {script_file_path}"})
+                                            {'msg': f"[Error] settings.xml 파일을 파싱하는 중 오류 발생: {str(e)}"})
                     return
-            except ET.ParseError as e:
+                self.model_settings = model_settings
+
+            if model_settings.script_path is None:
                 self.signalMessage.emit(self.objectName(), 'ui',
-                                        {'msg': f"[Error] settings.xml 파일을 파싱하는 중 오류 발생: {str(e)}"})
+                                        {'msg': "[Error] settings.xml에서 script 태그 또는 filePath키를 찾을 수 없습니다."})
+                return
+
+            script_file_path = model_settings.script_path
+            if not os.path.exists(script_file_path):
+                self.signalMessage.emit(self.objectName(), 'ui',
+                                        {'msg': f"[Error] 스크립트 파일을 찾을 수 없습니다. : {script_file_path}"})
                 return
 
             # Bank1~4 주소 수집
             bank_addrs = {}
             for bank_no in (1, 2, 3, 4):
-                addr = self._get_bank_addr_from_config(bank_no)
+                addr = self.bank_registry.resolve(bank_no)
                 if addr:
                     bank_addrs[f"Bank{bank_no}"] = addr
                 else:
@@ -550,62 +874,43 @@ class JobController(QtCore.QObject):
                 self.signalMessage.emit(self.objectName(), 'ui', {'msg': "[Error] 전송 가능한 Bank 주소가 없습니다."})
                 return
 
-            # 1) 사전 알림: "Script send"
-            for bank_name, addr in bank_addrs.items():
-                try:
-                    ok = self.writeCard.send_data(client_socket=addr, data="Script send")
-                    time.sleep(0.05)
-                    if ok:
-                        self.signalMessage.emit(self.objectName(), 'ui',
-                                                {'msg': f"{bank_name} 'Script send' 메시지 전송 완료"})
-                    else:
-                        self.signalMessage.emit(self.objectName(), 'ui',
-                                                {'msg': f"[Error] {bank_name} 'Script send' 전송 실패"})
-                except Exception:
-                    self.signalMessage.emit(self.objectName(), 'ui',
-                                            {'msg': f"[Error] {bank_name} 'Script send' 전송 중 예외 발생"})
-
-            # 2) 스크립트 파일 청크 전송
-            chunks = []
-            with open(script_file_path, 'rb') as script_file:
-                while True:
-                    chunk = script_file.read(768)
-                    if not chunk:
-                        break
-                    chunks.append(chunk)
-            total_chunks = len(chunks)
+            # 스크립트 데이터그램 준비 (모든 Bank/재전송이 동일한 bytes를 공유)
+            prepared = self._get_prepared_script(script_file_path)
+            script_hash = prepared.digest
 
+            # Bank별 전송을 병렬 수행: 각 Bank는 먼저 'Script query'로 보유 스크립트 해시를 확인하고,
+            # 일치하면 업로드를 생략(skipped_banks), 아니면 'Script send' → 청크 → 'EOF'를 전송.
+            # 한 Bank의 실패는 해당 Bank만 중단시킴(failed_banks)
             failed_banks = set()
-            for idx, chunk in enumerate(chunks, 1):
-                for bank_name, addr in list(bank_addrs.items()):
-                    if bank_name in failed_banks:
-                        continue
-                    try:
-                        ok = self.writeCard.send_chunk_to_clients(client_socket=addr, chunk=chunk)
-                        print(f'chunk: {chunk}')
-                        time.sleep(0.05)
-                        if ok:
-                            self.signalMessage.emit(self.objectName(), 'ui',
-                                                    {'msg': f"{bank_name} 스크립트 ({idx}/{total_chunks}) 전송 완료"})
-                        else:
-                            failed_banks.add(bank_name)
-                            self.signalMessage.emit(self.objectName(), 'ui',
-                                                    {'msg': f"[Error] {bank_name} 데이터 전송 실패"})
-                    except Exception:
-                        failed_banks.add(bank_name)
-                        self.signalMessage.emit(self.objectName(), 'ui',
-                                                {'msg': f"[Error] {bank_name} 데이터 전송 중 예외 발생"})
+            skipped_banks = set()
+            result_lock = threading.Lock()
 
-            # 3) EOF 전송
-            for bank_name, addr in bank_addrs.items():
-                if bank_name in failed_banks:
-                    continue
-                ok = self.writeCard.send_data(client_socket=addr, data="EOF")
-                if ok:
-                    print(f"[UDPServer] {bank_name}에 종료 시그널 전송 완료")
+            def _worker(bank_name, addr):
+                if self._bank_has_script(bank_name, addr, script_hash):
+                    with result_lock:
+                        skipped_banks.add(bank_name)
+                    return
+                if self._send_script_to_bank(bank_name, addr, prepared):
+                    self._delivered_script_hash[bank_name] = script_hash
                 else:
-                    self.signalMessage.emit(self.objectName(), 'ui',
-                                            {'msg': f"[Error] {bank_name} 종료 시그널 전송 실패"})
+                    with result_lock:
+                        failed_banks.add(bank_name)
+
+            workers = [threading.Thread(target=_worker, args=(bank_name, addr), name=f"ScriptSend-{bank_name}",
+                                        daemon=True)
+                       for bank_name, addr in bank_addrs.items()]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+            if failed_banks:
+                print(f"[JobController] 스크립트 전송 실패 Bank: {sorted(failed_banks)}")
+
+            # 업로드를 생략한 Bank는 카드가 이미 같은 스크립트를 저장하고 있으므로
+            # 'Script save finished: MCU n' 수신과 동일하게 모듈 준비 상태를 갱신
+            for bank_name in sorted(skipped_banks):
+                self._mark_bank_script_loaded(int(bank_name.replace('Bank', '')), model_settings)
 
         except Exception as e:
             self.signalMessage.emit(self.objectName(), 'ui', {'msg': f"[Error] 스크립트 전송 중 오류 발생: {str(e)}"})
@@ -726,34 +1031,333 @@ class JobController(QtCore.QObject):
 
 
 
-    def _get_carrier_columns(self) -> int:
+    def _current_model_settings(self) -> Optional[ModelSettings]:
         """
-        settings.xml의 <carrier columns="..."> 값을 반환.
-        - 파싱 실패 시 기본값 2를 반환.
+        현재 모델의 ModelSettings 스냅샷을 반환.
+        - 아직 생성되지 않았다면 settings_xml_info 경로 기준으로 1회 생성합니다.
+        - settings.xml이 없거나 파싱에 실패하면 None.
         """
+        if self.model_settings is not None:
+            return self.model_settings
         settings_path = getattr(self, "settings_xml_info", None)
         if not settings_path or not os.path.exists(settings_path):
-            return 2
+            return None
+        model_dir = os.path.dirname(settings_path)
+        try:
+            self.model_settings = ModelSettings.load(self.baseDir, os.path.basename(os.path.dirname(model_dir)),
+                                                     os.path.basename(model_dir))
+        except Exception as e:
+            print(f"settings.xml 파싱 실패: {e}")
+            return None
+        return self.model_settings
+
+    def _get_prepared_script(self, script_file_path) -> c_script_transfer.PreparedScript:
+        """스크립트 파일이 바뀌었을 때만 다시 읽고 인코딩, 그 외에는 캐시된 PreparedScript 반환"""
+        prepared = self._prepared_script
+        if prepared is None or not prepared.is_current(script_file_path, self.SCRIPT_CHUNK_SIZE):
+            prepared = c_script_transfer.PreparedScript.load(script_file_path, self.SCRIPT_CHUNK_SIZE)
+            self._prepared_script = prepared
+            print(f"[JobController] 스크립트 준비: {os.path.basename(script_file_path)} "
+                  f"{prepared.raw_size} bytes, {len(prepared)} chunks")
+        return prepared
+
+    def _send_script_to_bank(self, bank_name, addr, prepared) -> bool:
+        """
+        한 Bank에 스크립트를 전송 ('Script send' 알림 → 청크 → 'EOF').
+        - send_scripts_to_clients에서 Bank별 스레드로 병렬 호출됩니다.
+        - sysInfo.xml <bank scriptTransfer="window">인 Bank는 윈도우/ACK 전송을, 그 외는 기존 방식을 사용합니다.
+        - 청크 전송 실패 시 해당 Bank만 중단하고 False를 반환합니다.
+        """
+        options = self.bank_registry.options(int(bank_name.replace('Bank', '')))
+        prepared = self._select_script_encoding(bank_name, prepared, options)
+        frames = self._script_frames(bank_name, prepared)
+        if str(options.get('scriptTransfer', '')).lower() == 'window':
+            return self._send_script_windowed(bank_name, addr, prepared, options, frames)
+
+        # SCRIPT_CHUNK_INTERVAL 페이싱은 송신 큐가 목적지별로 적용합니다.
+        def _send(data) -> bool:
+            return self._send_script_line(addr, data, interval=self.SCRIPT_CHUNK_INTERVAL)
 
-        # 1차: util_base.parse_settings_xml 사용
+        # 1) 사전 알림: "Script send" (압축 시 "Script send DEFLATE <raw_size> <compressed_size>")
         try:
-            attrs = util_base.parse_settings_xml(settings_path, "carrier")
-            if attrs and "columns" in attrs:
-                return int(attrs.get("columns"))
+            ok = _send("Script send" + self._script_encoding_suffix(prepared, frames))
+            if ok:
+                self.signalMessage.emit(self.objectName(), 'ui',
+                                        {'msg': f"{bank_name} 'Script send' 메시지 전송 완료"})
+            else:
+                self.signalMessage.emit(self.objectName(), 'ui',
+                                        {'msg': f"[Error] {bank_name} 'Script send' 전송 실패"})
         except Exception:
-            pass
+            self.signalMessage.emit(self.objectName(), 'ui',
+                                    {'msg': f"[Error] {bank_name} 'Script send' 전송 중 예외 발생"})
 
-        # 2차: XPath로 직접 파싱
+        # 2) 스크립트 청크 전송 (준비된 데이터그램/프레임 그대로 송신)
+        total_chunks = len(prepared)
+        for idx, datagram in enumerate(frames or prepared.legacy_datagrams, 1):
+            try:
+                ok = _send(datagram)
+                if ok:
+                    self.signalMessage.emit(self.objectName(), 'ui',
+                                            {'msg': f"{bank_name} 스크립트 ({idx}/{total_chunks}) 전송 완료"})
+                else:
+                    self.signalMessage.emit(self.objectName(), 'ui',
+                                            {'msg': f"[Error] {bank_name} 데이터 전송 실패"})
+                    return False
+            except Exception:
+                self.signalMessage.emit(self.objectName(), 'ui',
+                                        {'msg': f"[Error] {bank_name} 데이터 전송 중 예외 발생"})
+                return False
+
+        # 3) EOF 전송
+        ok = _send("EOF")
+        if ok:
+            print(f"[UDPServer] {bank_name}에 종료 시그널 전송 완료")
+        else:
+            self.signalMessage.emit(self.objectName(), 'ui',
+                                    {'msg': f"[Error] {bank_name} 종료 시그널 전송 실패"})
+        return ok
+
+    def _send_script_line(self, addr, data, interval=0.0) -> bool:
+        """
+        스크립트 전송용 송신: 송신 큐(TX_PRIORITY_SCRIPT)에 적재 후 완료를 기다림 (Bank 전송 스레드에서만 호출).
+        - 같은 시점의 IO 보드 동작 명령은 스크립트 데이터보다 먼저 송신됩니다.
+        """
+        future = self.writeCard.send_async(addr, data, priority=c_udp_server.TX_PRIORITY_SCRIPT, interval=interval)
+        if future is None:   # 송신 큐 중지(서버 종료)
+            return False
         try:
-            tree = ET.parse(settings_path)
-            root = tree.getroot()
-            node = root.find(".//carrier")
-            if node is not None and node.get("columns") is not None:
-                return int(node.get("columns"))
-        except Exception:
-            pass
+            return bool(future.result(timeout=self.SCRIPT_TRANSFER_TIMEOUT))
+        except Exception as e:
+            print(f"[JobController] script line to {addr} not sent within {self.SCRIPT_TRANSFER_TIMEOUT}s: {e!r}")
+            return False
+
+    def _select_script_encoding(self, bank_name, prepared, options):
+        """
+        Bank별 압축 전송 협상.
+        - 카드가 'Script hash' 응답에 caps=deflate를 보고했거나 sysInfo.xml <bank scriptCompress="deflate">이면
+          deflate 압축본을 사용 (압축 결과가 더 크면 원본 유지)
+        - scriptCompress="off"이면 항상 원본 전송
+        """
+        setting = str(options.get('scriptCompress', '')).lower()
+        if setting in ('off', '0', 'false', 'none'):
+            return prepared
+        if setting != 'deflate' and 'deflate' not in self._script_caps.get(bank_name, ()):
+            return prepared
+        deflated = prepared.deflated()
+        if deflated.wire_size >= prepared.wire_size:
+            return prepared
+        print(f"[JobController] {bank_name} deflate 전송: {prepared.raw_size} → {deflated.wire_size} bytes, "
+              f"{len(prepared)} → {len(deflated)} chunks")
+        return deflated
+
+    @staticmethod
+    def _script_encoding_suffix(prepared, frames=None) -> str:
+        """
+        'Script send' 알림에 붙는 전송 형식 표시
+        - 압축 전송: ' DEFLATE <raw_size> <compressed_size>'
+        - 프레임 전송: ' FRAME' (청크가 MSG_SCRIPT_CHUNK 프레임으로 전송됨)
+        """
+        suffix = ''
+        if prepared.encoding == 'deflate':
+            suffix += f" DEFLATE {prepared.raw_size} {prepared.wire_size}"
+        if frames:
+            suffix += " FRAME"
+        return suffix
+
+    def _frame_enabled(self, bank_no: int) -> bool:
+        """
+        Bank별 바이너리 프레임(c_udp_frame) 사용 여부.
+        - sysInfo.xml <bank framing="binary|text">이 우선
+        - 없으면 'Script hash' 응답의 caps=frame 보고 또는 카드가 프레임을 보낸 적이 있으면 사용
+        """
+        setting = str(self.bank_registry.options(bank_no).get('framing', '')).strip().lower()
+        if setting in ('binary', 'text'):
+            return setting == 'binary'
+        bank_name = f'Bank{bank_no}'
+        return 'frame' in self._script_caps.get(bank_name, ()) or bank_name in self.writeCard.framed_banks
+
+    def _script_frames(self, bank_name, prepared):
+        """프레임 사용 Bank면 MSG_SCRIPT_CHUNK 프레임 목록, 아니면 None (텍스트 SCRIPT_CHUNK 사용)"""
+        bank_no = int(bank_name.replace('Bank', ''))
+        if not self._frame_enabled(bank_no):
+            return None
+        try:
+            return prepared.frame_datagrams(bank_no)
+        except c_udp_frame.FrameError as e:
+            print(f"[JobController] {bank_name} framing disabled for this script: {e}")
+            return None
+
+    def _send_script_windowed(self, bank_name, addr, prepared, options, frames=None) -> bool:
+        """
+        윈도우/ACK 방식 스크립트 전송 (c_script_transfer.WindowedScriptSender).
+        - 'Script send WIN <total> <window>' 알림 후 seq 번호가 붙은 SCRIPT_CHUNK를 윈도우 단위로 송신하고,
+          카드의 SCRIPT_ACK/SCRIPT_NACK에 따라 미확인 청크만 재전송합니다.
+        - frames가 있으면 텍스트 청크 대신 MSG_SCRIPT_CHUNK 프레임을 송신합니다.
+        """
+        try:
+            window = int(options.get('scriptWindow') or self.SCRIPT_WINDOW)
+        except ValueError:
+            window = self.SCRIPT_WINDOW
+        try:
+            rto = int(options.get('scriptRtoMs')) / 1000.0 if options.get('scriptRtoMs') else self.SCRIPT_RTO
+        except ValueError:
+            rto = self.SCRIPT_RTO
+        total_chunks = len(prepared)
+        datagrams = frames or prepared.seq_datagrams
+
+        def _progress(acked, total):
+            self.signalMessage.emit(self.objectName(), 'ui',
+                                    {'msg': f"{bank_name} 스크립트 ({acked}/{total}) 전송 완료"})
+
+        sender = c_script_transfer.WindowedScriptSender(
+            bank_name, total_chunks,
+            send_chunk=lambda seq: self.writeCard.send_async(addr, datagrams[seq],
+                                                             priority=c_udp_server.TX_PRIORITY_SCRIPT) or False,
+            window=window, rto=rto, on_progress=_progress)
+        with self._pending_lock:
+            previous = self._script_senders.get(bank_name)
+            if previous is not None:
+                previous.abort()
+            self._script_senders[bank_name] = sender
+
+        try:
+            announce = f"Script send WIN {total_chunks} {window}" + self._script_encoding_suffix(prepared, frames)
+            if not self._send_script_line(addr, announce):
+                self.signalMessage.emit(self.objectName(), 'ui',
+                                        {'msg': f"[Error] {bank_name} 'Script send' 전송 실패"})
+                return False
+            self.signalMessage.emit(self.objectName(), 'ui',
+                                    {'msg': f"{bank_name} 'Script send' 메시지 전송 완료 (window={window})"})
+
+            if not sender.run(timeout=self.SCRIPT_TRANSFER_TIMEOUT):
+                self.signalMessage.emit(self.objectName(), 'ui',
+                                        {'msg': f"[Error] {bank_name} 데이터 전송 실패"})
+                return False
+            print(f"[JobController] {bank_name} 윈도우 전송 완료: {total_chunks} chunks, "
+                  f"retransmits={sender.retransmits}")
+        finally:
+            with self._pending_lock:
+                if self._script_senders.get(bank_name) is sender:
+                    del self._script_senders[bank_name]
+
+        ok = self._send_script_line(addr, "EOF")
+        if ok:
+            print(f"[UDPServer] {bank_name}에 종료 시그널 전송 완료")
+        else:
+            self.signalMessage.emit(self.objectName(), 'ui',
+                                    {'msg': f"[Error] {bank_name} 종료 시그널 전송 실패"})
+        return ok
+
+    def _bank_has_script(self, bank_name, addr, script_hash) -> bool:
+        """
+        'Script query'로 카드가 보유한 스크립트 해시를 확인 ('Script hash: <sha256 hex>' 응답).
+        - 해시가 script_hash와 같으면 True (업로드 생략)
+        - 응답이 없으면 SCRIPT_QUERY_ATTEMPTS번까지 다시 질의하고, 끝내 없으면 False (업로드)
+        - 이런 무응답 확인이 SCRIPT_QUERY_LEGACY_AFTER번 연속되면 구형 펌웨어로 보고 이후 질의를 생략
+          (데이터그램 1개 손실/카드 일시 지연으로 해시 캐시가 영구히 꺼지지 않도록)
+        """
+        if bank_name in self._script_query_unsupported:
+            return False
+        event = threading.Event()
+        holder = []
+        with self._pending_lock:
+            self._script_hash_waiters[bank_name] = (event, holder)
+        try:
+            for attempt in range(1, self.SCRIPT_QUERY_ATTEMPTS + 1):
+                if self.writeCard.send_async(addr, "Script query") is None:   # 송신 큐 중지(서버 종료)
+                    print(f"[JobController] {bank_name} 'Script query' not queued: transmit queue stopped")
+                    return False
+                if event.wait(self.SCRIPT_QUERY_TIMEOUT):
+                    break
+                print(f"[JobController] {bank_name} 'Script query' 응답 없음 ({attempt}/{self.SCRIPT_QUERY_ATTEMPTS})")
+            else:
+                misses = self._script_query_misses.get(bank_name, 0) + 1
+                self._script_query_misses[bank_name] = misses
+                if misses >= self.SCRIPT_QUERY_LEGACY_AFTER:
+                    self._script_query_unsupported.add(bank_name)
+                    print(f"[JobController] {bank_name} 'Script query' {misses}회 연속 무응답 → 이후 해시 확인 생략")
+                return False
+        finally:
+            with self._pending_lock:
+                if self._script_hash_waiters.get(bank_name, (None,))[0] is event:
+                    del self._script_hash_waiters[bank_name]
+
+        reported = holder[0] if holder else ''
+        if reported != script_hash:
+            self._delivered_script_hash.pop(bank_name, None)
+            return False
+        cached = ' (cached)' if self._delivered_script_hash.get(bank_name) == script_hash else ''
+        self._delivered_script_hash[bank_name] = script_hash
+        self.signalMessage.emit(self.objectName(), 'ui',
+                                {'msg': f"{bank_name} 스크립트 동일{cached} → 전송 생략"})
+        return True
 
-        return 2
+    def _payload_format(self, bank_no: int) -> str:
+        """
+        Bank로 보낼 구조화 페이로드(barcode_info) 형식: 'json' 또는 'repr'(기존 dict repr)
+        - sysInfo.xml <bank payloadFormat="json|repr">이 우선, 없으면 caps=json 보고 여부로 결정
+        """
+        setting = str(self.bank_registry.options(bank_no).get('payloadFormat', '')).strip().lower()
+        if setting in ('json', 'repr'):
+            return setting
+        return 'json' if 'json' in self._script_caps.get(f'Bank{bank_no}', ()) else 'repr'
+
+    def _on_script_hash(self, where: str, msg: str):
+        """
+        'Write Card N'의 'Script hash: <hex> [caps=deflate,...]' 응답을 대기 중인 _bank_has_script로 전달.
+        - caps가 있으면 Bank별 지원 기능으로 기록 (압축 전송/JSON 페이로드/바이너리 프레임 협상용)
+        """
+        bank_name = 'Bank' + where.replace('Write Card', '').strip()
+        fields = msg.split(':', 1)[1].split() if ':' in msg else []
+        for field in fields[1:]:
+            if field.startswith('caps='):
+                self._script_caps[bank_name] = {c.strip().lower() for c in field[5:].split(',') if c.strip()}
+        # 응답이 왔으므로 질의를 지원하는 펌웨어 (늦게 온 응답도 포함)
+        self._script_query_misses.pop(bank_name, None)
+        self._script_query_unsupported.discard(bank_name)
+        with self._pending_lock:
+            waiter = self._script_hash_waiters.get(bank_name)
+        if waiter is None:
+            return
+        event, holder = waiter
+        holder.append(fields[0].lower() if fields else '')
+        event.set()
+
+    def _mark_bank_script_loaded(self, bank_no: int, model_settings):
+        """업로드를 생략한 Bank의 MCU 1..qty에 대해 'Script save finished'를 합성해 준비 상태 반영"""
+        for mcu_num in range(1, model_settings.qty(bank_no) + 1):
+            self.update_job_module_status({'msg': f'Script save finished: MCU {mcu_num}',
+                                           'where': f'Write Card {bank_no}'})
+
+    def _on_script_ack(self, where: str, msg: str):
+        """'Write Card N'에서 온 SCRIPT_ACK/SCRIPT_NACK을 해당 Bank의 윈도우 전송으로 전달"""
+        parsed = c_script_transfer.parse_ack(msg)
+        if parsed is None:
+            return
+        self._deliver_script_ack('Bank' + where.replace('Write Card', '').strip(), *parsed)
+
+    def _on_script_ack_frame(self, bank_number: str, frame):
+        """MSG_SCRIPT_ACK/MSG_SCRIPT_NACK 프레임 (수신 스레드에서 직접 호출, seq가 ACK 값)"""
+        kind = 'ack' if frame.msg_type == c_udp_frame.MSG_SCRIPT_ACK else 'nack'
+        self._deliver_script_ack(f'Bank{bank_number}', kind, frame.seq)
+
+    def _deliver_script_ack(self, bank_name: str, kind: str, value: int):
+        with self._pending_lock:
+            sender = self._script_senders.get(bank_name)
+        if sender is None:
+            return
+        if kind == 'ack':
+            sender.on_ack(value)
+        else:
+            sender.on_nack(value)
+
+    def _get_carrier_columns(self) -> int:
+        """
+        settings.xml의 <carrier columns="..."> 값을 반환 (ModelSettings 스냅샷 사용).
+        - 스냅샷을 만들 수 없으면 기본값 2를 반환.
+        """
+        model_settings = self._current_model_settings()
+        return model_settings.carrier_columns if model_settings else 2
 
     def update_job_module_status(self, values):
         """
@@ -769,6 +1373,7 @@ class JobController(QtCore.QObject):
 
         if msg.startswith('Script save Failed: MCU'):
             print(msg)
+            self._delivered_script_hash.pop('Bank' + where.replace('Write Card', '').strip(), None)
             return
 
         if msg.startswith('Script save finished: MCU') and where.startswith('Write Card '):
@@ -852,6 +1457,7 @@ class JobController(QtCore.QObject):
                     setattr(self, ready_flag_attr, True)
             if self.clsInfo['Left_Recon_Script'] and self.clsInfo['Right_Recon_Script'] == True:
                 self.signalMessage.emit(self.objectName(), 'job', {'msg':'Script all loaded'})
+                self.tracer.end('script_load', result='Script all loaded')
 
     def _get_io_socket_cached_or_lookup(self):
         """
@@ -867,6 +1473,9 @@ class JobController(QtCore.QObject):
 
     def get_writecard_qty(self, settings_path, card_number):
         # card_number: int (1~4)
+        model_settings = self.model_settings
+        if model_settings is not None and model_settings.settings_path == settings_path:
+            return model_settings.qty(card_number)
         tag = f'writecard{card_number}'
         try:
             tree = ET.parse(settings_path)
@@ -878,48 +1487,111 @@ class JobController(QtCore.QObject):
             print(f"settings.xml 파싱 실패: {e}")
         return 0
 
+    def _clear_barcode_files(self):
+        """기존 파일 경로용: 이전 촬영의 barcode/*.txt 결과 파일 내용을 비움"""
+        barcode_dir = os.path.join(self.baseDir, "barcode")
+        for p in (
+                os.path.join(barcode_dir, "Left.txt"),
+                os.path.join(barcode_dir, "Right.txt"),
+                os.path.join(barcode_dir, "Left_Recon.txt"),
+                os.path.join(barcode_dir, "Right_Recon.txt"),
+        ):
+            if os.path.exists(p):
+                try:
+                    with open(p, 'w') as f:
+                        f.write("")
+                    print(f"Cleared content of file: {p}")
+                except Exception as e:
+                    print(f"[Error] Unable to clear content of {p}: {e}")
+
+    def _log_socket_stats(self):
+        """사이클 종료 시 UDP 수신 소켓 상태(버퍼 크기/커널 drop/Bank별 수신량) 출력, drop이 늘었으면 UI 경고"""
+        writeCard = getattr(self, 'writeCard', None)
+        if writeCard is None or not hasattr(writeCard, 'get_socket_stats'):
+            return
+        try:
+            stats = writeCard.get_socket_stats()
+        except Exception as e:
+            print(f"[JobController] UDP socket stats unavailable: {e}")
+            return
+        kernel = stats.get('kernel') or {}
+        banks = ', '.join(f"{bank} {s['packets']}pkt/{s['bytes']}B"
+                          for bank, s in sorted(stats.get('banks', {}).items()))
+        print(f"[JobController] UDP rcvbuf={stats.get('rcvbuf')} sndbuf={stats.get('sndbuf')} "
+              f"drops={kernel.get('drops')} rx_queue={kernel.get('rx_queue')}" + (f" | {banks}" if banks else ""))
+        drops = kernel.get('drops')
+        if drops is None:
+            return
+        previous, self._udp_drops = self._udp_drops, drops
+        if previous is not None and drops > previous:
+            self.signalMessage.emit(self.objectName(), 'ui',
+                                    {'msg': f"[Warning] UDP 수신 버퍼 초과로 datagram {drops - previous}개 유실 "
+                                            f"(sysInfo.xml <server rcvBuf> 확인)"})
+
+    def _report_scan_failures(self, side, modules_dict, index, barcode_length):
+        """바코드 판정 실패 시 어떤 모듈이 실패했는지 UI에 표시 (index: 1차=2, 3차=5)"""
+        failed = []
+        for key, v in modules_dict.items():
+            try:
+                if v[0] is not True:
+                    continue
+                text = v[index]
+            except (IndexError, TypeError):
+                continue
+            if text is None or text == 'Scan Failed':
+                failed.append(key)
+            elif barcode_length is not None and isinstance(text, str) and len(text) != barcode_length:
+                failed.append(f"{key}(len {len(text)})")
+        if not failed:
+            return
+        retried = (self.barcode_pipeline.decode_pool.last_stats.get(side, {}).get('retried')
+                   if self.barcode_pipeline.decode_pool is not None else None)
+        msg = f"[Scan Failed] {side}: {', '.join(failed)}"
+        if retried:
+            msg += f" (retried: {', '.join(retried)})"
+        print(f"[JobControl] {msg}")
+        self.signalMessage.emit(self.objectName(), 'ui', {'msg': msg})
+
     def do_test(self):
-        TIME_INTERVAL = 0.1
-        TIME_OUT_SEC = 10
+        TIME_INTERVAL = 0.1   # clsInfo 밖의 상태(p_mainWindow.modules_*)를 재확인하는 주기
+        TIME_OUT_SEC = 10     # 단계별 타임아웃(단계 진입 시점 기준 deadline)
         idx_examine = 0
-        cnt_timeOut = 0
+        step_idx = idx_examine
+        step_deadline = time.monotonic() + TIME_OUT_SEC
+
+        self.tracer.begin('mapping')
+        self.tracer.step(idx_examine)
         finalResult = None
         reasonOfFail = None
 
-        family_name = util_base.get_xml_info(self.baseDir, 'recent/familyName')
-        model_name = util_base.get_xml_info(self.baseDir, 'recent/modelName')
-        settings_path = os.path.join(self.baseDir, "models", family_name, model_name, "settings.xml")
-
         self._barcode_read_requested = False
         self.clsInfo['barcode_stop'] = False
 
-        # carrier columns 파싱
-        try:
-            tree = ET.parse(settings_path)
-            root = tree.getroot()
-            carrier_el = root.find(".//carrier")
-            carrier_columns = int((carrier_el.attrib.get('columns') or carrier_el.attrib.get('column') or 2))
-        except Exception:
-            carrier_columns = 2
+        # settings.xml 스냅샷: 사이클 중에는 파일을 다시 읽지 않음
+        model_settings = self._current_model_settings()
+        carrier_columns = model_settings.carrier_columns if model_settings else 2
+        barcode_length = model_settings.barcode_length if model_settings else None
 
-        # Bank5 주소 해석(캐시 우선, 없으면 sysInfo.xml)
+        # Bank5 주소 해석(live 주소 우선, 없으면 sysInfo.xml 설정) - 레지스트리 메모리 조회
         def _resolve_bank5_addr():
-            try:
-                sockets = self.ioBoard.get_connected_sockets()
-                addr = sockets.get('Bank5')
-                if addr:
-                    return addr
-            except Exception:
-                pass
-            return self._get_bank_addr_from_config(5)
+            return self.bank_registry.resolve(5)
 
         while self.clsInfo['is_examine']:
+            # 이벤트 기준점: 이 시점 이후의 clsInfo 갱신은 모두 아래 대기를 즉시 깨움
+            seen = self.clsInfo.version
+            if idx_examine != step_idx:
+                step_idx = idx_examine
+                step_deadline = time.monotonic() + TIME_OUT_SEC
+                self.tracer.step(idx_examine)
+
             # 스캔 중단 즉시 복귀
             if bool(self.clsInfo.get('barcode_stop')):
                 addr = _resolve_bank5_addr()
                 if addr:
-                    self.writeCard.send_data(client_socket=addr, data='Pusher back')
-                    print("[do_test] Sent 'Pusher back' due to barcode_stop")
+                    if self._send_motion(addr, 'Pusher back'):
+                        print("[do_test] Sent 'Pusher back' due to barcode_stop")
+                    else:
+                        print("[do_test] Failed to send 'Pusher back' due to barcode_stop")
                 if finalResult is None:
                     finalResult = 'Fail'
                 if not reasonOfFail:
@@ -998,34 +1670,19 @@ class JobController(QtCore.QObject):
                     self.signalMessage.emit(self.objectName(), 'job', {'where': 'do_test', 'msg': 'Barcode read'})
                     self._barcode_read_requested = True
                 if self.clsInfo.get('1st_image_scan') is True:
-                    cnt_timeOut = 0
                     idx_examine += 1
                     self._barcode_read_requested = False
 
             elif idx_examine == 5:
-                # 파일 정리
-                barcode_dir = os.path.join(self.baseDir, "barcode")
-                for p in (
-                        os.path.join(barcode_dir, "Left.txt"),
-                        os.path.join(barcode_dir, "Right.txt"),
-                        os.path.join(barcode_dir, "Left_Recon.txt"),
-                        os.path.join(barcode_dir, "Right_Recon.txt"),
-                ):
-                    if os.path.exists(p):
-                        try:
-                            with open(p, 'w') as f:
-                                f.write("")
-                            print(f"Cleared content of file: {p}")
-                        except Exception as e:
-                            print(f"[Error] Unable to clear content of {p}: {e}")
+                # 파일 정리 (메모리 파이프라인 적재에 실패한 side는 결과 파일로 판정하므로 항상 비움)
+                self._clear_barcode_files()
 
                 # IO 보드로 'Pusher front' 전송(UDP)
                 addr = _resolve_bank5_addr()
-                if addr and self.writeCard.send_data(client_socket=addr, data='Pusher front'):
+                if addr and self._send_motion(addr, 'Pusher front'):
                     self.signalMessage.emit(self.objectName(), 'ui',
                                             {'msg': "Sent 'Pusher front' to IO Board (Bank5)"})
                     self.signalMessage.emit(self.objectName(), 'job', {'where': 'do_test', 'msg': 'Pusher front'})
-                    cnt_timeOut = 0
                     idx_examine += 1
                 else:
                     self.signalMessage.emit(self.objectName(), 'ui',
@@ -1037,7 +1694,7 @@ class JobController(QtCore.QObject):
 
             elif idx_examine == 6:
                 if not self.clsInfo.get('1st_left_barcode'):
-                    time.sleep(TIME_INTERVAL)
+                    self.clsInfo.wait_change(seen)
                     continue
 
                 def _all_scanned(modules_dict: dict) -> bool:
@@ -1051,25 +1708,10 @@ class JobController(QtCore.QObject):
 
                 left_done = _all_scanned(self.p_mainWindow.modules_Left)
                 if not left_done:
-                    time.sleep(TIME_INTERVAL)
+                    # 모듈 테이블은 mainWindow 소유라 갱신 신호가 없으므로 짧은 주기로 재확인
+                    self.clsInfo.wait_change(seen, TIME_INTERVAL)
                     continue
 
-                settings_path2 = os.path.join(
-                    self.baseDir, "models",
-                    self.p_mainWindow.cb_customerName.currentText(),
-                    self.p_mainWindow.cb_selectedModel.currentText(),
-                    "settings.xml"
-                )
-                barcode_length = None
-                try:
-                    tree = ET.parse(settings_path2)
-                    root = tree.getroot()
-                    barcode_tag = root.find(".//barcode")
-                    if barcode_tag is not None and barcode_tag.attrib.get('length') is not None:
-                        barcode_length = int(barcode_tag.attrib['length'])
-                except Exception as e:
-                    print(f"settings.xml barcode 길이 파싱 실패: {e}")
-
                 def check_left(modules_dict, barcode_length):
                     for v in modules_dict.values():
                         if v[0] is True:
@@ -1084,6 +1726,8 @@ class JobController(QtCore.QObject):
 
                 left_result = check_left(self.p_mainWindow.modules_Left, barcode_length)
                 print(f'job (Left only at idx 6): {self.p_mainWindow.modules_Left}')
+                if left_result is not None:
+                    self._report_scan_failures('Left', self.p_mainWindow.modules_Left, 2, barcode_length)
 
                 if left_result == 'Barcode reading error':
                     reasonOfFail = 'Barcode reading error'
@@ -1091,7 +1735,7 @@ class JobController(QtCore.QObject):
                     idx_examine = 100
                     addr = _resolve_bank5_addr()
                     if addr:
-                        self.writeCard.send_data(client_socket=addr, data='go_init')
+                        self.writeCard.send_async(addr, 'go_init', priority=c_udp_server.TX_PRIORITY_MOTION)
                     continue
                 elif left_result == 'Scan Failed':
                     reasonOfFail = 'Scan Failed'
@@ -1099,11 +1743,10 @@ class JobController(QtCore.QObject):
                     idx_examine = 100
                     addr = _resolve_bank5_addr()
                     if addr:
-                        self.writeCard.send_data(client_socket=addr, data='go_init')
+                        self.writeCard.send_async(addr, 'go_init', priority=c_udp_server.TX_PRIORITY_MOTION)
                     continue
                 else:
                     idx_examine += 1
-                    cnt_timeOut = 0
                     self.signalMessage.emit(
                         self.objectName(), 'job',
                         {'where': 'do_test', 'msg': '1st_left_barcode_OK'}
@@ -1112,7 +1755,7 @@ class JobController(QtCore.QObject):
 
             elif idx_examine == 7:
                 if not self.clsInfo.get('1st_right_barcode'):
-                    time.sleep(TIME_INTERVAL)
+                    self.clsInfo.wait_change(seen)
                     continue
 
                 def _all_scanned(modules_dict: dict) -> bool:
@@ -1126,25 +1769,10 @@ class JobController(QtCore.QObject):
 
                 right_done = _all_scanned(self.p_mainWindow.modules_Right)
                 if not right_done:
-                    time.sleep(TIME_INTERVAL)
+                    # 모듈 테이블은 mainWindow 소유라 갱신 신호가 없으므로 짧은 주기로 재확인
+                    self.clsInfo.wait_change(seen, TIME_INTERVAL)
                     continue
 
-                settings_path2 = os.path.join(
-                    self.baseDir, "models",
-                    self.p_mainWindow.cb_customerName.currentText(),
-                    self.p_mainWindow.cb_selectedModel.currentText(),
-                    "settings.xml"
-                )
-                barcode_length = None
-                try:
-                    tree = ET.parse(settings_path2)
-                    root = tree.getroot()
-                    barcode_tag = root.find(".//barcode")
-                    if barcode_tag is not None and barcode_tag.attrib.get('length') is not None:
-                        barcode_length = int(barcode_tag.attrib['length'])
-                except Exception as e:
-                    print(f"settings.xml barcode 길이 파싱 실패: {e}")
-
                 def check_right(modules_dict, barcode_length):
                     for v in modules_dict.values():
                         if v[0] is True:
@@ -1159,6 +1787,8 @@ class JobController(QtCore.QObject):
 
                 right_result = check_right(self.p_mainWindow.modules_Right, barcode_length)
                 print(f'job (Right only at idx 7): {self.p_mainWindow.modules_Right}')
+                if right_result is not None:
+                    self._report_scan_failures('Right', self.p_mainWindow.modules_Right, 2, barcode_length)
 
                 if right_result == 'Barcode reading error':
                     reasonOfFail = 'Barcode reading error'
@@ -1166,7 +1796,7 @@ class JobController(QtCore.QObject):
                     idx_examine = 100
                     addr = _resolve_bank5_addr()
                     if addr:
-                        self.writeCard.send_data(client_socket=addr, data='go_init')
+                        self.writeCard.send_async(addr, 'go_init', priority=c_udp_server.TX_PRIORITY_MOTION)
                     continue
                 elif right_result == 'Scan Failed':
                     reasonOfFail = 'Scan Failed'
@@ -1174,14 +1804,13 @@ class JobController(QtCore.QObject):
                     idx_examine = 100
                     addr = _resolve_bank5_addr()
                     if addr:
-                        self.writeCard.send_data(client_socket=addr, data='go_init')
+                        self.writeCard.send_async(addr, 'go_init', priority=c_udp_server.TX_PRIORITY_MOTION)
                     continue
                 else:
                     self.signalMessage.emit(self.objectName(), 'job', {'where': 'do_test', 'msg': '1st Scan OK'})
                     self.send_barcodes_to_clients()
                     print('send_barcodes_clients executed')
                     idx_examine += 1
-                    cnt_timeOut = 0
                     self.signalMessage.emit(self.objectName(), 'job', {'where': 'do_test', 'msg': '1st_Scan_OK'})
                     continue
 
@@ -1197,14 +1826,13 @@ class JobController(QtCore.QObject):
                     'sensor_data3'] == True and self.clsInfo['sensor_data4'] == True:
                     self.signalMessage.emit(self.objectName(), 'job', {'where': 'do_test', 'msg': 'sensor ID recieved'})
                     idx_examine += 1
-                    cnt_timeOut = 0
 
             elif idx_examine == 11:
                 if (self.clsInfo['barcode_data1'] and self.clsInfo['barcode_data2']
                         and self.clsInfo['barcode_data3'] and self.clsInfo['barcode_data4']):
                     self.signalMessage.emit(self.objectName(), 'job', {'where': 'do_test', 'msg': '2nd barcode OK'})
                     addr = _resolve_bank5_addr()
-                    if addr and self.writeCard.send_data(client_socket=addr, data='Pusher back'):
+                    if addr and self._send_motion(addr, 'Pusher back'):
                         self.clsInfo['pusher back'] = True
                         self.signalMessage.emit(self.objectName(), 'ui',
                                                 {'msg': "Sent 'Pusher back' to IO Board (Bank5)"})
@@ -1218,14 +1846,12 @@ class JobController(QtCore.QObject):
                 if self.clsInfo['c_save'] == True:
                     self.signalMessage.emit(self.objectName(), 'job', {'where': 'do_test', 'msg': 'c_save finished'})
                     idx_examine += 1
-                    cnt_timeOut = 0
 
             elif idx_examine == 13:
                 if self.clsInfo['sensor_dict update'] == True:
                     self.signalMessage.emit(self.objectName(), 'job',
                                             {'where': 'do_test', 'msg': 'sensor_dict updated'})
                     idx_examine += 1
-                    cnt_timeOut = 0
 
             elif idx_examine == 14:
                 def _has_pairwise_mismatch(modules_dict: dict) -> bool:
@@ -1254,52 +1880,23 @@ class JobController(QtCore.QObject):
                     continue
 
                 idx_examine += 1
-                cnt_timeOut = 0
 
             elif idx_examine == 15:
                 if self.clsInfo['2nd show update'] == True and self.clsInfo['pusher back'] == True:
                     self.signalMessage.emit(self.objectName(), 'job', {'where': 'do_test', 'msg': '3rd Barcode shot'})
 
-                    # 파일 정리
-                    barcode_dir = os.path.join(self.baseDir, "barcode")
-                    for p in [
-                        os.path.join(barcode_dir, "Left.txt"),
-                        os.path.join(barcode_dir, "Right.txt"),
-                        os.path.join(barcode_dir, "Left_Recon.txt"),
-                        os.path.join(barcode_dir, "Right_Recon.txt"),
-                    ]:
-                        if os.path.exists(p):
-                            try:
-                                with open(p, 'w') as f:
-                                    f.write("")
-                                print(f"Cleared content of file: {p}")
-                            except Exception as e:
-                                print(f"[Error] Unable to clear content of {p}: {e}")
+                    # 파일 정리 (메모리 파이프라인 적재에 실패한 side는 결과 파일로 판정하므로 항상 비움)
+                    self._clear_barcode_files()
 
                     idx_examine += 1
-                    cnt_timeOut = 0
 
             elif idx_examine == 16:
                 if self.clsInfo['3rd_shot'] == True:
                     self.signalMessage.emit(self.objectName(), 'job', {'where': 'do_test', 'msg': '3rd left barcode'})
                     idx_examine += 1
-                    cnt_timeOut = 0
 
             elif idx_examine == 17:
                 if self.clsInfo['3rd_left_barcode'] == True:
-                    settings_path2 = os.path.join(self.baseDir, "models",
-                                                  self.p_mainWindow.cb_customerName.currentText(),
-                                                  self.p_mainWindow.cb_selectedModel.currentText(), "settings.xml")
-                    barcode_length = None
-                    try:
-                        tree = ET.parse(settings_path2)
-                        root = tree.getroot()
-                        barcode_tag = root.find(".//barcode")
-                        if barcode_tag is not None and barcode_tag.attrib.get('length') is not None:
-                            barcode_length = int(barcode_tag.attrib['length'])
-                    except Exception as e:
-                        print(f"settings.xml barcode 길이 파싱 실패: {e}")
-
                     def check_barcode_length(modules_dict, barcode_length):
                         for v in modules_dict.values():
                             if v[0] is True and v[5] is not None and isinstance(v[5], str):
@@ -1311,6 +1908,8 @@ class JobController(QtCore.QObject):
 
                     left_result = check_barcode_length(self.p_mainWindow.modules_Left, barcode_length)
                     print(f'do_test (3rd, Left only at idx 15) : modules_Left : {self.p_mainWindow.modules_Left}')
+                    if left_result is not None:
+                        self._report_scan_failures('Left', self.p_mainWindow.modules_Left, 5, barcode_length)
 
                     if left_result == 'Barcode reading error':
                         reasonOfFail = 'Barcode reading error'
@@ -1322,25 +1921,11 @@ class JobController(QtCore.QObject):
                         idx_examine = 100
                     else:
                         idx_examine += 1
-                        cnt_timeOut = 0
                         self.signalMessage.emit(self.objectName(), 'job',
                                                 {'where': 'do_test', 'msg': '3rd_left_barcode_OK'})
 
             elif idx_examine == 18:
                 if self.clsInfo['3rd_right_barcode'] == True:
-                    settings_path2 = os.path.join(self.baseDir, "models",
-                                                  self.p_mainWindow.cb_customerName.currentText(),
-                                                  self.p_mainWindow.cb_selectedModel.currentText(), "settings.xml")
-                    barcode_length = None
-                    try:
-                        tree = ET.parse(settings_path2)
-                        root = tree.getroot()
-                        barcode_tag = root.find(".//barcode")
-                        if barcode_tag is not None and barcode_tag.attrib.get('length') is not None:
-                            barcode_length = int(barcode_tag.attrib['length'])
-                    except Exception as e:
-                        print(f"settings.xml barcode 길이 파싱 실패: {e}")
-
                     def check_barcode_length(modules_dict, barcode_length):
                         for v in modules_dict.values():
                             if v[0] is True and v[5] is not None and isinstance(v[5], str):
@@ -1352,6 +1937,8 @@ class JobController(QtCore.QObject):
 
                     right_result = check_barcode_length(self.p_mainWindow.modules_Right, barcode_length)
                     print(f'do_test (3rd, Right only at idx 16) : modules_Right : {self.p_mainWindow.modules_Right}')
+                    if right_result is not None:
+                        self._report_scan_failures('Right', self.p_mainWindow.modules_Right, 5, barcode_length)
 
                     if right_result == 'Barcode reading error':
                         reasonOfFail = 'Barcode reading error'
@@ -1365,7 +1952,6 @@ class JobController(QtCore.QObject):
                         self.signalMessage.emit(self.objectName(), 'job',
                                                 {'here': 'do_test', 'msg': 'examine finished'})
                         idx_examine += 1
-                        cnt_timeOut = 0
 
             elif idx_examine == 19:
                 print('this message only should be shown when all OK')
@@ -1379,11 +1965,13 @@ class JobController(QtCore.QObject):
                 # 종료 시 IO 보드 초기화(UDP)
                 addr = _resolve_bank5_addr()
                 if addr:
-                    self.writeCard.send_data(client_socket=addr, data='ManualPusherInitial')
+                    self.writeCard.send_async(addr, 'ManualPusherInitial', priority=c_udp_server.TX_PRIORITY_MOTION)
 
                 self.clsInfo['is_examine'] = False
                 self._test_thread = None
                 print('idx_examine = 100. test finished')
+                self.tracer.end('mapping', result=finalResult or 'OK', reason=reasonOfFail)
+                self._log_socket_stats()
 
                 # 플래그 리셋
                 self.clsInfo['barcode_stop'] = False
@@ -1435,14 +2023,16 @@ class JobController(QtCore.QObject):
                 reasonOfFail = 'Abort Test'
                 idx_examine = 100
 
-            # Test TimeOut
-            cnt_timeOut += 1
-            if cnt_timeOut > (TIME_OUT_SEC / TIME_INTERVAL):
+            # Test TimeOut (현재 단계의 deadline 초과)
+            if idx_examine == step_idx and time.monotonic() > step_deadline:
                 finalResult = 'Fail'
                 reasonOfFail = 'Timeout'
                 idx_examine = 100
 
-            time.sleep(TIME_INTERVAL)
+            # 단계가 바뀌었으면 바로 다음 단계 평가, 아니면 플래그 갱신(또는 deadline)까지 대기
+            if idx_examine != step_idx:
+                continue
+            self.clsInfo.wait_change(seen, max(0.0, step_deadline - time.monotonic()))
 
 
 
@@ -2129,8 +2719,7 @@ class JobController(QtCore.QObject):
         바코드 정보를 '한 번에' 딕셔너리로 전송한다.
 
         변경 사항(UDP):
-        - 연결/소켓 캐시 확인 없이 sysInfo.xml 기반 주소 해석 함수(_get_bank_addr_from_config)를 사용해
-          각 Bank(1~4)의 (ip, port)로 직접 UDP 전송한다.
+        - 주소 레지스트리(bank_registry.resolve)로 각 Bank(1~4)의 (ip, port)를 해석해 직접 UDP 전송한다.
         """
         # writecard → Bank 번호 매핑
         writecard_bank_no = {
@@ -2180,8 +2769,8 @@ class JobController(QtCore.QObject):
             if not bank_no:
                 continue
 
-            # sysInfo.xml 기반으로 Bank 주소 해석
-            addr = self._get_bank_addr_from_config(bank_no)
+            # 주소 레지스트리에서 Bank 주소 해석
+            addr = self.bank_registry.resolve(bank_no)
             if not addr:
                 self.signalMessage.emit(self.objectName(), 'ui', {
                     'msg': f"[Warning] Bank{bank_no} address not found. Skip barcode send."
@@ -2194,21 +2783,30 @@ class JobController(QtCore.QObject):
             for idx, (_orig_mk_num, val) in enumerate(items, 1):
                 payload[f"Module{idx}"] = val
 
-            # 요구 형식: "barcode_info: { ... }"
-            msg = f"barcode_info: {payload}"
-
-            # UDP 전송
-            ok = self.writeCard.send_data(client_socket=addr, data=msg)
-            if ok:
-                print(f"[send_barcodes_to_clients] Sent to Bank{bank_no} ({writecard}) @ {addr}: {msg}")
-                self.signalMessage.emit(self.objectName(), 'ui', {
-                    'msg': f"Sent barcode_info to Bank{bank_no} ({addr[0]}:{addr[1]})"
-                })
+            # 요구 형식: "barcode_info: { ... }" (JSON 지원 Bank는 JSON, 그 외 기존 dict repr)
+            # 프레임 사용 Bank는 MSG_BARCODE_INFO 프레임(JSON payload)으로 송신
+            if self._frame_enabled(bank_no):
+                msg = c_udp_frame.encode_json(c_udp_frame.MSG_BARCODE_INFO, payload, bank=bank_no)
+            elif self._payload_format(bank_no) == 'json':
+                msg = c_payload.encode_json('barcode_info', payload)
             else:
-                print(f"[send_barcodes_to_clients] Failed to send to Bank{bank_no} ({writecard}) @ {addr}")
-                self.signalMessage.emit(self.objectName(), 'ui', {
-                    'msg': f"[Error] Failed to send barcode_info to Bank{bank_no} ({addr[0]}:{addr[1]})"
-                })
+                msg = f"barcode_info: {payload}"
+
+            # UDP 전송 (송신 큐 적재, 결과는 송신 완료 시 알림)
+            def _done(ok, bank_no=bank_no, writecard=writecard, addr=addr, msg=msg):
+                if ok:
+                    print(f"[send_barcodes_to_clients] Sent to Bank{bank_no} ({writecard}) @ {addr}: {msg}")
+                    self.signalMessage.emit(self.objectName(), 'ui', {
+                        'msg': f"Sent barcode_info to Bank{bank_no} ({addr[0]}:{addr[1]})"
+                    })
+                else:
+                    print(f"[send_barcodes_to_clients] Failed to send to Bank{bank_no} ({writecard}) @ {addr}")
+                    self.signalMessage.emit(self.objectName(), 'ui', {
+                        'msg': f"[Error] Failed to send barcode_info to Bank{bank_no} ({addr[0]}:{addr[1]})"
+                    })
+
+            if self.writeCard.send_async(addr, msg, callback=_done) is None:
+                _done(False)
 
 
     # def send_barcodes_to_clients(self):
@@ -2304,25 +2902,28 @@ class JobController(QtCore.QObject):
     def send_signal_to_clients(self, msg=None):
         """
         Bank1~4에 동일한 신호(msg)를 전송.
-        - UDP: _get_bank_addr_from_config(bank_no)로 각 Bank의 (ip, port)를 구해 직접 전송
+        - UDP: bank_registry.resolve(bank_no)로 각 Bank의 (ip, port)를 구해 직접 전송
         """
         if msg is None:
             return
 
         for bank_no in (1, 2, 3, 4):
-            addr = self._get_bank_addr_from_config(bank_no)
+            addr = self.bank_registry.resolve(bank_no)
             if not addr:
                 self.signalMessage.emit(self.objectName(), 'ui',
                                         {'msg': f"[Warning] Bank{bank_no} address not found. Could not send '{msg}'."})
                 continue
 
-            ok = self.writeCard.send_data(client_socket=addr, data=msg)
-            if ok:
-                print(f"[send_signal_to_clients] Sent '{msg}' to Bank{bank_no} @ {addr}")
-            else:
-                self.signalMessage.emit(self.objectName(), 'ui',
-                                        {
-                                            'msg': f"[Error] Failed to send '{msg}' to Bank{bank_no} ({addr[0]}:{addr[1]})"})
+            def _done(ok, bank_no=bank_no, addr=addr):
+                if ok:
+                    print(f"[send_signal_to_clients] Sent '{msg}' to Bank{bank_no} @ {addr}")
+                else:
+                    self.signalMessage.emit(self.objectName(), 'ui',
+                                            {
+                                                'msg': f"[Error] Failed to send '{msg}' to Bank{bank_no} ({addr[0]}:{addr[1]})"})
+
+            if self.writeCard.send_async(addr, msg, callback=_done) is None:
+                _done(False)
 
 
 
@@ -2339,76 +2940,24 @@ class JobController(QtCore.QObject):
 
     def _get_bank_addr_from_config(self, bank_number: int):
         """
-        sysInfo.xml에서 지정한 Bank(1~5)의 ip/port를 읽어 ('ip', port) 형태로 반환.
-        - udpPort/port가 없으면 서버의 portNumber를 최후의 수단으로 폴백(경고 메시지 출력).
+        sysInfo.xml에 설정된 Bank(1~5)의 ('ip', port)를 반환.
+        - 매번 파일을 파싱하지 않고 BankAddressRegistry의 메모리 값을 사용(mtime 변경 시에만 재로딩).
+        - udpPort/port가 없으면 서버의 portNumber를 최후의 수단으로 폴백.
         - 어떤 경우에도 포트를 특정할 수 없으면 None.
         """
-        try:
-            sysinfo_path = os.path.join(self.baseDir, 'sysInfo.xml')
-            tree = ET.parse(sysinfo_path)
-            root = tree.getroot()
-            clients = root.find('clients')
-            if clients is None:
-                return None
-
-            ip, port = None, None
-            for bank in clients.findall('bank'):
-                if str(bank.get('number')) == str(bank_number):
-                    ip = bank.get('ip')
-                    port_str = bank.get('udpPort') or bank.get('port') or bank.get('udp_port')
-                    if port_str and str(port_str).isdigit():
-                        port = int(port_str)
-                    break
-
-            if not ip:
-                return None
-
-            # 포트가 없으면 서버 포트로 폴백(주의: 대상 장치가 해당 포트에서 수신 중이어야 유효)
-            if port is None:
-                try:
-                    server_info = util_base.get_xml_info(self.baseDir, 'server')
-                    fallback_port = int(server_info.get('portNumber')) if server_info and server_info.get(
-                        'portNumber') else None
-                except Exception:
-                    fallback_port = None
-
-                if fallback_port is not None:
-                    # 경고: 폴백 사용
-                    try:
-                        self.signalMessage.emit(self.objectName(), 'ui',
-                                                {
-                                                    'msg': f"[Warning] Bank{bank_number} udpPort/port 미설정 → 서버 포트({fallback_port})로 폴백 전송 시도"})
-                    except Exception:
-                        pass
-                    return (ip, fallback_port)
-                else:
-                    return None
-
-            return (ip, port)
-
-        except Exception as e:
-            print(f"[JobControl] Failed to read Bank{bank_number} from sysInfo.xml: {e}")
-            return None
+        return self.bank_registry.configured(bank_number)
 
     def send_manual_to_bank5(self, msg: str):
         """
         Manual handling UI에서 전달된 msg 값을 Bank5(IO Board)로 전송.
+        - 주소는 bank_registry.resolve(5)로 해석(메모리 조회).
         - 1순위: ioBoard가 이미 서버로 패킷을 보냈다면, 그 주소 캐시로 전송(등록 방식).
         - 2순위: sysInfo.xml의 Bank5 ip/port(없으면 서버 포트 폴백)로 전송.
-        - 실제 송신은 self.writeCard.send_data(UDP 소켓 보유 주체)를 사용.
+        - 실제 송신은 self.writeCard.send_async(UDP 송신 큐, 동작 명령 우선순위)를 사용.
         """
         try:
-            # 1) 등록 주소(수신 캐시) 우선
-            addr = None
-            try:
-                sockets = self.ioBoard.get_connected_sockets()
-                addr = sockets.get('Bank5')
-            except Exception:
-                addr = None
-
-            # 2) 캐시가 없으면 구성 파일에서 주소 확보(필요 시 폴백 포함)
-            if not addr:
-                addr = self._get_bank_addr_from_config(5)
+            # 등록 주소(수신 캐시) 우선, 없으면 구성 주소(필요 시 폴백 포함) - 레지스트리 메모리 조회
+            addr = self.bank_registry.resolve(5)
 
             if not addr:
                 self.signalMessage.emit(self.objectName(), 'ui',
@@ -2416,13 +2965,17 @@ class JobController(QtCore.QObject):
                                             'msg': f"[Warning] IO Board (Bank5) address not found. Could not send '{msg}'."})
                 return
 
-            ok = self.writeCard.send_data(client_socket=addr, data=msg)
-            if ok:
-                self.signalMessage.emit(self.objectName(), 'ui',
-                                        {'msg': f"Sent manual command '{msg}' to IO Board (Bank5) via UDP"})
-            else:
-                self.signalMessage.emit(self.objectName(), 'ui',
-                                        {'msg': f"[Error] Failed to send '{msg}' to IO Board (Bank5) via UDP"})
+            # GUI 스레드를 막지 않도록 송신 큐에 동작 명령 우선순위로 적재, 결과는 송신 완료 시 알림
+            def _done(ok):
+                if ok:
+                    self.signalMessage.emit(self.objectName(), 'ui',
+                                            {'msg': f"Sent manual command '{msg}' to IO Board (Bank5) via UDP"})
+                else:
+                    self.signalMessage.emit(self.objectName(), 'ui',
+                                            {'msg': f"[Error] Failed to send '{msg}' to IO Board (Bank5) via UDP"})
+
+            if self.writeCard.send_async(addr, msg, priority=c_udp_server.TX_PRIORITY_MOTION, callback=_done) is None:
+                _done(False)
 
         except Exception as e:
             self.signalMessage.emit(self.objectName(), 'ui',
@@ -2663,7 +3216,7 @@ class JobController(QtCore.QObject):
     def reset_job_context(self, reason: str | None = None):
         """
         모델/고객사 변경 등으로 JobController 상태 초기화.
-        IO 보드 초기화 전송을 UDP 주소 해석 → self.writeCard.send_data로 수행.
+        IO 보드 초기화 전송을 UDP 주소 해석 → self.writeCard.send_async(동작 명령 우선순위)로 수행.
         """
         try:
             if getattr(self, "_test_thread", None) is not None and self._test_thread.is_alive():
@@ -2674,17 +3227,10 @@ class JobController(QtCore.QObject):
 
                 # [변경] 소켓 캐시 대신 주소 해석 후 직접 송신
                 try:
-                    addr = None
-                    try:
-                        sockets = self.ioBoard.get_connected_sockets()
-                        addr = sockets.get('Bank5')
-                    except Exception:
-                        addr = None
-                    if not addr:
-                        addr = self._get_bank_addr_from_config(5)
-
+                    addr = self.bank_registry.resolve(5)
                     if addr:
-                        self.writeCard.send_data(client_socket=addr, data="ManualPusherInitial")
+                        self.writeCard.send_async(addr, "ManualPusherInitial",
+                                                  priority=c_udp_server.TX_PRIORITY_MOTION)
                 except Exception:
                     pass
 
@@ -2759,6 +3305,10 @@ class JobController(QtCore.QObject):
         except Exception:
             self.settings_xml_info = None
 
+        # 변경된 모델 기준으로 settings.xml 스냅샷 재생성
+        self.model_settings = None
+        self._current_model_settings()
+
         try:
             msg_txt = f"[JobControl] Reset job context ({reason})" if reason else "[JobControl] Reset job context"
             self.signalMessage.emit(self.objectName(), "ui", {"msg": msg_txt})
@@ -0,0 +1,89 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class MessageDispatcher:
+    """
+    수신 메시지 → 핸들러 매핑 테이블 (JobController.slotParse용).
+    - 소스('writeCard', 'ioBoard' ...)별로 정확히 일치(exact) / 접두어(prefix) 핸들러를 등록합니다.
+    - 접두어는 길이별 dict로 미리 색인해 두고, 긴 접두어부터 msg[:길이] 조회 몇 번으로 핸들러를 찾습니다.
+      (등록 메시지 수가 늘어도 if/elif 체인처럼 비교 횟수가 늘지 않음)
+    - 메시지 종류별 호출 횟수와 핸들러 처리 시간(합계/최대)을 기록합니다. stats()/format_stats()로 확인.
+    - handler(values, msg) 형태로 호출합니다.
+    """
+
+    def __init__(self):
+        self._exact: Dict[str, Dict[str, Tuple[str, Callable]]] = {}
+        self._prefix: Dict[str, Dict[int, Dict[str, Tuple[str, Callable]]]] = {}
+        self._prefix_lengths: Dict[str, List[int]] = {}
+        self._stats: Dict[str, List[float]] = {}   # name -> [count, total_ns, max_ns]
+        self._lock = threading.Lock()
+
+    def register(self, sources, key: str, handler: Callable, prefix: bool = False, name: Optional[str] = None):
+        """
+        sources: 소스 이름 또는 그 목록 (같은 핸들러를 여러 소스가 공유 가능)
+        key    : prefix=False면 메시지 전체, True면 메시지 접두어
+        name   : 통계 표시 이름 (기본값 key)
+        """
+        if isinstance(sources, str):
+            sources = (sources,)
+        entry = (name or key, handler)
+        for source in sources:
+            if prefix:
+                by_len = self._prefix.setdefault(source, {})
+                by_len.setdefault(len(key), {})[key] = entry
+                self._prefix_lengths[source] = sorted(by_len, reverse=True)
+            else:
+                self._exact.setdefault(source, {})[key] = entry
+
+    def lookup(self, source: str, msg: str):
+        """(name, handler) 또는 None. exact 우선, 그다음 가장 긴 접두어."""
+        entry = self._exact.get(source, {}).get(msg)
+        if entry is not None:
+            return entry
+        by_len = self._prefix.get(source)
+        if by_len:
+            for length in self._prefix_lengths[source]:
+                entry = by_len[length].get(msg[:length])
+                if entry is not None:
+                    return entry
+        return None
+
+    def dispatch(self, source: str, msg: str, values) -> bool:
+        """핸들러를 찾아 호출하고 True 반환. 등록되지 않은 메시지는 False."""
+        entry = self.lookup(source, msg)
+        if entry is None:
+            return False
+        name, handler = entry
+        start = time.perf_counter_ns()
+        try:
+            handler(values, msg)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            with self._lock:
+                stat = self._stats.get(name)
+                if stat is None:
+                    stat = self._stats[name] = [0, 0, 0]
+                stat[0] += 1
+                stat[1] += elapsed
+                if elapsed > stat[2]:
+                    stat[2] = elapsed
+        return True
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """{name: {'count', 'avg_ms', 'max_ms'}}"""
+        with self._lock:
+            return {name: {'count': count, 'avg_ms': total / count / 1e6 if count else 0.0, 'max_ms': peak / 1e6}
+                    for name, (count, total, peak) in self._stats.items()}
+
+    def format_stats(self) -> str:
+        rows = sorted(self.stats().items(), key=lambda kv: -kv[1]['count'])
+        lines = [f"{'message':<28}{'count':>8}{'avg ms':>10}{'max ms':>10}"]
+        for name, s in rows:
+            lines.append(f"{name[:28]:<28}{s['count']:>8}{s['avg_ms']:>10.3f}{s['max_ms']:>10.3f}")
+        return '\n'.join(lines)
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
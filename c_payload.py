@@ -0,0 +1,175 @@
+"""
+Write Card 구조화 페이로드(sensor_ID / barcode_info) 파서.
+지원 형식 (자동 판별):
+  - JSON            : sensor_ID: {"Module1": "abc", "Module2": null}
+  - key=value       : sensor_ID: Module1=abc;Module2=def
+  - 기존 dict repr  : sensor_ID: {'Module1': 'abc', 'Module2': None}
+  - OrderedDict repr: barcode_info: OrderedDict([('Module1', 'abc')]) / OrderedDict({'Module1': 'abc'})
+JSON은 json.JSONDecoder.raw_decode로, 기존 repr 형식은 정규식 스캐너로 ast 없이 파싱합니다.
+스캐너가 다루지 않는 형태(중첩 구조 등)는 ValueError입니다. (ast는 benchmark의 기존 경로 비교에만 사용)
+"""
+import ast
+import json
+import re
+import time
+
+_JSON_DECODER = json.JSONDecoder()
+
+_STR = r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\""
+_SCALAR = rf"{_STR}|None|True|False|-?\d+(?:\.\d+)?"
+# {'k': v, ...} 의 한 항목
+_DICT_ITEM = re.compile(rf"\s*({_STR}|-?\d+)\s*:\s*({_SCALAR})\s*(?:,|(?=\}}))")
+# [('k', v), ...] 의 한 항목
+_PAIR_ITEM = re.compile(rf"\s*\(\s*({_STR}|-?\d+)\s*,\s*({_SCALAR})\s*\)\s*(?:,|(?=\]))")
+_CONSTANTS = {'None': None, 'True': True, 'False': False}
+# 문자열 repr의 escape (\\, \', \n, \xhh, \uhhhh, \Uhhhhhhhh, 8진수)
+_ESCAPE = re.compile(r"\\(x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|[0-7]{1,3}|.)", re.S)
+_SIMPLE_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'a': '\a', 'b': '\b', 'f': '\f', 'v': '\v',
+                   '\\': '\\', "'": "'", '"': '"', '\n': ''}
+
+
+def _unescape(match) -> str:
+    code = match.group(1)
+    if len(code) > 1 and code[0] in 'xuU':
+        return chr(int(code[1:], 16))
+    if code[0] in '01234567':
+        return chr(int(code, 8))
+    return _SIMPLE_ESCAPES.get(code, '\\' + code)
+
+
+def _scalar(token: str):
+    if token[0] in ('"', "'"):
+        if '\\' in token:
+            return _ESCAPE.sub(_unescape, token[1:-1])
+        return token[1:-1]
+    if token in _CONSTANTS:
+        return _CONSTANTS[token]
+    return float(token) if '.' in token else int(token)
+
+
+def _scan(body: str, pattern, close: str):
+    """body 전체가 pattern 항목들로만 이루어졌으면 dict, 아니면 None"""
+    result = {}
+    pos = 0
+    end = len(body) - 1          # 닫는 괄호 위치
+    match = pattern.match
+    while True:
+        m = match(body, pos)
+        if m is None:
+            break
+        key, value = m.groups()
+        result[_scalar(key)] = _scalar(value)
+        pos = m.end()
+    return result if end >= 0 and body[end] == close and body[pos:end].strip() == '' else None
+
+
+def parse_legacy(text: str):
+    """기존 dict / OrderedDict repr 형식을 dict로 변환 (ast 미사용, 해석 불가 시 None)"""
+    s = text.strip()
+    if s.startswith('OrderedDict(') and s.endswith(')'):
+        s = s[len('OrderedDict('):-1].strip()
+        if s == '':
+            return {}
+    if s.startswith('{'):
+        return _scan(s[1:], _DICT_ITEM, '}')
+    if s.startswith('['):
+        return _scan(s[1:], _PAIR_ITEM, ']')
+    return None
+
+
+def parse_kv(text: str):
+    """Module1=abc;Module2=def 형식 (값은 문자열, 빈 값은 None)"""
+    result = {}
+    for part in text.split(';'):
+        if not part.strip():
+            continue
+        key, sep, value = part.partition('=')
+        if not sep:
+            return None
+        value = value.strip()
+        result[key.strip()] = value if value else None
+    return result
+
+
+def parse_structured(text: str) -> dict:
+    """
+    페이로드 문자열을 dict로 변환. 형식은 자동 판별합니다.
+    - 해석할 수 없으면 ValueError
+    """
+    s = text.strip()
+    if s.startswith('{'):
+        try:
+            value, end = _JSON_DECODER.raw_decode(s)
+            # 뒤에 남는 문자가 있으면(잘림/연결된 페이로드) JSON으로 인정하지 않음 - _scan과 같은 기준
+            if end == len(s) and isinstance(value, dict):
+                return value
+        except ValueError:
+            pass
+    elif s and s[0] not in "[(" and not s.startswith('OrderedDict(') and '=' in s:
+        # 'Output1=ABC;...'처럼 'O'로 시작하는 키도 key=value로 판별 (repr 형식은 'OrderedDict(' 접두어로만 구분)
+        result = parse_kv(s)
+        if result is not None:
+            return result
+
+    if not s:
+        return {}
+    result = parse_legacy(s)
+    if result is None:   # 중첩 값, (key, value) 쌍이 아닌 목록 등
+        raise ValueError(f"unsupported payload: {text[:60]}")
+    return result
+
+
+def parse_message(msg: str, prefix: str) -> dict:
+    """'<prefix>: <payload>' 메시지에서 payload를 dict로 변환"""
+    body = msg[len(prefix):]
+    if body.startswith(':'):
+        body = body[1:]
+    return parse_structured(body)
+
+
+def encode_json(prefix: str, payload: dict) -> str:
+    """JSON 형식 협상된 Bank로 보낼 '<prefix>: {...}' 메시지"""
+    return f"{prefix}: {json.dumps(payload, ensure_ascii=False, separators=(',', ':'))}"
+
+
+def _legacy_ast(msg: str, prefix: str):
+    """기존 JobController 경로(접두어 제거 후 ast.literal_eval) - 벤치마크 비교용"""
+    full = f"{prefix}: OrderedDict("
+    if msg.startswith(full):
+        return ast.literal_eval(msg[len(full):-1].strip())
+    return ast.literal_eval(msg[len(prefix) + 2:].strip())
+
+
+def benchmark(sizes=(4, 16, 64), repeat=2000):
+    """형식/모듈 수별 파싱 시간 비교 (us/message)"""
+    rows = []
+    for n in sizes:
+        data = {f"Module{i}": f"FAKEID{i:08d}" for i in range(1, n + 1)}
+        cases = {
+            'repr': f"sensor_ID: {data}",
+            'OrderedDict': f"barcode_info: OrderedDict({data})",
+            'json': encode_json('sensor_ID', data),
+            'kv': 'sensor_ID: ' + ';'.join(f"{k}={v}" for k, v in data.items()),
+        }
+        for name, msg in cases.items():
+            prefix = msg.split(':', 1)[0]
+            assert parse_message(msg, prefix) == data, name
+            start = time.perf_counter()
+            for _ in range(repeat):
+                parse_message(msg, prefix)
+            fast_us = (time.perf_counter() - start) / repeat * 1e6
+            ast_us = None
+            if name in ('repr', 'OrderedDict'):
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    _legacy_ast(msg, prefix)
+                ast_us = (time.perf_counter() - start) / repeat * 1e6
+            rows.append((n, name, fast_us, ast_us))
+    return rows
+
+
+if __name__ == '__main__':
+    print(f"{'modules':>8} {'format':<12}{'parser us':>12}{'ast us':>10}{'speedup':>9}")
+    for n, name, fast_us, ast_us in benchmark():
+        ast_col = f"{ast_us:>10.1f}{ast_us / fast_us:>8.1f}x" if ast_us else f"{'-':>10}{'-':>9}"
+        print(f"{n:>8} {name:<12}{fast_us:>12.1f}{ast_col}")
@@ -0,0 +1,246 @@
+import base64
+import hashlib
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import CancelledError, Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional
+
+import c_udp_frame
+
+
+class PreparedScript:
+    """
+    송신 준비가 끝난 스크립트 (모델 스크립트 1개 단위).
+    - 파일을 한 번 읽어 청크 분할 + base64 + 'SCRIPT_CHUNK ...' 조립 + UTF-8 인코딩을 1회만 수행하고,
+      결과 bytes 데이터그램을 모든 Bank / 재전송 / 이후 사이클에서 그대로 재사용합니다.
+    - legacy_datagrams : "SCRIPT_CHUNK <len> <base64>\n"        (구형 전송)
+    - seq_datagrams    : "SCRIPT_CHUNK <seq> <len> <base64>\n"  (윈도우 전송, 처음 사용할 때 생성)
+    - frame_datagrams(bank): c_udp_frame MSG_SCRIPT_CHUNK 프레임 (원본 바이트, base64 없음, Bank별 처음 사용 시 생성)
+    - digest           : 원본 스크립트의 sha256 (카드 보유 해시 비교용)
+    - encoding         : '' (원본) 또는 'deflate' (zlib 스트림, deflated()로 생성)
+    """
+
+    def __init__(self, path: str, data: bytes, chunk_size: int, stamp=None, encoding='', raw=None):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.stamp = stamp                # (mtime_ns, size) - 파일 변경 판정용
+        self.encoding = encoding
+        raw = data if raw is None else raw
+        self.raw_size = len(raw)          # 원본 크기
+        self.wire_size = len(data)        # 실제 전송 바이트 크기 (압축 시 압축 크기)
+        self.digest = hashlib.sha256(raw).hexdigest()
+        self._data = data if not encoding else None
+        self._wire_data = data
+        self._deflated: Optional['PreparedScript'] = None
+        self._encoded = [(len(chunk), base64.b64encode(chunk))
+                         for chunk in (data[i:i + chunk_size] for i in range(0, len(data), chunk_size))]
+        self.legacy_datagrams: List[bytes] = [b'SCRIPT_CHUNK %d %s\n' % (size, b64) for size, b64 in self._encoded]
+        self._seq_datagrams: Optional[List[bytes]] = None
+        self._frame_datagrams: Dict[int, List[bytes]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, chunk_size: int) -> 'PreparedScript':
+        stat = os.stat(path)
+        with open(path, 'rb') as f:
+            data = f.read()
+        return cls(path, data, chunk_size, stamp=(stat.st_mtime_ns, stat.st_size))
+
+    def __len__(self):
+        return len(self.legacy_datagrams)
+
+    @property
+    def seq_datagrams(self) -> List[bytes]:
+        with self._lock:
+            if self._seq_datagrams is None:
+                self._seq_datagrams = [b'SCRIPT_CHUNK %d %d %s\n' % (seq, size, b64)
+                                       for seq, (size, b64) in enumerate(self._encoded)]
+            return self._seq_datagrams
+
+    def frame_datagrams(self, bank: int) -> List[bytes]:
+        """
+        바이너리 프레임 청크 (헤더 seq는 16bit이므로 청크 수가 65536 이상이면 FrameError → 텍스트 전송 사용)
+        """
+        with self._lock:
+            frames = self._frame_datagrams.get(bank)
+            if frames is None:
+                if len(self._encoded) > c_udp_frame.MAX_PAYLOAD + 1:
+                    raise c_udp_frame.FrameError(f"too many chunks for framing: {len(self._encoded)}")
+                data, size = self._wire_data, self.chunk_size
+                frames = self._frame_datagrams[bank] = [
+                    c_udp_frame.encode(c_udp_frame.MSG_SCRIPT_CHUNK, data[i:i + size], bank=bank, seq=seq)
+                    for seq, i in enumerate(range(0, len(data), size))]
+            return frames
+
+    def deflated(self) -> 'PreparedScript':
+        """
+        zlib(deflate) 압축본을 청크/데이터그램으로 준비 (처음 호출 시 1회 생성 후 재사용).
+        - digest/raw_size는 원본 기준이므로 카드 해시 비교는 압축 여부와 무관합니다.
+        """
+        with self._lock:
+            if self._deflated is None:
+                self._deflated = PreparedScript(self.path, zlib.compress(self._data, 9), self.chunk_size,
+                                                stamp=self.stamp, encoding='deflate', raw=self._data)
+            return self._deflated
+
+    def is_current(self, path: str, chunk_size: int) -> bool:
+        """같은 파일/청크 크기이고 파일이 바뀌지 않았으면 True"""
+        if path != self.path or chunk_size != self.chunk_size:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return self.stamp == (stat.st_mtime_ns, stat.st_size)
+
+
+class WindowedScriptSender:
+    """
+    슬라이딩 윈도우 + ACK 기반 스크립트 전송 (Bank 1개 단위).
+    프로토콜:
+      서버 → 카드: "Script send WIN <total_chunks> <window>"
+      서버 → 카드: "SCRIPT_CHUNK <seq> <len> <base64>"   (seq는 0부터)
+      카드 → 서버: "SCRIPT_ACK <n>"     : seq < n 인 청크를 모두 수신 (누적 ACK)
+      카드 → 서버: "SCRIPT_NACK <seq>"  : 해당 seq만 재전송 요청 (선택적 재전송)
+      서버 → 카드: "EOF"                : 모든 청크 ACK 후 전송
+    - 윈도우 안에서는 sleep 없이 연속 송신하므로 처리량은 링크/카드 처리 속도로 결정됩니다.
+    - 재전송은 선택적입니다: RTO 만료 또는 중복 ACK 3회 시 가장 오래된 미확인 청크(base)만,
+      NACK 수신 시 요청된 seq만 다시 보냅니다.
+    - send_chunk(seq)는 bool 또는 송신 큐의 Future(bool)를 반환합니다. Future이면 한 번에 보낼 청크를 모두 넣은 뒤
+      실제 송신 결과를 기다리고, RTO는 큐에 넣은 시점이 아닌 송신 완료 시점부터 잽니다. (False/미완료 = 송신 실패)
+    """
+    DUP_ACK_THRESHOLD = 3
+
+    def __init__(self, bank_name: str, total_chunks: int, send_chunk: Callable[[int], bool],
+                 window: int = 8, rto: float = 0.2, max_retries: int = 10,
+                 on_progress: Optional[Callable[[int, int], None]] = None):
+        self.bank_name = bank_name
+        self.total = total_chunks
+        self.send_chunk = send_chunk      # send_chunk(seq) -> bool 또는 Future(bool)
+        self.window = max(1, int(window))
+        self.rto = rto
+        self.max_retries = max_retries
+        self.on_progress = on_progress    # on_progress(acked, total)
+        self._cond = threading.Condition()
+        self._base = 0                    # 가장 오래된 미확인 seq (누적 ACK 값)
+        self._next_seq = 0
+        self._sent_at = {}                # seq -> 마지막 송신 시각
+        self._retries = {}                # seq -> 재전송 횟수
+        self._nacks = set()
+        self._dup_acks = 0
+        self._aborted = False
+        self.retransmits = 0
+
+    def on_ack(self, n: int):
+        """카드의 누적 ACK 반영 (수신 스레드에서 호출)"""
+        with self._cond:
+            if n > self._base:
+                for seq in range(self._base, min(n, self._next_seq)):
+                    self._sent_at.pop(seq, None)
+                    self._retries.pop(seq, None)
+                self._base = min(n, self.total)
+                self._dup_acks = 0
+                self._nacks = {s for s in self._nacks if s >= self._base}
+            elif n == self._base:
+                self._dup_acks += 1
+            self._cond.notify_all()
+
+    def on_nack(self, seq: int):
+        """카드의 선택적 재전송 요청 반영 (수신 스레드에서 호출)"""
+        with self._cond:
+            if self._base <= seq < self._next_seq:
+                self._nacks.add(seq)
+                self._cond.notify_all()
+
+    def abort(self):
+        with self._cond:
+            self._aborted = True
+            self._cond.notify_all()
+
+    def run(self, timeout: float) -> bool:
+        """전체 청크가 ACK되면 True. timeout 초과/재전송 한도 초과/송신 실패 시 False."""
+        deadline = time.monotonic() + timeout
+        last_reported = -1
+        while True:
+            with self._cond:
+                if self._aborted:
+                    return False
+                if self._base >= self.total:
+                    return True
+                now = time.monotonic()
+                if now > deadline:
+                    print(f"[ScriptTransfer] {self.bank_name} timeout (acked {self._base}/{self.total})")
+                    return False
+
+                to_send = []
+                # 1) 윈도우 채우기
+                while self._next_seq < self.total and self._next_seq < self._base + self.window:
+                    to_send.append(self._next_seq)
+                    self._next_seq += 1
+                # 2) NACK 요청 재전송
+                resend = set(self._nacks)
+                self._nacks.clear()
+                # 3) 중복 ACK / RTO 만료 시 base만 재전송
+                base_sent = self._sent_at.get(self._base)
+                if self._dup_acks >= self.DUP_ACK_THRESHOLD or (
+                        base_sent is not None and now - base_sent > self.rto):
+                    resend.add(self._base)
+                    self._dup_acks = 0
+                for seq in sorted(resend):
+                    if seq < self._next_seq and seq not in to_send:
+                        count = self._retries.get(seq, 0) + 1
+                        if count > self.max_retries:
+                            print(f"[ScriptTransfer] {self.bank_name} chunk {seq} retry limit exceeded")
+                            return False
+                        self._retries[seq] = count
+                        self.retransmits += 1
+                        to_send.append(seq)
+                for seq in to_send:
+                    self._sent_at[seq] = now
+                acked = self._base
+
+            if self.on_progress and acked != last_reported:
+                last_reported = acked
+                self.on_progress(acked, self.total)
+
+            queued = []
+            for seq in to_send:
+                result = self.send_chunk(seq)
+                if isinstance(result, Future):
+                    queued.append((seq, result))
+                elif not result:
+                    return False
+            for seq, future in queued:
+                try:
+                    ok = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except (FutureTimeoutError, CancelledError):
+                    ok = False
+                if not ok:
+                    print(f"[ScriptTransfer] {self.bank_name} chunk {seq} send failed")
+                    return False
+                with self._cond:
+                    if seq in self._sent_at:
+                        self._sent_at[seq] = time.monotonic()
+
+            with self._cond:
+                if self._base >= self.total or self._aborted:
+                    continue
+                base_sent = self._sent_at.get(self._base)
+                wait = self.rto if base_sent is None else max(0.0, base_sent + self.rto - time.monotonic())
+                if not self._nacks and self._dup_acks < self.DUP_ACK_THRESHOLD and not (
+                        self._next_seq < self.total and self._next_seq < self._base + self.window):
+                    self._cond.wait(min(wait, max(0.0, deadline - time.monotonic())))
+
+
+def parse_ack(msg: str):
+    """'SCRIPT_ACK <n>' / 'SCRIPT_NACK <seq>' 메시지를 ('ack'|'nack', int)로 변환. 형식 오류 시 None."""
+    parts = msg.split()
+    if len(parts) < 2 or parts[0] not in ('SCRIPT_ACK', 'SCRIPT_NACK'):
+        return None
+    try:
+        value = int(parts[1].rstrip(','))
+    except ValueError:
+        return None
+    return ('ack' if parts[0] == 'SCRIPT_ACK' else 'nack'), value
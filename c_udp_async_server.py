@@ -0,0 +1,189 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Optional
+
+import c_udp_server
+
+
+class _DatagramProtocol(asyncio.DatagramProtocol):
+    """asyncio 수신 콜백 → AsyncUDPServer로 전달"""
+
+    def __init__(self, server: 'AsyncUDPServer'):
+        self.server = server
+        self.errors = 0     # error_received 횟수 (sendto 즉시 실패 판별용)
+
+    def datagram_received(self, data, addr):
+        self.server._on_datagram(data, addr)
+
+    def error_received(self, exc):
+        self.errors += 1
+        self.server._on_error(exc)
+
+
+class AsyncUDPServer(c_udp_server.TCPServer):
+    """
+    asyncio DatagramProtocol 기반 UDP 서버 (c_udp_server.TCPServer 대체용).
+    - TCPServer와 같은 공개 API(send_data, send_datagram, send_chunk_to_clients, get_connected_sockets,
+      set_bank5_socket_handler, signalMessage ...)를 그대로 제공합니다.
+    - QThread 스레드 안에서 전용 이벤트 루프를 실행하며, 수신/Bank별 플러시 타이머/송신을 모두 이 루프에서 처리합니다.
+      * 다른 스레드(do_test, GUI, slot)에서 호출한 송신은 call_soon_threadsafe로 루프에 넘겨 순서대로 송신합니다.
+      * signalMessage는 루프 스레드에서 emit되므로 Qt 연결 방식(Direct/Queued)은 기존 TCPServer와 동일하게 동작합니다.
+    - 재전송/일괄 송신 등 추가 작업은 call_soon / run_coroutine으로 같은 루프에 예약할 수 있습니다.
+    - sysInfo.xml <server engine="asyncio">로 선택합니다. (기본값은 TCPServer)
+    - 송신 결과: transport.sendto는 예외 대신 error_received로 실패를 알리므로, 루프 스레드에서 송신 직후
+      error_received 발생 여부로 성공/실패를 판별해 송신 스레드에 돌려줍니다. (SEND_RESULT_TIMEOUT 안에 루프가
+      처리하지 못하면 실패) 커널 송신 버퍼가 가득 차 transport에 버퍼링된 데이터그램은 성공으로 봅니다.
+    """
+    SEND_RESULT_TIMEOUT = 0.5   # 다른 스레드에서 송신 시 루프의 송신 결과 대기 한도(sec)
+
+    def __init__(self, objName=None, baseDir=None, mainWindow=None):
+        super().__init__(objName=objName, baseDir=baseDir, mainWindow=mainWindow)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._transport = None
+        self._protocol: Optional[_DatagramProtocol] = None
+        self._loop_thread_id = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._flush_handle = None
+        self._flush_at = None
+
+    def wait_for_client(self):
+        """startCom에서 바인딩한 소켓으로 이벤트 루프를 실행 (stop() 호출 시 반환)"""
+        self.signalMessage.emit(self.objectName(), 'connection',
+                                {'where': 'wait_for_client', 'msg': 'UDP 서버 대기 중... (asyncio)'})
+        loop = asyncio.new_event_loop()
+        self._stop_event = asyncio.Event()
+        self.loop = loop
+        self._loop_thread_id = threading.get_ident()
+        try:
+            loop.run_until_complete(self._serve())
+        finally:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            self._transport = None
+            self.loop = None
+            loop.close()
+
+        with self.lock:
+            banks = list(self.client_sockets.keys())
+            if banks:
+                print(f"[Debug] UDP server stopping. Known banks: {banks}")
+
+    async def _serve(self):
+        if not self._running:
+            return
+        transport, protocol = await self.loop.create_datagram_endpoint(lambda: _DatagramProtocol(self),
+                                                                       sock=self.sock)
+        self._transport = transport
+        self._protocol = protocol
+        try:
+            await self._stop_event.wait()
+        finally:
+            # transport.close()가 소켓을 닫으므로 startCom의 정리 단계와 중복되지 않도록 분리
+            self.sock = None
+            transport.close()
+
+    def _on_datagram(self, data, addr):
+        try:
+            self._handle_datagram(data, addr)
+        except Exception as e:
+            print(f"[Error] UDP receive loop - Exception: {str(e)}")
+            self.signalMessage.emit(self.objectName(), 'connection',
+                                    dict(where='TCPServer', msg=f'Error receiving datagram: {str(e)}'))
+        self._reschedule_flush()
+
+    def _on_error(self, exc):
+        if self._running:
+            print(f"[UDP Error] {str(exc)}")
+            self.signalMessage.emit(self.objectName(), 'connection',
+                                    dict(where='TCPServer', msg=f'UDP socket error: {str(exc)}'))
+
+    def _reschedule_flush(self):
+        """가장 가까운 Bank 플러시 deadline에 루프 타이머를 맞춤 (loop.time()은 time.monotonic 기준)"""
+        deadline = self._flush_timers.next_deadline()
+        if deadline == self._flush_at:
+            return
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._flush_at = deadline
+        if deadline is not None:
+            self._flush_handle = self.loop.call_at(deadline, self._on_flush_timer)
+
+    def _on_flush_timer(self):
+        self._flush_handle = None
+        self._flush_at = None
+        for bank_key in self._flush_timers.pop_due(time.monotonic()):
+            self._flush_bank(bank_key)
+        self._reschedule_flush()
+
+    def _sendto(self, payload: bytes, addr) -> bool:
+        """루프 스레드면 바로, 다른 스레드면 루프에 예약해 송신하고 루프의 실제 송신 결과를 반환"""
+        # 종료 중 wait_for_client가 self.loop/_transport를 None으로 바꿀 수 있으므로 한 번만 읽어 사용
+        loop = self.loop
+        transport = self._transport
+        if transport is None or loop is None:
+            return False
+        if threading.get_ident() == self._loop_thread_id:
+            return self._transport_send(transport, payload, addr)
+        result: Future = Future()
+
+        def _send():
+            try:
+                result.set_result(self._transport_send(transport, payload, addr))
+            except Exception:
+                result.set_result(False)
+
+        try:
+            loop.call_soon_threadsafe(_send)
+        except RuntimeError:
+            return False
+        try:
+            return result.result(timeout=self.SEND_RESULT_TIMEOUT)
+        except FutureTimeoutError:
+            print(f"[UDP TX] to {addr}: no send result from event loop within {self.SEND_RESULT_TIMEOUT}s")
+            return False
+
+    def _transport_send(self, transport, payload: bytes, addr) -> bool:
+        """루프 스레드에서 송신. transport가 닫혔거나 송신 중 error_received가 발생하면 False"""
+        if transport.is_closing():
+            return False
+        protocol = self._protocol
+        errors = protocol.errors if protocol is not None else 0
+        transport.sendto(payload, addr)
+        return protocol is None or protocol.errors == errors
+
+    def call_soon(self, callback, *args) -> bool:
+        """다른 스레드에서 루프에 콜백 예약 (루프가 없으면 False)"""
+        loop = self.loop
+        if loop is None:
+            return False
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            return False
+        return True
+
+    def run_coroutine(self, coro):
+        """다른 스레드에서 루프에 코루틴 예약. concurrent.futures.Future 반환 (루프가 없으면 None)"""
+        loop = self.loop
+        if loop is None:
+            coro.close()
+            return None
+        try:
+            return asyncio.run_coroutine_threadsafe(coro, loop)
+        except RuntimeError:   # 루프가 이미 닫힘
+            coro.close()
+            return None
+
+    def stop(self):
+        self._running = False
+        self.tx_queue.stop()
+        with self.lock:
+            self.client_sockets.clear()
+        if self.loop is not None and self._stop_event is not None:
+            self.call_soon(self._stop_event.set)
+        self._join_and_close()
+        self.signalMessage.emit(self.objectName(), 'sys',
+                                dict(where='TCPServer', msg='UDP 서버 종료'))
@@ -0,0 +1,150 @@
+"""
+Write Card / IO 보드 UDP 바이너리 프레임 (텍스트 라인 프로토콜의 선택적 대체).
+프레임 구조 (network byte order, 헤더 10 bytes + payload):
+  magic(2) version(1) type(1) bank(1) flags(1) seq(2) length(2) | payload(length)
+  - magic  : 0xB5 0xA7 (UTF-8 텍스트의 첫 바이트로 나올 수 없으므로 텍스트 라인과 datagram 첫 2바이트로 구분)
+  - bank   : 송신 측 Bank 번호(카드 → 서버) 또는 목적지 Bank 번호(서버 → 카드)
+  - seq    : 스크립트 청크/ACK 번호 등 (그 외 타입은 0)
+  - datagram 1개에 프레임 여러 개를 이어 붙일 수 있습니다.
+메시지 타입:
+  MSG_TEXT         : payload = UTF-8 텍스트 1줄 (프레임으로 감싼 기존 명령/보고)
+  MSG_SCRIPT_CHUNK : payload = 스크립트 원본 바이트 (base64 없음), seq = 청크 번호
+  MSG_SCRIPT_ACK   : seq = 누적 ACK 값 (seq < n 인 청크 모두 수신)
+  MSG_SCRIPT_NACK  : seq = 재전송 요청 청크 번호
+  MSG_EVENT        : payload = 이벤트 id 1 byte + (선택) UTF-8 인자. EVENT_NAMES 표로 기존 메시지 문자열에 대응
+  MSG_SENSOR_ID    : payload = JSON 객체 ({"Module1": "...", ...})
+  MSG_BARCODE_INFO : payload = JSON 객체
+"""
+import json
+import struct
+from typing import Iterator, NamedTuple
+
+MAGIC = 0xB5A7
+MAGIC_BYTES = struct.pack('!H', MAGIC)
+VERSION = 1
+HEADER = struct.Struct('!HBBBBHH')
+HEADER_SIZE = HEADER.size
+MAX_PAYLOAD = 0xFFFF
+
+MSG_TEXT = 1
+MSG_SCRIPT_CHUNK = 2
+MSG_SCRIPT_ACK = 3
+MSG_SCRIPT_NACK = 4
+MSG_EVENT = 5
+MSG_SENSOR_ID = 6
+MSG_BARCODE_INFO = 7
+
+MSG_NAMES = {
+    MSG_TEXT: 'TEXT',
+    MSG_SCRIPT_CHUNK: 'SCRIPT_CHUNK',
+    MSG_SCRIPT_ACK: 'SCRIPT_ACK',
+    MSG_SCRIPT_NACK: 'SCRIPT_NACK',
+    MSG_EVENT: 'EVENT',
+    MSG_SENSOR_ID: 'sensor_ID',
+    MSG_BARCODE_INFO: 'barcode_info',
+}
+
+# MSG_EVENT id → 기존 텍스트 메시지 (인자가 있으면 '<이름>: <인자>'로 복원)
+EVENT_NAMES = {
+    1: 'Script save finished',
+    2: 'Script save Failed',
+    3: 'Mapping start',
+    4: 'Pusher down finished',
+    5: 'Pusher back finished',
+    6: 'Button unpushed',
+    7: 'Scan Stop',
+}
+EVENT_IDS = {name: event_id for event_id, name in EVENT_NAMES.items()}
+
+
+class FrameError(ValueError):
+    """프레임 형식 오류 (magic/version 불일치, 길이 부족)"""
+
+
+class Frame(NamedTuple):
+    msg_type: int
+    bank: int
+    seq: int
+    flags: int
+    payload: memoryview   # 수신 버퍼를 가리키므로 보관이 필요하면 bytes()로 복사
+
+
+def is_frame(data) -> bool:
+    """datagram이 바이너리 프레임으로 시작하면 True"""
+    return len(data) >= HEADER_SIZE and data[0] == MAGIC_BYTES[0] and data[1] == MAGIC_BYTES[1]
+
+
+def encode(msg_type: int, payload=b'', bank: int = 0, seq: int = 0, flags: int = 0) -> bytes:
+    """프레임 1개를 bytes로 조립"""
+    if len(payload) > MAX_PAYLOAD:
+        raise FrameError(f"payload too large: {len(payload)} bytes")
+    return HEADER.pack(MAGIC, VERSION, msg_type, bank, flags, seq & 0xFFFF, len(payload)) + bytes(payload)
+
+
+def encode_text(text: str, bank: int = 0) -> bytes:
+    return encode(MSG_TEXT, text.encode('utf-8'), bank=bank)
+
+
+def encode_json(msg_type: int, obj, bank: int = 0) -> bytes:
+    return encode(msg_type, json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), bank=bank)
+
+
+def iter_frames(data) -> Iterator[Frame]:
+    """
+    datagram 안의 프레임을 차례로 반환 (payload는 data의 memoryview 조각, 복사 없음).
+    - 형식 오류를 만나면 FrameError (그 전까지의 프레임은 이미 반환됨)
+    """
+    view = memoryview(data)
+    pos = 0
+    end = len(view)
+    while pos < end:
+        if end - pos < HEADER_SIZE:
+            raise FrameError(f"truncated header ({end - pos} bytes)")
+        magic, version, msg_type, bank, flags, seq, length = HEADER.unpack_from(view, pos)
+        if magic != MAGIC:
+            raise FrameError(f"bad magic 0x{magic:04X}")
+        if version != VERSION:
+            raise FrameError(f"unsupported version {version}")
+        pos += HEADER_SIZE
+        if pos + length > end:
+            raise FrameError(f"truncated payload ({end - pos}/{length} bytes)")
+        yield Frame(msg_type, bank, seq, flags, view[pos:pos + length])
+        pos += length
+
+
+def to_message(frame: Frame):
+    """
+    ACK/NACK/청크 외 프레임을 기존 'job' 메시지로 변환: (msg, payload_dict 또는 None)
+    - MSG_TEXT/MSG_EVENT: 텍스트 메시지 (payload_dict None)
+    - MSG_SENSOR_ID/MSG_BARCODE_INFO: ('sensor_ID' 등 이름, JSON 디코드된 dict)
+    - 변환할 수 없는 타입은 FrameError
+    """
+    msg_type = frame.msg_type
+    if msg_type == MSG_TEXT:
+        return str(frame.payload, 'utf-8', 'replace'), None
+    if msg_type == MSG_EVENT:
+        if not frame.payload:
+            raise FrameError("empty event frame")
+        name = EVENT_NAMES.get(frame.payload[0])
+        if name is None:
+            raise FrameError(f"unknown event id {frame.payload[0]}")
+        arg = str(frame.payload[1:], 'utf-8', 'replace')
+        return (f"{name}: {arg}" if arg else name), None
+    if msg_type in (MSG_SENSOR_ID, MSG_BARCODE_INFO):
+        try:
+            value = json.loads(str(frame.payload, 'utf-8'))
+        except ValueError as e:
+            raise FrameError(f"bad {MSG_NAMES[msg_type]} payload: {e}") from e
+        if not isinstance(value, dict):
+            raise FrameError(f"{MSG_NAMES[msg_type]} payload is not an object")
+        return MSG_NAMES[msg_type], value
+    raise FrameError(f"unhandled frame type {msg_type}")
+
+
+def describe(data) -> str:
+    """로그/trace용 짧은 설명 (예: 'FRAME SCRIPT_CHUNK #3 512B')"""
+    try:
+        magic, version, msg_type, bank, flags, seq, length = HEADER.unpack_from(data, 0)
+    except struct.error:
+        return 'FRAME ?'
+    return f"FRAME {MSG_NAMES.get(msg_type, msg_type)} #{seq} {length}B"
@@ -1,14 +1,19 @@
 import base64
+import selectors
 import socket
 import threading
 from PySide6.QtCore import QThread, Signal
 import util_base
-import xml.etree.ElementTree as ET
+import c_udp_frame
 import os
 import time
 import inspect
-from PySide6.QtCore import QObject, QTimer
 from typing import Dict, Any
+# Qt 없이 동작하는 라우팅/재조립/송신 큐 구성 요소 (기존 c_udp_server.X 참조 호환을 위해 그대로 노출)
+from c_udp_support import (BankRoutingTable, LineReassembler, FlushTimerQueue, TransmitQueue,
+                           parse_buffer_size, read_udp_drops,
+                           TX_PRIORITY_MOTION, TX_PRIORITY_COMMAND, TX_PRIORITY_SCRIPT)
+
 
 class TCPServer(QThread):
     """
@@ -44,12 +49,44 @@ class TCPServer(QThread):
         self._bank5_socket_handler = None  # callable(...)
 
         # UDP용: Bank별 버퍼/타임스탬프 관리
-        self._udp_buffers = {}       # { "Bank1": "partial text...", ... }
+        self._udp_buffers: Dict[str, LineReassembler] = {}   # { "Bank1": LineReassembler, ... }
         self._udp_last_data_ts = {}  # { "Bank1": last_ts, ... }
         self._known_banks = set()    # 최초 감지된 Bank 추적 (연결 카운트 유사 기능)
+        self._writecard_connected = set()
+
+        # 수신 루프: selectors + 플러시 타이머 큐 + 종료용 wakeup 소켓쌍
+        self._flush_timers = FlushTimerQueue()
+        self._recv_ring = [bytearray(self.RECV_BUFFER_SIZE) for _ in range(self.RECV_BATCH)]
+        self._recv_views = [memoryview(buf) for buf in self._recv_ring]
+        self._selector = None
+        self._wakeup_r = None
+        self._wakeup_w = None
+
+        # Bank별 위임 핸들러 { "5": dispatcher(client_addr, data), ... }
+        # - 등록 시 호출 규약을 1회 판별해 만든 dispatcher를 저장하므로 datagram마다 reflection을 하지 않습니다.
+        self._bank_handlers: Dict[str, Any] = {}
+
+        # IP → bank number 라우팅 테이블 (startCom에서 구축)
+        self.bank_routes = None
 
-        # UDP용: Bank5 최초 감지 여부 (2-인자 핸들러 하위호환용)
-        self._bank5_seen_addrs = set()
+        # 송신 관찰자: callable(addr, payload: bytes, ok: bool) (사이클 trace 등)
+        self._tx_listeners = []
+
+        # 비동기 송신 큐 (send_async) - 단일 송신 스레드에서 우선순위/목적지별 페이싱 적용
+        self.tx_queue = TransmitQueue(self._send_queued, name=f"{objName or 'UDP'}-TX", resolve=self._resolve_addr)
+
+        # 소켓 버퍼 크기(<server rcvBuf="..." sndBuf="...">, None이면 OS 기본값)와 Bank별 수신 통계
+        self.rcvbuf_size = None
+        self.sndbuf_size = None
+        self._rx_stats = {}          # { "Bank1": [packets, bytes], ... }
+        self._rx_stats_prev = ({}, time.monotonic())
+
+        # 바이너리 프레임(c_udp_frame) 수신
+        # - _frame_handlers: { msg_type: handler(bank_number, frame) } 수신 스레드에서 직접 호출 (문자열 변환/Signal 없음)
+        # - framed_banks: 프레임을 한 번이라도 보낸 Bank (프레임 지원으로 간주)
+        self._frame_handlers: Dict[int, Any] = {}
+        self.framed_banks = set()
+        self._frame_stats = {'frames': 0, 'errors': 0}
 
 
     def set_bank5_socket_handler(self, handler):
@@ -60,6 +97,60 @@ class TCPServer(QThread):
           * 기존 handler(sock, addr) 2-인자 핸들러도 지원하며, 이 경우 Bank5를 처음 감지했을 때 1회 호출됩니다.
         """
         self._bank5_socket_handler = handler
+        self.set_bank_handler(5, handler)
+
+    def set_bank_handler(self, bank_number, handler):
+        """
+        Bank의 수신 datagram 처리를 외부 핸들러로 위임 (handler가 None이면 위임 해제).
+        - handler(sock, addr, data): datagram마다 호출
+        - handler(sock, addr): 해당 주소를 처음 감지했을 때 1회 호출 (구형 attach 방식)
+        - 호출 규약은 등록 시 1회만 판별합니다.
+        """
+        key = str(bank_number)
+        if handler is None:
+            self._bank_handlers.pop(key, None)
+            return
+        self._bank_handlers[key] = self._make_bank_dispatcher(handler)
+
+    def _make_bank_dispatcher(self, handler):
+        try:
+            params = inspect.signature(handler).parameters.values()
+            positional = [p for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+            takes_data = len(positional) >= 3 or any(p.kind == p.VAR_POSITIONAL for p in params)
+        except (TypeError, ValueError):
+            takes_data = True
+
+        if takes_data:
+            def dispatch(client_addr, data):
+                handler(self.sock, client_addr, bytes(data))
+        else:
+            seen_addrs = set()
+
+            def dispatch(client_addr, data):
+                if client_addr not in seen_addrs:
+                    seen_addrs.add(client_addr)
+                    handler(self.sock, client_addr)
+        return dispatch
+
+    def set_frame_handler(self, msg_type, handler):
+        """
+        바이너리 프레임 타입별 수신 핸들러 등록 (handler가 None이면 해제).
+        - handler(bank_number: str, frame: c_udp_frame.Frame)를 수신 스레드에서 바로 호출합니다.
+        - frame.payload는 수신 버퍼를 가리키므로 보관하려면 bytes로 복사해야 합니다.
+        - 핸들러가 없는 타입은 기존 텍스트 메시지로 변환해 signalMessage('job')로 전달합니다.
+        """
+        if handler is None:
+            self._frame_handlers.pop(msg_type, None)
+        else:
+            self._frame_handlers[msg_type] = handler
+
+    def add_tx_listener(self, listener):
+        """
+        송신 관찰자 등록. send_data로 datagram을 보낼 때마다 listener(addr, payload, ok)가 호출됩니다.
+        - 송신 스레드에서 호출되므로 listener는 가볍게 유지해야 합니다.
+        """
+        if listener not in self._tx_listeners:
+            self._tx_listeners.append(listener)
 
     def run(self):
         server_info = util_base.get_xml_info(self.baseDir, 'server')
@@ -78,13 +169,19 @@ class TCPServer(QThread):
         if not self.validate_ip(self.ip):
             raise ValueError(f"Invalid IP address: {self.ip}")
 
+        # 수신 루프에서 datagram마다 sysInfo.xml을 파싱하지 않도록 라우팅 테이블을 미리 구축
+        self.bank_routes = BankRoutingTable(os.path.join(self.baseDir, 'sysInfo.xml'))
+        self.bank_routes.load()
+
         try:
             # UDP 소켓 생성
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._load_socket_buffer_config()
+            self._apply_socket_buffers()
             self.sock.bind((self.ip, self.port))
-            # 논블로킹 종료를 위해 타임아웃 설정
-            self.sock.settimeout(1.0)
+            # selectors 기반 수신 루프에서 사용하므로 논블로킹으로 설정
+            self.sock.setblocking(False)
 
             print(f"Binded(UDP) to IP: {self.ip}, Port: {self.port}")
             self.signalMessage.emit(self.objectName(), 'connection',
@@ -108,23 +205,79 @@ class TCPServer(QThread):
                 except Exception:
                     pass
 
+    def _load_socket_buffer_config(self):
+        """sysInfo.xml <server rcvBuf="4M" sndBuf="1M">를 읽어 소켓 버퍼 요청값 갱신 (startCom에서 소켓 생성 직후 호출)"""
+        try:
+            server_info = util_base.get_xml_info(self.baseDir, 'server') or {}
+        except Exception as e:
+            print(f"[UDP Warning] server info unavailable, keeping socket buffer defaults: {e}")
+            return
+        self.rcvbuf_size = parse_buffer_size(server_info.get('rcvBuf'))
+        self.sndbuf_size = parse_buffer_size(server_info.get('sndBuf'))
+
+    def _apply_socket_buffers(self):
+        """
+        <server rcvBuf sndBuf> 설정값으로 SO_RCVBUF/SO_SNDBUF를 지정하고 실제 적용된 크기를 출력합니다.
+        - Linux는 요청값의 2배를 보고하며, net.core.rmem_max/wmem_max보다 크게 요청하면 상한으로 잘립니다.
+        """
+        for name, opt, requested in (('SO_RCVBUF', socket.SO_RCVBUF, self.rcvbuf_size),
+                                     ('SO_SNDBUF', socket.SO_SNDBUF, self.sndbuf_size)):
+            if requested:
+                try:
+                    self.sock.setsockopt(socket.SOL_SOCKET, opt, requested)
+                except OSError as e:
+                    print(f"[UDP Warning] {name}={requested} 설정 실패: {e}")
+            effective = self.sock.getsockopt(socket.SOL_SOCKET, opt)
+            print(f"[UDP] {name} requested={requested or 'default'} effective={effective}")
+            if requested and effective < requested:
+                print(f"[UDP Warning] {name}가 요청값보다 작게 적용됨 (커널 상한 확인 필요)")
+
+    def get_socket_stats(self) -> Dict[str, Any]:
+        """
+        수신 소켓 상태 조회.
+        - rcvbuf/sndbuf: 요청값과 실제 적용값
+        - kernel: /proc/net/udp의 drops, rx_queue (Linux 외에는 None)
+        - banks: Bank별 누적 packets/bytes와 직전 호출 이후의 초당 packets/bytes
+        """
+        stats: Dict[str, Any] = {'rcvbuf_requested': self.rcvbuf_size, 'sndbuf_requested': self.sndbuf_size,
+                                 'rcvbuf': None, 'sndbuf': None, 'kernel': None, 'banks': {}}
+        sock = self.sock
+        if sock is not None and sock.fileno() != -1:
+            try:
+                stats['rcvbuf'] = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+                stats['sndbuf'] = sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF)
+            except OSError:
+                pass
+            stats['kernel'] = read_udp_drops(sock)
+
+        now = time.monotonic()
+        prev, prev_ts = self._rx_stats_prev
+        elapsed = max(now - prev_ts, 1e-6)
+        current = {bank: tuple(counts) for bank, counts in self._rx_stats.items()}
+        for bank, (packets, nbytes) in current.items():
+            prev_packets, prev_bytes = prev.get(bank, (0, 0))
+            stats['banks'][bank] = {'packets': packets, 'bytes': nbytes,
+                                    'pps': (packets - prev_packets) / elapsed,
+                                    'bps': (nbytes - prev_bytes) / elapsed}
+        self._rx_stats_prev = (current, now)
+        stats['frames'] = dict(self._frame_stats, banks=sorted(self.framed_banks))
+        return stats
+
     def get_bank_number_by_ip(self, ip):
         """
-        sysInfo.xml 파일을 파싱하여 주어진 IP 주소에 해당하는 bank number를 반환
+        주어진 IP 주소에 해당하는 bank number를 반환
+        - sysInfo.xml을 매번 파싱하지 않고 메모리 라우팅 테이블(BankRoutingTable)에서 조회합니다.
         """
-        try:
-            tree = ET.parse(os.path.join(self.baseDir, 'sysInfo.xml'))
-            root = tree.getroot()
-
-            clients = root.find('clients')
-            if clients is not None:
-                for bank in clients.findall('bank'):
-                    if bank.get('ip') == ip:
-                        return bank.get('number')
-            return None
-        except Exception as e:
-            print(f"Error parsing sysInfo.xml: {e}")
-            return None
+        if self.bank_routes is None:
+            self.bank_routes = BankRoutingTable(os.path.join(self.baseDir, 'sysInfo.xml'))
+            self.bank_routes.load()
+        return self.bank_routes.lookup(ip)
+
+    def get_routing_stats(self) -> Dict[str, Any]:
+        """라우팅 테이블 조회 통계(hits/misses/reloads/entries)를 반환"""
+        if self.bank_routes is None:
+            return {'hits': 0, 'misses': 0, 'reloads': 0, 'entries': 0}
+        return self.bank_routes.stats()
 
 
 
@@ -141,149 +294,219 @@ class TCPServer(QThread):
         return client_sockets
 
 
+    FLUSH_AFTER = 0.3        # Bank별 마지막 수신 후 개행 없는 부분 데이터를 한 줄로 플러시하기까지의 시간(sec)
+    MAX_LINE_LENGTH = 8192   # Bank별 개행 없이 누적 가능한 최대 라인 길이(bytes)
+    RECV_BUFFER_SIZE = 4096  # datagram 1개 수신 버퍼 크기(bytes)
+    RECV_BATCH = 64          # wakeup 1회에 최대로 읽어 들이는 datagram 수(수신 버퍼 ring 크기)
+    STOP_WAIT_MS = 2000      # stop()에서 수신 스레드 종료를 기다리는 한도(ms)
+
     def wait_for_client(self):
+        """
+        selectors 기반 UDP 수신 루프.
+        - 소켓 수신과 stop()의 wakeup 신호를 함께 대기하며, 대기 시간은 가장 가까운 Bank 플러시 deadline까지입니다.
+        - 각 Bank의 부분 버퍼는 마지막 수신 후 FLUSH_AFTER가 지나면 트래픽 여부와 무관하게 플러시됩니다.
+        """
         self.signalMessage.emit(self.objectName(), 'connection',
                                 {'where': 'wait_for_client', 'msg': 'UDP 서버 대기 중...'})
 
-        writecard_connected = set()
-
-        def process_line(bank_number: str, client_addr, line_text: str, now_ts: float):
-            if line_text is None:
-                return
-            line_text = line_text.rstrip("\r").strip()
-            if not line_text:
-                return
-
-            # ping 관련 분기 제거: 모든 메시지를 동일하게 처리
-            ts_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now_ts))
-            print(f"[{ts_str}] Received data from {client_addr}: {line_text}")
-            # print(f"Received data from {client_addr}: {line_text}")
-
-            where_msg = f"Write Card {bank_number}"
-            self.signalMessage.emit(self.objectName(), 'job', dict(where=where_msg, msg=line_text))
-            if line_text.startswith("Script save finished"):
-                self.signalMessage.emit(self.objectName(), 'client',
-                                        {'where': f'Bank {bank_number}', 'msg': line_text})
+        self._selector = selectors.DefaultSelector()
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._selector.register(self.sock, selectors.EVENT_READ, 'udp')
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ, 'wakeup')
 
-        while self._running:
-            now = time.time()
-            try:
-                data, client_addr = self.sock.recvfrom(4096)
-                if not data:
+        try:
+            while self._running:
+                deadline = self._flush_timers.next_deadline()
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    events = self._selector.select(timeout)
+                except OSError as e:
+                    if not self._running:
+                        break
+                    print(f"[UDP Error] {str(e)}")
                     continue
 
-                client_ip = client_addr[0]
-                bank_number = self.get_bank_number_by_ip(client_ip)
-                if not bank_number:
-                    bank_number = "Unknown"
-
-                # IO 보드(5)는 외부 핸들러로 위임
-                if str(bank_number) == "5":
-                    if self._bank5_socket_handler:
+                for key, _ in events:
+                    if key.data == 'wakeup':
                         try:
-                            sig = inspect.signature(self._bank5_socket_handler)
-                            params = sig.parameters
-                            if len(params) >= 3:
-                                # (sock, addr, data) 지원 핸들러
-                                self._bank5_socket_handler(self.sock, client_addr, data)
-                            else:
-                                # (sock, addr) 구형 핸들러: 최초 감지 시 1회 호출
-                                if client_addr not in self._bank5_seen_addrs:
-                                    self._bank5_seen_addrs.add(client_addr)
-                                    self._bank5_socket_handler(self.sock, client_addr)
-                        except Exception as e:
-                            print(f"[Bank5 handler error] {e}")
-                    continue
-
-                # Write Card 1~4만 관리
-                if str(bank_number) not in ("1", "2", "3", "4"):
-                    continue
-
-                client_name = f"Bank{bank_number}"
-
-                # 최초 감지 시 '연결' 유사 처리
-                first_seen_for_bank = False
-                with self.lock:
-                    prev_addr = self.client_sockets.get(client_name)
-                    if prev_addr != client_addr:
-                        self.client_sockets[client_name] = client_addr
-                        first_seen_for_bank = client_name not in self._known_banks
-                        self._known_banks.add(client_name)
-
-                        if first_seen_for_bank:
-                            self.connected_clients += 1
-                            client_type = f"writecard {bank_number}"
-                            self.signalMessage.emit(self.objectName(), 'connection',
-                                                    {'where': f'Bank {bank_number}',
-                                                     'msg': f'Client connected: {client_type}'})
-
-                            writecard_connected.add(str(bank_number))
-                            if len(writecard_connected) == 4:
-                                self.signalMessage.emit(self.objectName(), 'connection',
-                                                        {'where': 'Client', 'msg': 'All Write Cards connected.'})
-
-                # Bank별 버퍼 초기화 보장
-                if client_name not in self._udp_buffers:
-                    self._udp_buffers[client_name] = ""
-                if client_name not in self._udp_last_data_ts:
-                    self._udp_last_data_ts[client_name] = now
-
-                # 디코드 및 라인 처리
+                            self._wakeup_r.recv(64)
+                        except OSError:
+                            pass
+                    else:
+                        self._drain_socket()
+
+                for bank_key in self._flush_timers.pop_due(time.monotonic()):
+                    self._flush_bank(bank_key)
+        finally:
+            for s in (self._wakeup_r, self._wakeup_w):
                 try:
-                    text = data.decode()
-                except UnicodeDecodeError as e:
-                    print(f"Decode error: {e}")
-                    continue
-
-                self._udp_last_data_ts[client_name] = now
-                self._udp_buffers[client_name] += text
+                    s.close()
+                except Exception:
+                    pass
+            try:
+                self._selector.close()
+            except Exception:
+                pass
+            self._wakeup_r = self._wakeup_w = None
 
-                # 누적 버퍼에서 개행 단위로 처리
-                while True:
-                    idx = self._udp_buffers[client_name].find("\n")
-                    if idx == -1:
-                        break
-                    line, rest = self._udp_buffers[client_name][:idx], self._udp_buffers[client_name][idx + 1:]
-                    self._udp_buffers[client_name] = rest
-                    process_line(bank_number, client_addr, line, now)
-
-            except socket.timeout:
-                # 각 Bank별로 일정 시간동안 추가 데이터가 없으면 버퍼 플러시
-                flush_after = 0.3
-                to_flush = []
-                for bank_key, buf in list(self._udp_buffers.items()):
-                    if buf:
-                        last_ts = self._udp_last_data_ts.get(bank_key, 0)
-                        if now - last_ts > flush_after:
-                            to_flush.append(bank_key)
-                for bank_key in to_flush:
-                    bank_number = bank_key.replace("Bank", "")
-                    buf = self._udp_buffers.get(bank_key, "").strip()
-                    if buf:
-                        client_addr = self.client_sockets.get(bank_key)
-                        process_line(bank_number, client_addr, buf, now)
-                        self._udp_buffers[bank_key] = ""
-                continue
+        # 루프 종료 시 정리 로그
+        with self.lock:
+            banks = list(self.client_sockets.keys())
+            if banks:
+                print(f"[Debug] UDP server stopping. Known banks: {banks}")
 
+    def _drain_socket(self):
+        """
+        읽을 수 있는 datagram을 미리 할당한 수신 버퍼 ring에 recvfrom_into로 최대 RECV_BATCH개까지 한꺼번에 읽은 뒤
+        일괄 처리합니다. (datagram마다 bytes 할당/루프 1회를 하지 않음)
+        - 남은 datagram이 있으면 다음 select에서 바로 다시 깨어나 이어서 읽습니다.
+        """
+        batch = []
+        for view in self._recv_views:
+            try:
+                nbytes, client_addr = self.sock.recvfrom_into(view)
+            except (BlockingIOError, InterruptedError):
+                break
             except OSError as e:
-                if not self._running:
-                    break
-                print(f"[UDP Error] {str(e)}")
-                self.signalMessage.emit(self.objectName(), 'connection',
-                                        dict(where='TCPServer', msg=f'UDP socket error: {str(e)}'))
-                continue
-
+                if self._running:
+                    print(f"[UDP Error] {str(e)}")
+                    self.signalMessage.emit(self.objectName(), 'connection',
+                                            dict(where='TCPServer', msg=f'UDP socket error: {str(e)}'))
+                break
+            if nbytes:
+                batch.append((view[:nbytes], client_addr))
+
+        for data, client_addr in batch:
+            try:
+                self._handle_datagram(data, client_addr)
             except Exception as e:
                 print(f"[Error] UDP receive loop - Exception: {str(e)}")
                 self.signalMessage.emit(self.objectName(), 'connection',
                                         dict(where='TCPServer', msg=f'Error receiving datagram: {str(e)}'))
-                continue
 
-        # 루프 종료 시 정리 로그
+    def _handle_datagram(self, data, client_addr):
+        """
+        datagram 1개 처리. data는 수신 버퍼 ring의 memoryview이므로 다음 drain 전에만 유효합니다.
+        (보관이 필요한 곳에는 bytes로 복사해 전달)
+        """
+        now = time.time()
+        client_ip = client_addr[0]
+        bank_number = self.get_bank_number_by_ip(client_ip)
+        if not bank_number:
+            bank_number = "Unknown"
+
+        counts = self._rx_stats.get(f"Bank{bank_number}")
+        if counts is None:
+            counts = self._rx_stats[f"Bank{bank_number}"] = [0, 0]
+        counts[0] += 1
+        counts[1] += len(data)
+
+        # 위임 핸들러가 등록된 Bank(IO 보드 5 등)는 외부 핸들러로 위임
+        dispatch = self._bank_handlers.get(str(bank_number))
+        if dispatch is not None:
+            try:
+                dispatch(client_addr, data)
+            except Exception as e:
+                print(f"[Bank{bank_number} handler error] {e}")
+            return
+        if str(bank_number) == "5":
+            return
+
+        # Write Card 1~4만 관리
+        if str(bank_number) not in ("1", "2", "3", "4"):
+            return
+
+        client_name = f"Bank{bank_number}"
+
+        # 최초 감지 시 '연결' 유사 처리
         with self.lock:
-            banks = list(self.client_sockets.keys())
-            if banks:
-                print(f"[Debug] UDP server stopping. Known banks: {banks}")
+            prev_addr = self.client_sockets.get(client_name)
+            if prev_addr != client_addr:
+                self.client_sockets[client_name] = client_addr
+                first_seen_for_bank = client_name not in self._known_banks
+                self._known_banks.add(client_name)
+
+                if first_seen_for_bank:
+                    self.connected_clients += 1
+                    client_type = f"writecard {bank_number}"
+                    self.signalMessage.emit(self.objectName(), 'connection',
+                                            {'where': f'Bank {bank_number}',
+                                             'msg': f'Client connected: {client_type}'})
+
+                    self._writecard_connected.add(str(bank_number))
+                    if len(self._writecard_connected) == 4:
+                        self.signalMessage.emit(self.objectName(), 'connection',
+                                                {'where': 'Client', 'msg': 'All Write Cards connected.'})
+
+        # 바이너리 프레임은 라인 재조립 없이 헤더 기준으로 처리
+        if c_udp_frame.is_frame(data):
+            self._handle_frames(bank_number, client_addr, data, now)
+            return
+
+        # Bank별 버퍼 초기화 보장
+        buffer = self._udp_buffers.get(client_name)
+        if buffer is None:
+            buffer = self._udp_buffers[client_name] = LineReassembler(self.MAX_LINE_LENGTH)
+
+        # 누적 버퍼에서 개행 단위로 처리 (완성된 라인만 decode)
+        self._udp_last_data_ts[client_name] = now
+        for line in buffer.feed(data):
+            self._process_line(bank_number, client_addr, line, now)
+
+        # 개행 없이 남은 부분 데이터는 FLUSH_AFTER 후 플러시 (추가 수신 시 deadline 연장)
+        if len(buffer):
+            self._flush_timers.schedule(client_name, time.monotonic() + self.FLUSH_AFTER)
+        else:
+            self._flush_timers.cancel(client_name)
+
+    def _handle_frames(self, bank_number, client_addr, data, now_ts: float):
+        """datagram 안의 프레임을 타입별 핸들러로 전달하거나 기존 'job' 메시지로 변환"""
+        client_name = f"Bank{bank_number}"
+        if client_name not in self.framed_banks:
+            self.framed_banks.add(client_name)
+            print(f"[UDPServer] {client_name} binary framing detected")
+        try:
+            for frame in c_udp_frame.iter_frames(data):
+                self._frame_stats['frames'] += 1
+                handler = self._frame_handlers.get(frame.msg_type)
+                if handler is not None:
+                    handler(str(bank_number), frame)
+                    continue
+                msg, payload = c_udp_frame.to_message(frame)
+                if payload is None:
+                    self._process_line(bank_number, client_addr, msg, now_ts)
+                else:
+                    self.signalMessage.emit(self.objectName(), 'job',
+                                            dict(where=f"Write Card {bank_number}", msg=msg, payload=payload))
+        except c_udp_frame.FrameError as e:
+            self._frame_stats['errors'] += 1
+            print(f"[UDPServer] {client_name} frame error: {e}")
+
+    def _flush_bank(self, bank_key):
+        """개행 없이 남은 Bank 버퍼를 한 줄로 처리"""
+        buffer = self._udp_buffers.get(bank_key)
+        buf = buffer.flush().strip() if buffer is not None else ""
+        if buf:
+            self._process_line(bank_key.replace("Bank", ""), self.client_sockets.get(bank_key), buf, time.time())
+
+    def _process_line(self, bank_number: str, client_addr, line_text: str, now_ts: float):
+        if line_text is None:
+            return
+        line_text = line_text.rstrip("\r").strip()
+        if not line_text:
+            return
+
+        # ping 관련 분기 제거: 모든 메시지를 동일하게 처리
+        ts_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now_ts))
+        print(f"[{ts_str}] Received data from {client_addr}: {line_text}")
+        # print(f"Received data from {client_addr}: {line_text}")
+
+        where_msg = f"Write Card {bank_number}"
+        self.signalMessage.emit(self.objectName(), 'job', dict(where=where_msg, msg=line_text))
+        if line_text.startswith("Script save finished"):
+            self.signalMessage.emit(self.objectName(), 'client',
+                                    {'where': f'Bank {bank_number}', 'msg': line_text})
 
 
     # (참고) TCP 전용 클라이언트 스레드 함수는 UDP에선 사용하지 않습니다.
@@ -292,16 +515,35 @@ class TCPServer(QThread):
         # UDP 모드에서는 사용되지 않습니다.
         pass
 
+    def _join_and_close(self):
+        """
+        수신 스레드 종료를 STOP_WAIT_MS까지 기다린 뒤 소켓을 닫음
+        - 정상 종료 시 소켓은 startCom의 finally에서 이미 닫혀 있으며, 다시 닫아도 무해합니다.
+        - wait()가 시간 초과되어도 소켓을 닫아 수신 스레드의 select/recv가 오류로 빠져나오게 합니다.
+        """
+        if self.isRunning() and QThread.currentThread() is not self:
+            if not self.wait(self.STOP_WAIT_MS):
+                print(f"[UDP] 수신 스레드가 {self.STOP_WAIT_MS}ms 안에 종료되지 않아 소켓을 강제로 닫습니다.")
+        if self.sock:
+            try:
+                self.sock.close()
+            except Exception:
+                pass
+
     def stop(self):
         self._running = False
+        self.tx_queue.stop()
         with self.lock:
             # UDP에서는 별도의 클라이언트 소켓이 없으므로 주소 맵만 정리
             self.client_sockets.clear()
-        if self.sock:
+        wakeup = self._wakeup_w
+        if wakeup is not None:
+            # 수신 루프가 select 대기 중이면 즉시 깨워 종료시킴
             try:
-                self.sock.close()
-            except Exception:
+                wakeup.send(b'\0')
+            except OSError:
                 pass
+        self._join_and_close()
         self.signalMessage.emit(self.objectName(), 'sys',
                                 dict(where='TCPServer', msg='UDP 서버 종료'))
 
@@ -349,9 +591,13 @@ class TCPServer(QThread):
                     text = text + "\n"
                 payload = text.encode('utf-8')
                 dbg_kind = "text"
-            sent = self.sock.sendto(payload, addr)
-            ok = (sent == len(payload))
+            ok = self._sendto(payload, addr)
             print(f"[UDP TX] to {addr} {dbg_kind} {len(payload)} bytes (ok={ok})")
+            for listener in self._tx_listeners:
+                try:
+                    listener(addr, payload, ok)
+                except Exception:
+                    pass
             return ok
         except Exception as e:
             self.signalMessage.emit(self.objectName(), 'data',
@@ -360,7 +606,67 @@ class TCPServer(QThread):
 
 
 
-    def send_chunk_to_clients(self, client_socket, chunk) -> bool:
+    def send_async(self, client_socket, data, priority=TX_PRIORITY_COMMAND, interval=0.0, callback=None):
+        """
+        송신 큐에 적재하고 바로 반환 (호출 스레드는 송신 I/O를 기다리지 않음).
+        - data: str이면 send_data와 같이 개행을 붙여 송신, bytes면 그대로 송신(send_datagram)
+        - priority: TX_PRIORITY_MOTION / TX_PRIORITY_COMMAND / TX_PRIORITY_SCRIPT
+        - interval: 송신 후 같은 목적지로의 다음 송신까지 최소 간격(sec)
+        - callback(ok): 송신 완료 시 송신 스레드에서 호출
+        - 반환: concurrent.futures.Future (큐가 중지되었으면 None)
+        """
+        if client_socket is None:
+            return None
+        return self.tx_queue.submit(client_socket, data, priority=priority, interval=interval, callback=callback)
+
+    def _resolve_addr(self, client_socket):
+        """송신 대상 → ('ip', port) ("BankN"은 마지막으로 알려진 주소). 해석할 수 없으면 None"""
+        if isinstance(client_socket, str):
+            return self.client_sockets.get(client_socket)
+        try:
+            ip, port = client_socket
+            return str(ip), int(port)
+        except (TypeError, ValueError):
+            return None
+
+    def _send_queued(self, client_socket, data) -> bool:
+        if isinstance(data, (bytes, bytearray)):
+            return self.send_datagram(client_socket, data)
+        return self.send_data(client_socket=client_socket, data=data)
+
+    def _sendto(self, payload: bytes, addr) -> bool:
+        """실제 송신 지점 (비동기 서버는 이벤트 루프로 넘기도록 재정의)"""
+        return self.sock.sendto(payload, addr) == len(payload)
+
+    def send_datagram(self, client_socket, payload: bytes) -> bool:
+        """
+        미리 인코딩된 bytes 데이터그램을 그대로 송신 (PreparedScript 등 대량 송신용).
+        - 문자열 변환/개행 처리/송신 로그 출력을 하지 않습니다.
+        """
+        if self.sock is None:
+            return False
+        addr = client_socket if isinstance(client_socket, tuple) else self.client_sockets.get(client_socket)
+        if addr is None:
+            return False
+        try:
+            ok = self._sendto(payload, addr)
+        except OSError as e:
+            self.signalMessage.emit(self.objectName(), 'data',
+                                    dict(where='TCPServer', msg=f"Error: {str(e)}"))
+            return False
+        for listener in self._tx_listeners:
+            try:
+                listener(addr, payload, ok)
+            except Exception:
+                pass
+        return ok
+
+    def send_chunk_to_clients(self, client_socket, chunk, seq=None) -> bool:
+        """
+        스크립트 청크 송신.
+        - seq가 None이면 기존 형식 "SCRIPT_CHUNK <len> <base64>" (구형 펌웨어)
+        - seq가 있으면 윈도우 전송 형식 "SCRIPT_CHUNK <seq> <len> <base64>"
+        """
         if client_socket is None:
             print("[Error] 클라이언트 주소가 None 입니다.")
             return False
@@ -373,7 +679,10 @@ class TCPServer(QThread):
                 return False
 
         b64 = base64.b64encode(chunk).decode('ascii')
-        line = f"SCRIPT_CHUNK {len(chunk)} {b64}"  # 개행은 send_data가 붙여 줌
+        if seq is None:
+            line = f"SCRIPT_CHUNK {len(chunk)} {b64}"  # 개행은 send_data가 붙여 줌
+        else:
+            line = f"SCRIPT_CHUNK {seq} {len(chunk)} {b64}"
         ok = self.send_data(client_socket=client_socket, data=line)
         if ok:
             print(f"[UDPServer] CHUNK sent (raw {len(chunk)} bytes, b64 {len(b64)} chars)")
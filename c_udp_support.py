@@ -0,0 +1,344 @@
+import heapq
+import os
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import Future
+from typing import Dict, Any
+
+
+class BankRoutingTable:
+    """
+    sysInfo.xml의 <clients><bank ip="..." number="..."> 정보를 메모리에 올려 두고 IP → bank number를 조회합니다.
+    - startCom 시 1회 구축하며, 이후에는 sysInfo.xml의 mtime이 바뀐 경우에만 다시 읽습니다.
+    - mtime 확인(os.stat)도 매 datagram마다 하지 않고 MTIME_CHECK_INTERVAL 주기로만 수행합니다.
+    - 조회 통계(hits/misses/reloads)는 stats()로 확인할 수 있습니다.
+    """
+    MTIME_CHECK_INTERVAL = 1.0
+
+    def __init__(self, sysinfo_path):
+        self.sysinfo_path = sysinfo_path
+        self._by_ip = {}          # { "192.168.0.11": "1", ... }
+        self._mtime = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def load(self) -> bool:
+        """
+        sysInfo.xml을 파싱하여 라우팅 테이블을 새로 구축합니다.
+        - 파싱 실패 시 기존 테이블을 유지하고 False를 반환합니다.
+        """
+        try:
+            mtime = os.stat(self.sysinfo_path).st_mtime_ns
+            root = ET.parse(self.sysinfo_path).getroot()
+        except Exception as e:
+            print(f"Error parsing sysInfo.xml: {e}")
+            return False
+
+        table = {}
+        clients = root.find('clients')
+        if clients is not None:
+            for bank in clients.findall('bank'):
+                ip = bank.get('ip')
+                # 동일 IP가 중복 정의된 경우 기존 동작과 같이 첫 항목을 사용
+                if ip and ip not in table:
+                    table[ip] = bank.get('number')
+
+        with self._lock:
+            if self._mtime is not None:
+                self.reloads += 1
+            self._by_ip = table
+            self._mtime = mtime
+        return True
+
+    def _reload_if_changed(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.MTIME_CHECK_INTERVAL
+        try:
+            mtime = os.stat(self.sysinfo_path).st_mtime_ns
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.load()
+
+    def lookup(self, ip):
+        """주어진 IP의 bank number(str)를 반환. 등록되지 않은 IP면 None."""
+        self._reload_if_changed()
+        with self._lock:
+            number = self._by_ip.get(ip)
+            if number is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return number
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'reloads': self.reloads,
+                    'entries': len(self._by_ip)}
+
+
+class LineReassembler:
+    """
+    Bank 1개의 수신 바이트를 개행 단위 라인으로 재조립하는 버퍼.
+    - bytearray에 datagram을 이어 붙이고, 개행 탐색은 이전에 검사한 위치 이후부터 제자리(in-place)로 수행합니다.
+    - 완성된 라인만 memoryview 구간에서 바로 decode하며, 소비한 앞부분은 COMPACT_AT 바이트 이상 쌓였을 때만
+      한 번에 잘라냅니다(라인마다 남은 버퍼를 복사하지 않음).
+    - 개행 없이 max_line 바이트를 넘긴 데이터는 버리고 overflows를 증가시킵니다(비정상 카드로 인한 메모리 증가 방지).
+    """
+    COMPACT_AT = 4096
+
+    def __init__(self, max_line=8192):
+        self.max_line = max_line
+        self._buf = bytearray()
+        self._start = 0       # 아직 소비하지 않은 데이터의 시작 위치
+        self._scanned = 0     # 개행이 없음을 이미 확인한 위치
+        self._discarding = False
+        self.overflows = 0
+        self.decode_errors = 0
+
+    def __len__(self):
+        return len(self._buf) - self._start
+
+    def feed(self, data) -> list:
+        """datagram을 추가하고 완성된 라인(str, 개행 제외) 목록을 반환"""
+        buf = self._buf
+        buf += data
+        lines = []
+        with memoryview(buf) as view:
+            while True:
+                idx = buf.find(b'\n', max(self._start, self._scanned))
+                if idx == -1:
+                    break
+                if self._discarding:
+                    # 길이 초과로 버리던 라인의 끝: 여기까지 버리고 정상 처리 재개
+                    self._discarding = False
+                else:
+                    line = self._decode(view[self._start:idx])
+                    if line is not None:
+                        lines.append(line)
+                self._start = idx + 1
+            self._scanned = len(buf)
+
+        if len(buf) - self._start > self.max_line:
+            if not self._discarding:
+                self.overflows += 1
+                print(f"[UDP Warning] line exceeds {self.max_line} bytes without newline, discarded")
+            self._discarding = True
+            self._start = self._scanned = len(buf)
+        if self._start >= self.COMPACT_AT or self._start == len(buf):
+            del buf[:self._start]
+            self._scanned -= self._start
+            self._start = 0
+        return lines
+
+    def flush(self) -> str:
+        """개행 없이 남은 데이터를 한 줄로 꺼내고 버퍼를 비움"""
+        with memoryview(self._buf) as view:
+            line = None if self._discarding else self._decode(view[self._start:])
+        self._buf.clear()
+        self._start = self._scanned = 0
+        self._discarding = False
+        return line or ''
+
+    def _decode(self, view):
+        try:
+            return str(view, 'utf-8')
+        except UnicodeDecodeError as e:
+            self.decode_errors += 1
+            print(f"Decode error: {e}")
+            return None
+
+
+class FlushTimerQueue:
+    """
+    Bank별 부분 수신 버퍼 플러시 시각을 deadline 순으로 관리하는 타이머 큐(heap).
+    - schedule(key, deadline)은 key의 deadline을 갱신하며, 이전 항목은 pop 시 무시됩니다(lazy 삭제).
+    - 수신 루프는 next_deadline()까지만 select로 대기하므로 다른 Bank의 트래픽과 무관하게 제때 플러시됩니다.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._deadlines = {}   # key -> 현재 유효한 deadline
+
+    def schedule(self, key, deadline: float):
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, key))
+
+    def cancel(self, key):
+        self._deadlines.pop(key, None)
+
+    def next_deadline(self):
+        while self._heap and self._deadlines.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float):
+        """now 시점까지 만료된 key 목록을 deadline 순으로 반환"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, key = heapq.heappop(self._heap)
+            if self._deadlines.get(key) == deadline:
+                del self._deadlines[key]
+                due.append(key)
+        return due
+
+
+def parse_buffer_size(value):
+    """'4194304' / '512K' / '4M' 형태의 버퍼 크기를 bytes(int)로 변환. 비어 있거나 잘못된 값이면 None."""
+    if value is None:
+        return None
+    text = str(value).strip().upper()
+    if not text:
+        return None
+    scale = 1
+    if text[-1] in ('K', 'M'):
+        scale = 1024 if text[-1] == 'K' else 1024 * 1024
+        text = text[:-1]
+    try:
+        size = int(float(text) * scale)
+    except ValueError:
+        print(f"[UDP Warning] invalid socket buffer size: {value}")
+        return None
+    return size if size > 0 else None
+
+
+def read_udp_drops(sock):
+    """
+    /proc/net/udp에서 sock에 해당하는 항목(inode 기준)의 커널 drop 수와 수신 큐 길이를 읽습니다.
+    - Linux 전용이며, 확인할 수 없으면 None을 반환합니다.
+    """
+    try:
+        inode = str(os.fstat(sock.fileno()).st_ino)
+        with open('/proc/net/udp', 'r') as f:
+            next(f, None)
+            for row in f:
+                fields = row.split()
+                if len(fields) >= 13 and fields[9] == inode:
+                    return {'drops': int(fields[12]), 'rx_queue': int(fields[4].split(':')[1], 16)}
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+# 송신 큐 우선순위 (숫자가 작을수록 먼저 송신)
+TX_PRIORITY_MOTION = 0    # IO 보드 동작 명령 (Pusher front/back, go_init ...)
+TX_PRIORITY_COMMAND = 1   # 일반 명령/데이터 (barcode_info, Script query ...)
+TX_PRIORITY_SCRIPT = 2    # 스크립트 청크 (대량 송신)
+
+
+class TransmitQueue:
+    """
+    UDP 송신 큐 + 단일 송신 스레드.
+    - 호출 스레드(GUI, do_test, slotParse)는 submit()으로 적재만 하고 바로 반환합니다. (결과는 Future/callback)
+    - 우선순위가 높은 항목을 먼저 보내므로, 스크립트 업로드 중에도 'Pusher back' 같은 동작 명령이 뒤로 밀리지 않습니다.
+    - 목적지별 페이싱: 항목의 interval만큼 같은 목적지로의 다음 송신을 늦춥니다. (TX_PRIORITY_MOTION은 페이싱 무시)
+    - 같은 목적지/우선순위 안에서는 적재 순서(FIFO)를 유지합니다.
+    - 목적지는 resolve(addr)로 ('ip', port)로 정규화한 값을 키로 쓰므로, "BankN"과 주소 튜플로 적재한
+      같은 카드는 하나의 목적지로 페이싱/FIFO가 적용됩니다. (해석할 수 없으면 원래 값 그대로 적재)
+    """
+
+    def __init__(self, send_func, name='UdpTxQueue', resolve=None):
+        self._send_func = send_func        # send_func(addr, data) -> bool
+        self._resolve = resolve            # resolve(addr) -> ('ip', port) 또는 None
+        self._name = name
+        self._cond = threading.Condition()
+        self._queues = {p: {} for p in (TX_PRIORITY_MOTION, TX_PRIORITY_COMMAND, TX_PRIORITY_SCRIPT)}
+        self._next_ready = {}              # addr -> 다음 송신 가능 시각 (monotonic)
+        self._pending = 0
+        self._running = True
+        self._thread = None
+        self.sent = {p: 0 for p in self._queues}
+        self.max_wait_ms = {p: 0.0 for p in self._queues}
+
+    def submit(self, addr, data, priority=TX_PRIORITY_COMMAND, interval=0.0, callback=None):
+        """송신 적재. Future(result=송신 성공 여부)를 반환하며, 큐가 중지된 경우 None."""
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(lambda f: callback(f.result()))
+        if self._resolve is not None:
+            addr = self._resolve(addr) or addr
+        with self._cond:
+            if not self._running:
+                return None
+            self._queues[priority].setdefault(addr, deque()).append(
+                (data, interval, future, time.monotonic()))
+            self._pending += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def pending(self) -> int:
+        return self._pending
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            queued = {p: sum(len(q) for q in dests.values()) for p, dests in self._queues.items()}
+        return {'queued': queued, 'sent': dict(self.sent), 'max_wait_ms': dict(self.max_wait_ms)}
+
+    def stop(self):
+        """남은 항목은 False로 완료 처리하고 송신 스레드를 종료"""
+        with self._cond:
+            self._running = False
+            dropped = [item for dests in self._queues.values() for q in dests.values() for item in q]
+            for dests in self._queues.values():
+                dests.clear()
+            self._pending = 0
+            self._cond.notify_all()
+        for _data, _interval, future, _ts in dropped:
+            future.set_result(False)
+
+    def _take_next(self):
+        """송신 가능한 가장 높은 우선순위 항목을 꺼냄. 없으면 (None, 다음 대기 시각)"""
+        now = time.monotonic()
+        wake_at = None
+        for priority, dests in self._queues.items():
+            for addr, q in dests.items():
+                if not q:
+                    continue
+                ready_at = self._next_ready.get(addr, 0.0)
+                if priority == TX_PRIORITY_MOTION or ready_at <= now:
+                    item = q.popleft()
+                    if not q:
+                        del dests[addr]
+                    self._pending -= 1
+                    return (priority, addr) + item, None
+                wake_at = ready_at if wake_at is None else min(wake_at, ready_at)
+        return None, wake_at
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._running:
+                        return
+                    entry, wake_at = self._take_next()
+                    if entry is not None:
+                        break
+                    self._cond.wait(None if wake_at is None else max(0.0, wake_at - time.monotonic()))
+
+            priority, addr, data, interval, future, queued_ts = entry
+            try:
+                ok = bool(self._send_func(addr, data))
+            except Exception as e:
+                print(f"[{self._name}] send error to {addr}: {e}")
+                ok = False
+            now = time.monotonic()
+            if interval:
+                self._next_ready[addr] = now + interval
+            self.sent[priority] += 1
+            wait_ms = (now - queued_ts) * 1000.0
+            if wait_ms > self.max_wait_ms[priority]:
+                self.max_wait_ms[priority] = wait_ms
+            try:
+                future.set_result(ok)
+            except Exception as e:
+                print(f"[{self._name}] callback error: {e}")
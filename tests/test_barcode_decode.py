@@ -0,0 +1,87 @@
+import pytest
+
+import c_barcode_decode
+from c_barcode_decode import DecodePool
+
+
+WIDTH, HEIGHT = 30, 10
+
+
+def fake_decode(pixels, width, height, timeout_ms=None):
+    """워커용 가짜 디코더 (모듈 수준 함수여야 spawn 워커로 pickle됨): 패치의 가장 밝은 값 → 'code<값>'"""
+    value = max(pixels) if pixels else 0
+    return f"code{value}" if value else None
+
+
+def fake_locate(pixels, width, height, timeout_ms=None, max_count=None):
+    return [('code1', 0, 0, 10, 10)]
+
+
+def striped_frame(values):
+    """가로 띠 프레임 (pixels, width, height): 10px 폭 띠마다 values[i] 밝기"""
+    row = b''.join(bytes([value]) * (WIDTH // len(values)) for value in values)
+    return row * HEIGHT, WIDTH, HEIGHT
+
+
+def test_layout_rois_split_long_axis():
+    rois = c_barcode_decode.layout_rois(['Module1', 'Module2', 'Module3'], WIDTH, HEIGHT, overlap=0)
+    assert rois == [('Module1', 0, 0, 10, 10), ('Module2', 10, 0, 20, 10), ('Module3', 20, 0, 30, 10)]
+    assert c_barcode_decode.layout_rois([], WIDTH, HEIGHT) == []
+
+
+def test_extract_patch_clips_to_frame():
+    frame = striped_frame([1, 2, 3])
+    pixels, width, height = c_barcode_decode.extract_patch(frame, 8, -5, 12, 3)
+    assert (width, height) == (4, 3)
+    assert pixels == bytes([1, 1, 2, 2]) * 3
+    assert c_barcode_decode.extract_patch(frame, 40, 0, 50, 5) == (b'', 0, 0)
+
+
+@pytest.fixture
+def fake_pool():
+    pool = DecodePool(workers=2, decode_func=fake_decode, locate_func=fake_locate)
+    yield pool
+    pool.shutdown()
+
+
+def test_submit_decodes_each_roi(fake_pool):
+    frame = striped_frame([1, 2, 3])
+    rois = c_barcode_decode.layout_rois(['Module1', 'Module2', 'Module3'], WIDTH, HEIGHT, overlap=0)
+    result = fake_pool.submit('Left', frame, rois).result(timeout=30)
+    assert result == {'Module1': 'code1', 'Module2': 'code2', 'Module3': 'code3'}
+    stats = fake_pool.last_stats['Left']
+    assert set(stats['patch_ms']) == {'Module1', 'Module2', 'Module3'}
+    assert stats['retried'] == []
+
+
+def test_submit_retries_unread_module_with_wider_roi(fake_pool):
+    frame = striped_frame([1, 0, 3])
+    rois = [('Module1', 0, 0, 10, 10), ('Module2', 12, 0, 18, 10)]
+    retry = {'Module2': ('Module2', 12, 0, 30, 10)}
+    result = fake_pool.submit('Right', frame, rois, retry_rois=retry).result(timeout=30)
+    assert result == {'Module1': 'code1', 'Module2': 'code3'}
+    assert fake_pool.last_stats['Right']['retried'] == ['Module2']
+
+
+def test_submit_without_rois_and_locate(fake_pool):
+    assert fake_pool.submit('Left', striped_frame([1]), []).result(timeout=1) == {}
+    assert fake_pool.locate(striped_frame([1, 2, 3]), max_count=1).result(timeout=30) == [('code1', 0, 0, 10, 10)]
+
+
+def test_submit_after_shutdown_reports_unread():
+    pool = DecodePool(workers=1, decode_func=fake_decode, locate_func=fake_locate)
+    pool.shutdown()
+    rois = [('Module1', 0, 0, 10, 10)]
+    assert pool.submit('Left', striped_frame([1, 2, 3]), rois).result(timeout=1) == {'Module1': None}
+
+
+def test_submit_decodes_synthetic_datamatrix():
+    pylibdmtx = pytest.importorskip('pylibdmtx.pylibdmtx')
+    encoded = pylibdmtx.encode(b'ABC123')
+    frame = (encoded.pixels, encoded.width, encoded.height)
+    pool = DecodePool(workers=1)
+    try:
+        rois = [('Module1', 0, 0, encoded.width, encoded.height)]
+        assert pool.submit('Left', frame, rois).result(timeout=60) == {'Module1': 'ABC123'}
+    finally:
+        pool.shutdown()
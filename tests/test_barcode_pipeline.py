@@ -0,0 +1,159 @@
+import os
+import time
+
+import pytest
+
+import c_barcode_decode
+import c_barcode_pipeline
+from c_barcode_pipeline import BarcodePipeline
+
+
+class FakeMainWindow:
+    """촬영/디코드 hook을 가진 mainWindow 흉내 (프레임 = (pixels, width, height) 튜플)"""
+
+    def __init__(self, texts=None, width=40, height=20):
+        self.modules_Left = {
+            'Module1': [True, None, None, None, None, None],
+            'Module2': [True, None, None, None, None, None],
+            'Module3': [False, None, None, None, None, None],
+        }
+        self.modules_Right = {'Module1': [True, None, None, None, None, None]}
+        self.texts = texts if texts is not None else {'Left': {'Module1': 'L1', 'Module2': 'L2'},
+                                                      'Right': {'Module1': 'R1'}}
+        self.width = width
+        self.height = height
+        self.grabs = []
+        self.decodes = []
+
+    def grab_barcode_frame(self, side):
+        self.grabs.append(side)
+        return bytes(self.width * self.height), self.width, self.height
+
+    def decode_barcode_frame(self, side, frame):
+        self.decodes.append((side,) + c_barcode_decode.frame_size(frame))
+        return dict(self.texts.get(side, {}))
+
+
+def make_pipeline(tmp_path, main_window=None, **kwargs):
+    return BarcodePipeline(main_window or FakeMainWindow(), str(tmp_path / 'archive'), **kwargs)
+
+
+def test_active_needs_grab_and_decoder(tmp_path):
+    assert make_pipeline(tmp_path).active
+    assert not make_pipeline(tmp_path, enabled=False).active
+    assert not make_pipeline(tmp_path, main_window=object()).active
+
+
+def test_capture_decode_apply(tmp_path):
+    main_window = FakeMainWindow()
+    pipeline = make_pipeline(tmp_path, main_window)
+    pipeline.capture('Left')
+    assert pipeline.has_frame('Left') and not pipeline.has_frame('Right')
+
+    results = pipeline.decode('Left', value_order=3)
+    assert results == {'Module1': 'L1', 'Module2': 'L2'}
+    assert main_window.decodes == [('Left', 40, 20)]
+    assert main_window.modules_Left['Module1'][2] == 'L1'
+    assert main_window.modules_Left['Module2'][2] == 'L2'
+    assert main_window.modules_Left['Module3'][2] is None    # 사용하지 않는 모듈은 그대로
+    assert pipeline.last_missing['Left'] == []
+    assert not pipeline.has_frame('Left')
+
+
+def test_missing_module_and_failed_capture_are_scan_failed(tmp_path):
+    main_window = FakeMainWindow(texts={'Left': {'Module1': 'L1'}})
+    pipeline = make_pipeline(tmp_path, main_window)
+    pipeline.capture('Left')
+    pipeline.decode('Left', value_order=6)
+    assert main_window.modules_Left['Module1'][5] == 'L1'
+    assert main_window.modules_Left['Module2'][5] == 'Scan Failed'
+    assert pipeline.last_missing['Left'] == ['Module2']
+
+    pipeline.decode('Right', value_order=3)    # 촬영 없이 디코드
+    assert main_window.modules_Right['Module1'][2] == 'Scan Failed'
+    assert main_window.decodes == [('Left', 40, 20)]
+
+
+def test_capture_raises_when_camera_returns_nothing(tmp_path):
+    main_window = FakeMainWindow()
+    main_window.grab_barcode_frame = lambda side: None
+    pipeline = make_pipeline(tmp_path, main_window)
+    with pytest.raises(RuntimeError):
+        pipeline.capture('Left')
+    assert not pipeline.has_frame('Left')
+
+
+def test_discard_and_reset_drop_frames(tmp_path):
+    pipeline = make_pipeline(tmp_path)
+    pipeline.capture('Left')
+    pipeline.capture('Right')
+    pipeline.discard('Left')
+    assert not pipeline.has_frame('Left') and pipeline.has_frame('Right')
+    pipeline.reset()
+    assert not pipeline.has_frame('Right')
+
+
+def test_decoder_error_marks_modules_failed(tmp_path):
+    main_window = FakeMainWindow()
+
+    def broken(side, frame):
+        raise ValueError('corrupt frame')
+
+    pipeline = make_pipeline(tmp_path, main_window)
+    pipeline.set_decoder(broken)
+    pipeline.capture('Right')
+    assert pipeline.decode('Right', value_order=3) == {}
+    assert main_window.modules_Right['Module1'][2] == 'Scan Failed'
+
+
+def test_archive_writes_results(tmp_path):
+    pipeline = make_pipeline(tmp_path, archive=True, keep=1)
+    for _ in range(2):
+        pipeline.capture('Right')
+        pipeline.decode('Right', value_order=3)
+        time.sleep(0.01)
+    pipeline.stop()
+    names = sorted(os.listdir(tmp_path / 'archive'))
+    assert len([n for n in names if n.endswith('.json')]) == 1
+    assert len([n for n in names if n.endswith('.raw')]) == 1
+
+
+class SourceMainWindow(FakeMainWindow):
+    """grab hook 없이 디코더만 있는 mainWindow (_save_barcode_image가 파일만 저장하는 실제 구성)"""
+    grab_barcode_frame = None
+
+
+def test_saved_image_source_feeds_pipeline(tmp_path):
+    image_module = pytest.importorskip('PIL.Image')
+    path = tmp_path / '{side}.png'
+    source = c_barcode_pipeline.SavedImageSource(str(path))
+    main_window = SourceMainWindow()
+    pipeline = BarcodePipeline(main_window, str(tmp_path / 'archive'), source=source)
+    assert pipeline.active and pipeline.reads_saved_image
+
+    image_module.new('L', (40, 20), 255).save(str(tmp_path / 'Left.png'))
+    pipeline.capture('Left')
+    pipeline.decode('Left', value_order=3)
+    assert main_window.decodes == [('Left', 40, 20)]
+    # 저장이 갱신되지 않은 파일(이전 촬영)은 다시 읽지 않음
+    with pytest.raises(RuntimeError):
+        pipeline.capture('Left')
+
+
+def test_pipeline_from_config_file_mode_stays_on_file_path(tmp_path):
+    pipeline = c_barcode_pipeline.pipeline_from_config(str(tmp_path), lambda base, tag: {'mode': 'file'},
+                                                       SourceMainWindow())
+    assert not pipeline.active and pipeline.decode_pool is None
+
+
+def test_pipeline_from_config_starts_decode_pool_for_saved_images(tmp_path):
+    pytest.importorskip('PIL.Image')
+    pytest.importorskip('pylibdmtx.pylibdmtx')
+    config = {'image': 'shots/{side}.bmp', 'workers': '1'}
+    pipeline = c_barcode_pipeline.pipeline_from_config(str(tmp_path), lambda base, tag: config,
+                                                       SourceMainWindow())
+    try:
+        assert pipeline.reads_saved_image and pipeline.active
+        assert pipeline.decode_pool is not None and pipeline.decode_pool.workers == 1
+    finally:
+        pipeline.stop()
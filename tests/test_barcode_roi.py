@@ -0,0 +1,130 @@
+import json
+from concurrent.futures import Future
+
+from c_barcode_pipeline import BarcodePipeline
+from c_barcode_roi import RoiMap
+
+
+KEYS = ['Module1', 'Module2']
+
+
+def calibrated_map(path=None, width=40, height=20):
+    roi_map = RoiMap(path)
+    detections = [('B', 24, 4, 32, 12), ('A', 4, 4, 12, 12)]
+    assert roi_map.calibrate('Left', KEYS, detections, width, height) == {'Module1': 'A', 'Module2': 'B'}
+    return roi_map
+
+
+def test_calibrate_orders_codes_along_long_axis():
+    roi_map = calibrated_map()
+    # 긴 축(가로) 순서로 모듈에 대응, 코드 크기의 margin(0.5)만큼 여유
+    assert roi_map.rois('Left', KEYS, 40, 20) == [('Module1', 0, 0, 16, 16), ('Module2', 20, 0, 36, 16)]
+    assert roi_map.calibrate('Right', KEYS, [('A', 4, 4, 12, 12)], 40, 20) is None
+    assert not roi_map.has_side('Right')
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / 'roi_map.json')
+    calibrated_map(path).save()
+    assert not (tmp_path / 'roi_map.json.tmp').exists()
+
+    loaded = RoiMap.for_settings(str(tmp_path / 'settings.xml'))
+    assert loaded.path == path and loaded.has_side('Left')
+    assert loaded.rois('Left', KEYS, 40, 20) == [('Module1', 0, 0, 16, 16), ('Module2', 20, 0, 36, 16)]
+
+
+def test_load_rejects_missing_corrupt_and_unknown_version(tmp_path):
+    path = tmp_path / 'roi_map.json'
+    assert not RoiMap(str(path)).load()
+    path.write_text('{not json', encoding='utf-8')
+    assert not RoiMap(str(path)).load()
+    path.write_text(json.dumps({'version': 99, 'sides': {}}), encoding='utf-8')
+    roi_map = RoiMap(str(path))
+    assert not roi_map.load() and not roi_map.has_side('Left')
+
+
+def test_stale_rois_are_not_used():
+    roi_map = calibrated_map()
+    assert roi_map.rois('Left', KEYS, 80, 40) is None                   # 카메라 해상도 변경
+    assert roi_map.rois('Left', KEYS + ['Module3'], 40, 20) is None     # 모델 모듈 구성 변경
+    assert roi_map.rois('Right', KEYS, 40, 20) is None
+
+
+def test_widen_clips_to_frame():
+    assert RoiMap.widen(('Module1', 0, 0, 16, 16), 2.5, 40, 20) == ('Module1', 0, 0, 28, 20)
+
+
+class FakeMainWindow:
+    def __init__(self, width, height):
+        self.size = (width, height)
+        self.modules_Left = {key: [True, None, None] for key in KEYS}
+
+    def grab_barcode_frame(self, side):
+        width, height = self.size
+        return bytes(width * height), width, height
+
+
+class FakeDecodePool:
+    """DecodePool 흉내: submit/locate 호출을 기록하고 바로 완료된 Future 반환"""
+
+    def __init__(self, detections=()):
+        self.detections = list(detections)
+        self.submits = []
+        self.locates = 0
+        self.last_stats = {}
+
+    def submit(self, side, frame, rois, retry_rois=None):
+        self.submits.append((rois, retry_rois))
+        future = Future()
+        future.set_result({roi[0]: f'{side}-{roi[0]}' for roi in rois})
+        return future
+
+    def locate(self, frame, max_count=None):
+        self.locates += 1
+        future = Future()
+        future.set_result(self.detections)
+        return future
+
+    def shutdown(self):
+        pass
+
+
+def make_pipeline(tmp_path, width, height, detections=()):
+    pipeline = BarcodePipeline(FakeMainWindow(width, height), str(tmp_path / 'archive'))
+    pool = FakeDecodePool(detections)
+    pipeline.set_decode_pool(pool)
+    return pipeline, pool
+
+
+def test_pipeline_uses_saved_rois_with_retry(tmp_path):
+    path = str(tmp_path / 'roi_map.json')
+    calibrated_map(path).save()
+    pipeline, pool = make_pipeline(tmp_path, 40, 20)
+    pipeline.load_roi_map(str(tmp_path / 'settings.xml'))
+    pipeline.capture('Left')
+    assert pipeline.decode('Left', value_order=3) == {'Module1': 'Left-Module1', 'Module2': 'Left-Module2'}
+    rois, retry = pool.submits[0]
+    assert rois == [('Module1', 0, 0, 16, 16), ('Module2', 20, 0, 36, 16)]
+    assert set(retry) == set(KEYS) and pool.locates == 0
+
+
+def test_pipeline_recalibrates_stale_map(tmp_path):
+    calibrated_map(str(tmp_path / 'roi_map.json')).save()
+    detections = [('A', 8, 8, 24, 24), ('B', 48, 8, 64, 24)]
+    pipeline, pool = make_pipeline(tmp_path, 80, 40, detections)
+    pipeline.load_roi_map(str(tmp_path / 'settings.xml'))
+    pipeline.capture('Left')
+    assert pipeline.decode('Left', value_order=3) == {'Module1': 'A', 'Module2': 'B'}
+    assert pool.locates == 1 and pool.submits == []
+    reloaded = RoiMap.for_settings(str(tmp_path / 'settings.xml'))
+    assert reloaded.rois('Left', KEYS, 80, 40) == [('Module1', 0, 0, 32, 32), ('Module2', 40, 0, 72, 32)]
+
+
+def test_pipeline_falls_back_to_layout_when_calibration_fails(tmp_path):
+    pipeline, pool = make_pipeline(tmp_path, 40, 20, detections=[('A', 4, 4, 12, 12)])
+    pipeline.load_roi_map(str(tmp_path / 'settings.xml'))
+    pipeline.capture('Left')
+    pipeline.decode('Left', value_order=3)
+    rois, retry = pool.submits[0]
+    assert [roi[0] for roi in rois] == KEYS and retry is None
+    assert not (tmp_path / 'roi_map.json').exists()
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import c_capture
+import c_cycle_trace
+
+
+class FakeCameras:
+    """좌/우 촬영 흉내: shoot(side)가 delay초 동안 멈추고, 촬영 구간(시작/끝)을 side별로 기록"""
+
+    def __init__(self, delay=0.2, fail=None):
+        self.delay = delay
+        self.fail = dict(fail or {})    # side -> 남은 실패 횟수
+        self.spans = {}
+        self.connects = []
+        self.threads = set()
+
+    def shoot(self, side):
+        start = time.perf_counter()
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        if self.fail.get(side):
+            self.fail[side] -= 1
+            raise RuntimeError(f"{side} grab timeout")
+        self.spans[side] = (start, time.perf_counter())
+
+    def connect(self, side):
+        self.connects.append(side)
+
+
+def make_capture(cameras, **kwargs):
+    capture = c_capture.DualCapture(shoot=cameras.shoot, connect=cameras.connect, **kwargs)
+    return capture, {}
+
+
+def test_capture_both_overlaps_sides():
+    cameras = FakeCameras(delay=0.2)
+    capture, clsInfo = make_capture(cameras)
+    capture.attach(clsInfo)
+    try:
+        start = time.perf_counter()
+        capture.capture_both()
+        elapsed = time.perf_counter() - start
+    finally:
+        capture.shutdown()
+    (l0, l1), (r0, r1) = cameras.spans['Left'], cameras.spans['Right']
+    assert l0 < r1 and r0 < l1               # 두 촬영 구간이 겹침
+    assert elapsed < 0.35                    # 합계(0.4초)가 아닌 느린 쪽 기준
+    assert all(name.startswith('capture') for name in cameras.threads)
+    assert clsInfo == {'left_capture_done': True, 'right_capture_done': True}
+    assert capture.first_shot_done == {'Left': True, 'Right': True}
+    assert all(capture.latency_ms[side] >= 190 for side in ('Left', 'Right'))
+    assert cameras.connects == ['Left', 'Right'] or cameras.connects == ['Right', 'Left']
+
+
+def test_capture_both_sequential_when_not_parallel():
+    cameras = FakeCameras(delay=0.05)
+    capture, clsInfo = make_capture(cameras, parallel=False)
+    capture.attach(clsInfo)
+    try:
+        capture.capture_both()
+    finally:
+        capture.shutdown()
+    assert cameras.spans['Left'][1] <= cameras.spans['Right'][0]
+    assert clsInfo['left_capture_done'] and clsInfo['right_capture_done']
+
+
+def test_capture_both_resets_flags_and_retries_failed_side():
+    cameras = FakeCameras(delay=0.01, fail={'Right': 1})
+    capture, clsInfo = make_capture(cameras)
+    capture.attach(clsInfo)
+    capture.connected.update({'Left': True, 'Right': True})
+    try:
+        capture.capture_both()
+    finally:
+        capture.shutdown()
+    assert cameras.connects == ['Right']    # 실패한 쪽만 재연결 후 재촬영
+    assert clsInfo == {'left_capture_done': True, 'right_capture_done': True}
+
+
+def test_capture_records_trace_spans(tmp_path):
+    cameras = FakeCameras(delay=0.01)
+    capture, clsInfo = make_capture(cameras)
+    tracer = c_cycle_trace.CycleTracer(str(tmp_path))
+    tracer.begin('mapping')
+    capture.attach(clsInfo, tracer)
+    try:
+        capture.capture_both()
+    finally:
+        capture.shutdown()
+    names = {event['name'] for event in tracer._sessions['mapping']['events']}
+    assert {'capture Left', 'capture Right'} <= names
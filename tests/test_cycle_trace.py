@@ -0,0 +1,73 @@
+import threading
+import time
+
+import c_cycle_trace
+from c_cycle_trace import CycleTracer
+
+
+def wait_for_writers():
+    for thread in threading.enumerate():
+        if thread.name == 'CycleTraceWriter':
+            thread.join(5)
+
+
+def test_script_load_and_mapping_sessions_are_independent(tmp_path):
+    tracer = CycleTracer(str(tmp_path))
+    tracer.begin('script_load')
+    tracer.begin('mapping')                       # script_load를 닫지 않음
+    assert tracer.is_active('script_load') and tracer.is_active('mapping')
+    tracer.step(1)
+    tracer.inbound('writeCard1', 'Bank1', 'Script save finished')
+    tracer.outbound(('127.0.0.1', 5000), b'Pusher front\n')
+
+    summary = tracer.end('script_load', result='Script all loaded')
+    assert 'result=Script all loaded' in summary and 'incomplete' not in summary
+    assert tracer.end('script_load') is None      # 이미 닫힘
+    assert tracer.is_active('mapping')
+
+    summary = tracer.end('mapping', result='OK')
+    assert '[mapping]' in summary and 'outbound: 1 datagrams' in summary
+    assert not tracer.active
+    wait_for_writers()
+    lines = (tmp_path / 'cycle_times.csv').read_text(encoding='utf-8').splitlines()
+    assert lines[0].startswith('time,') and sorted(line.split(',')[2] for line in lines[1:]) == ['mapping', 'script_load']
+
+
+def test_begin_same_kind_closes_previous_as_incomplete(tmp_path):
+    tracer = CycleTracer(str(tmp_path))
+    tracer.begin('mapping')
+    tracer.step(0)
+    tracer.begin('mapping')
+    wait_for_writers()
+    row = (tmp_path / 'cycle_times.csv').read_text(encoding='utf-8').splitlines()[1].split(',')
+    assert row[2:5:2] == ['mapping', 'incomplete']
+    assert tracer.is_active('mapping')
+    tracer.end('mapping')
+    wait_for_writers()
+
+
+def test_concurrent_end_closes_session_once(tmp_path):
+    tracer = CycleTracer(str(tmp_path))
+    tracer.begin('script_load')
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(tracer.end('script_load'))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wait_for_writers()
+    assert len([r for r in results if r is not None]) == 1
+
+
+def test_disabled_tracer_records_nothing(tmp_path):
+    tracer = CycleTracer(str(tmp_path), enabled=False)
+    tracer.begin('mapping')
+    start = time.perf_counter_ns()
+    tracer.span('capture Left', start, start + 1000)
+    assert not tracer.active and tracer.end('mapping') is None
+
+
+def test_tracer_from_config_defaults_to_off(tmp_path):
+    assert not c_cycle_trace.tracer_from_config(str(tmp_path), lambda base, tag: None).enabled
+    tracer = c_cycle_trace.tracer_from_config(str(tmp_path), lambda base, tag: {'enabled': '1', 'dir': 'out'})
+    assert tracer.enabled and tracer.out_dir == str(tmp_path / 'out')
@@ -0,0 +1,161 @@
+from concurrent.futures import Future
+
+import pytest
+
+from c_barcode_pipeline import BarcodePipeline
+from c_frame_pool import FramePool
+
+
+def nbytes(buf):
+    """풀 버퍼 크기 (numpy 배열 또는 bytearray)"""
+    return buf.nbytes if hasattr(buf, 'nbytes') else len(buf)
+
+
+def test_acquire_release_reuses_buffers():
+    pool = FramePool(slots=2, shape=(4, 6))
+    first = pool.acquire()
+    second = pool.acquire()
+    assert first is not second and nbytes(first) == 24
+    assert pool.stats()['in_use'] == 2
+    pool.release(first)
+    pool.release(first)                   # 중복 반환은 무시
+    assert pool.acquire() is first
+    assert pool.stats() == {'slots': 2, 'in_use': 2, 'peak': 2, 'acquired': 3, 'fallback': 0, 'shape': (4, 6)}
+
+
+def test_exhausted_pool_allocates_temporary_buffer():
+    pool = FramePool(slots=1, shape=(2, 2))
+    pooled = pool.acquire()
+    extra = pool.acquire()
+    assert extra is not pooled and pool.stats()['fallback'] == 1
+    pool.release(extra)                   # 풀 밖 버퍼는 버림
+    assert pool.stats()['in_use'] == 1
+
+
+def test_reconfigure_drops_old_size_buffers():
+    pool = FramePool(slots=1, shape=(2, 2))
+    old = pool.acquire()
+    fresh = pool.acquire((3, 3))
+    assert nbytes(fresh) == 9
+    pool.release(old)
+    assert pool.stats()['in_use'] == 1 and pool.acquire() is not old
+
+
+def test_acquire_without_shape_raises():
+    with pytest.raises(ValueError):
+        FramePool(slots=1).acquire()
+
+
+def test_shape_of_frames():
+    assert FramePool.shape_of((bytes(12), 4, 3)) == (3, 4)
+    assert FramePool.shape_of((bytes(36), 4, 3)) == (3, 4, 3)
+    assert FramePool.shape_of(object()) is None
+
+
+WIDTH, HEIGHT = 4, 3
+
+
+class FakeMainWindow:
+    """풀 버퍼에 직접 촬영하는 mainWindow 흉내"""
+
+    def __init__(self):
+        self.modules_Left = {'Module1': [True, None, None]}
+        self.size = (WIDTH, HEIGHT)
+        self.buffers = []
+
+    def grab_barcode_frame(self, side):
+        width, height = self.size
+        return bytes(width * height), width, height
+
+    def grab_barcode_frame_into(self, side, out):
+        width, height = self.size
+        if nbytes(out) != width * height:
+            return self.grab_barcode_frame(side)
+        self.buffers.append(out)
+        if hasattr(out, 'shape'):
+            out.fill(7)
+            return out
+        out[:] = bytes([7]) * len(out)
+        return out, width, height
+
+
+class PendingDecodePool:
+    """디코드가 끝나지 않은 Future를 돌려주는 DecodePool 흉내"""
+
+    def __init__(self):
+        self.futures = []
+        self.last_stats = {}
+
+    def submit(self, side, frame, rois, retry_rois=None):
+        future = Future()
+        self.futures.append(future)
+        return future
+
+    def shutdown(self):
+        pass
+
+
+def make_pipeline(tmp_path, slots=2):
+    main_window = FakeMainWindow()
+    pipeline = BarcodePipeline(main_window, str(tmp_path / 'archive'))
+    pipeline.set_frame_pool(FramePool(slots, (HEIGHT, WIDTH)))
+    pipeline.set_decode_pool(PendingDecodePool())
+    return pipeline, main_window
+
+
+def test_capture_uses_pool_buffer_and_decode_returns_it(tmp_path):
+    pipeline, main_window = make_pipeline(tmp_path)
+    pipeline.capture('Left')
+    assert pipeline.frame_pool.stats()['in_use'] == 1
+    pipeline.decode_pool.futures[0].set_result({'Module1': 'L1'})
+    assert pipeline.decode('Left', value_order=2) == {'Module1': 'L1'}
+    assert pipeline.frame_pool.stats()['in_use'] == 0
+    pipeline.capture('Left')
+    assert main_window.buffers[1] is main_window.buffers[0]      # 같은 버퍼 재사용
+    assert pipeline.frame_pool.stats()['fallback'] == 0
+
+
+def test_recapture_cancels_pending_decode_and_reuses_buffer(tmp_path):
+    pipeline, main_window = make_pipeline(tmp_path, slots=1)
+    pipeline.capture('Left')
+    pipeline.capture('Left')              # 같은 side 재촬영: 이전 디코드 취소 + 버퍼 반환
+    assert pipeline.decode_pool.futures[0].cancelled()
+    assert pipeline.frame_pool.stats()['fallback'] == 1          # 재촬영 시점엔 첫 버퍼가 아직 사용 중
+    pipeline.discard('Left')
+    assert pipeline.decode_pool.futures[1].cancelled()
+    assert pipeline.frame_pool.stats()['in_use'] == 0
+    pipeline.capture('Left')
+    assert main_window.buffers[-1] is main_window.buffers[0]
+
+
+def test_running_decode_keeps_buffer_until_done(tmp_path):
+    pipeline, _ = make_pipeline(tmp_path)
+    pipeline.capture('Left')
+    running = pipeline.decode_pool.futures[0]
+    running.set_running_or_notify_cancel()
+    pipeline.reset()                      # 실행 중인 디코드는 취소되지 않음 → 끝난 뒤 반환
+    assert pipeline.frame_pool.stats()['in_use'] == 1
+    running.set_result({})
+    assert pipeline.frame_pool.stats()['in_use'] == 0
+
+
+def test_frame_size_change_reconfigures_pool(tmp_path):
+    pipeline, main_window = make_pipeline(tmp_path)
+    main_window.size = (6, 5)
+    pipeline.capture('Left')              # 이전 크기 버퍼에 담기지 않은 프레임 → 풀 재설정
+    assert pipeline.frame_pool.shape == (5, 6)
+    assert pipeline.frame_pool.stats()['in_use'] == 0
+    pipeline.capture('Left')
+    assert nbytes(main_window.buffers[-1]) == 30
+
+
+def test_saved_image_source_reads_into_pool_buffer(tmp_path):
+    image_module = pytest.importorskip('PIL.Image')
+    import c_barcode_pipeline
+    source = c_barcode_pipeline.SavedImageSource(str(tmp_path / '{side}.png'))
+    pool = FramePool(slots=1, shape=(HEIGHT, WIDTH))
+    buffer = pool.acquire()
+    image_module.new('L', (WIDTH, HEIGHT), 9).save(str(tmp_path / 'Left.png'))
+    frame = source.grab_into('Left', buffer)
+    assert (frame is buffer) or (frame[0] is buffer)
+    assert FramePool.shape_of(frame) == (HEIGHT, WIDTH)
@@ -0,0 +1,58 @@
+import pytest
+
+from c_message_dispatch import MessageDispatcher
+
+
+def make_dispatcher():
+    calls = []
+    dispatcher = MessageDispatcher()
+
+    def handler(tag):
+        return lambda values, msg: calls.append((tag, values, msg))
+
+    dispatcher.register('writeCard', 'Mapping start', handler('exact'))
+    dispatcher.register('writeCard', 'Script save', handler('short'), prefix=True)
+    dispatcher.register('writeCard', 'Script save finished', handler('long'), prefix=True)
+    dispatcher.register(['writeCard', 'ioBoard'], 'Pusher', handler('shared'), prefix=True, name='pusher')
+    return dispatcher, calls
+
+
+def test_exact_match_beats_prefix_and_longest_prefix_wins():
+    dispatcher, calls = make_dispatcher()
+    dispatcher.register('writeCard', 'Mapping', lambda values, msg: calls.append(('prefix', values, msg)),
+                        prefix=True)
+    assert dispatcher.dispatch('writeCard', 'Mapping start', 1)
+    assert dispatcher.dispatch('writeCard', 'Mapping end', 2)
+    assert dispatcher.dispatch('writeCard', 'Script save finished: MCU 1', 3)
+    assert dispatcher.dispatch('writeCard', 'Script save error', 4)
+    assert [c[0] for c in calls] == ['exact', 'prefix', 'long', 'short']
+    assert calls[2] == ('long', 3, 'Script save finished: MCU 1')
+
+
+def test_sources_are_separate_and_unknown_messages_are_not_dispatched():
+    dispatcher, calls = make_dispatcher()
+    assert dispatcher.dispatch('ioBoard', 'Pusher front done', None)
+    assert not dispatcher.dispatch('ioBoard', 'Mapping start', None)     # writeCard 전용
+    assert not dispatcher.dispatch('writeCard', 'Unknown', None)
+    assert not dispatcher.dispatch('camera', 'Pusher', None)
+    assert dispatcher.lookup('writeCard', 'Scrip') is None
+    assert [c[0] for c in calls] == ['shared']
+
+
+def test_stats_count_by_name_even_when_handler_raises():
+    dispatcher, _ = make_dispatcher()
+
+    def broken(values, msg):
+        raise ValueError(msg)
+
+    dispatcher.register('ioBoard', 'Error', broken)
+    dispatcher.dispatch('writeCard', 'Pusher back done', None)
+    dispatcher.dispatch('ioBoard', 'Pusher front done', None)
+    with pytest.raises(ValueError):
+        dispatcher.dispatch('ioBoard', 'Error', None)
+    stats = dispatcher.stats()
+    assert stats['pusher']['count'] == 2 and stats['Error']['count'] == 1
+    assert stats['pusher']['max_ms'] >= stats['pusher']['avg_ms'] >= 0.0
+    assert dispatcher.format_stats().splitlines()[1].startswith('pusher')
+    dispatcher.reset_stats()
+    assert dispatcher.stats() == {}
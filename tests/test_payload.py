@@ -0,0 +1,80 @@
+import pytest
+
+import c_payload
+from c_payload import parse_message, parse_structured
+
+EXPECTED = {'Module1': 'abc', 'Module2': None}
+
+
+@pytest.mark.parametrize('text', [
+    '{"Module1": "abc", "Module2": null}',
+    "{'Module1': 'abc', 'Module2': None}",
+    "OrderedDict([('Module1', 'abc'), ('Module2', None)])",
+    "OrderedDict({'Module1': 'abc', 'Module2': None})",
+    'Module1=abc;Module2=',
+    '  {"Module1": "abc", "Module2": null}  ',
+])
+def test_formats(text):
+    assert parse_structured(text) == EXPECTED
+
+
+def test_scalar_types_and_escapes():
+    assert parse_structured("{'a': 1, 'b': -2.5, 'c': True, 'd': 'it\\'s', \"e\": \"x\"}") == \
+        {'a': 1, 'b': -2.5, 'c': True, 'd': "it's", 'e': 'x'}
+
+
+def test_repr_string_escapes_without_ast():
+    text = repr({'a': 'line\nbreak', 'b': 'tab\tx\\y', 'c': '\x07', 'd': '한글\u200b', 'e': "q'\"q"})
+    assert parse_structured(text) == {'a': 'line\nbreak', 'b': 'tab\tx\\y', 'c': '\x07',
+                                      'd': '한글\u200b', 'e': "q'\"q"}
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Output1=ABC;Module2=DEF', {'Output1': 'ABC', 'Module2': 'DEF'}),
+    ('OK=1', {'OK': '1'}),
+    ('Order=a=b', {'Order': 'a=b'}),
+])
+def test_kv_keys_starting_with_o(text, expected):
+    # repr 형식과는 'OrderedDict(' 접두어로만 구분
+    assert parse_structured(text) == expected
+
+
+def test_ordered_dict_with_equals_in_value_is_not_kv():
+    assert parse_structured("OrderedDict([('Module1', 'a=b')])") == {'Module1': 'a=b'}
+
+
+def test_nested_values_are_rejected():
+    with pytest.raises(ValueError):
+        parse_structured("{'Module1': ('abc', 1)}")
+
+
+def test_empty_payloads():
+    assert parse_structured('{}') == {}
+    assert parse_structured('OrderedDict()') == {}
+    assert parse_structured('') == {}
+
+
+@pytest.mark.parametrize('text', [
+    '{"a": 1} trailing',
+    '{"a": 1}{"b": 2}',
+    "{'a': 'b'} junk",
+    "{'a': 'b'",
+    '{"a": 1',
+    '[1, 2, 3]',
+    'garbage',
+])
+def test_rejects_malformed_or_trailing_data(text):
+    with pytest.raises(ValueError):
+        parse_structured(text)
+
+
+def test_parse_message_strips_prefix():
+    assert parse_message('sensor_ID: {"Module1": "abc", "Module2": null}', 'sensor_ID') == EXPECTED
+    assert parse_message("barcode_info:OrderedDict([('Module1', 'abc'), ('Module2', None)])",
+                         'barcode_info') == EXPECTED
+
+
+def test_encode_json_round_trip():
+    msg = c_payload.encode_json('barcode_info', {'Module1': '한글', 'Module2': None})
+    assert msg == 'barcode_info: {"Module1":"한글","Module2":null}'
+    assert parse_message(msg, 'barcode_info') == {'Module1': '한글', 'Module2': None}
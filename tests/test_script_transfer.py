@@ -0,0 +1,236 @@
+import base64
+import hashlib
+import random
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+import c_script_transfer
+import c_udp_frame
+from c_script_transfer import WindowedScriptSender
+
+
+class FakeCard:
+    """
+    수신 측 Write Card 흉내: 받은 청크를 모아 누적 ACK를 바로 돌려줌 (send_chunk 호출 스레드에서 동기 처리).
+    - drop(seq, attempt) 가 True이면 그 송신을 버림 (손실 링크)
+    - nack_gaps=True이면 순서가 건너뛴 청크를 받았을 때 빠진 seq마다 NACK 1회
+    """
+
+    def __init__(self, drop=None, nack_gaps=False, ack=True):
+        self.sender = None
+        self.drop = drop or (lambda seq, attempt: False)
+        self.nack_gaps = nack_gaps
+        self.ack = ack
+        self.received = set()
+        self.expected = 0
+        self.sent = []
+        self.nacked = set()
+
+    def send_chunk(self, seq):
+        attempt = self.sent.count(seq)
+        self.sent.append(seq)
+        if self.drop(seq, attempt):
+            return True
+        self.received.add(seq)
+        if self.nack_gaps:
+            for missing in range(self.expected, seq):
+                if missing not in self.received and missing not in self.nacked:
+                    self.nacked.add(missing)
+                    self.sender.on_nack(missing)
+        while self.expected in self.received:
+            self.expected += 1
+        if self.ack:
+            self.sender.on_ack(self.expected)
+        return True
+
+
+def make_sender(card, total, **kwargs):
+    sender = WindowedScriptSender('Bank1', total, card.send_chunk, **kwargs)
+    card.sender = sender
+    return sender
+
+
+def test_lossless_transfer_sends_each_chunk_once():
+    card = FakeCard()
+    sender = make_sender(card, 50, window=8)
+    assert sender.run(timeout=2.0)
+    assert card.received == set(range(50))
+    assert sorted(card.sent) == list(range(50))
+    assert sender.retransmits == 0
+
+
+def test_lossy_link_recovers_every_chunk():
+    rng = random.Random(7)
+    card = FakeCard(drop=lambda seq, attempt: rng.random() < 0.2)
+    sender = make_sender(card, 200, window=8, rto=0.01, max_retries=50)
+    assert sender.run(timeout=10.0)
+    assert card.received == set(range(200))
+    assert sender.retransmits > 0
+    assert len(card.sent) == 200 + sender.retransmits
+
+
+def test_nack_resends_only_the_requested_chunk_before_rto():
+    # seq 3의 첫 송신만 손실 → 카드가 seq 4를 받으면서 NACK 3. RTO(10초)를 기다리지 않고 3만 다시 보냄
+    card = FakeCard(drop=lambda seq, attempt: seq == 3 and attempt == 0, nack_gaps=True)
+    sender = make_sender(card, 10, window=4, rto=10.0)
+    start = time.monotonic()
+    assert sender.run(timeout=5.0)
+    assert time.monotonic() - start < 1.0
+    assert card.sent.count(3) == 2
+    assert all(card.sent.count(seq) == 1 for seq in range(10) if seq != 3)
+    assert sender.retransmits == 1
+
+
+def test_window_limits_unacked_chunks_in_flight():
+    card = FakeCard(ack=False)
+    sender = make_sender(card, 20, window=5, rto=10.0)
+    assert not sender.run(timeout=0.05)
+    assert card.sent == [0, 1, 2, 3, 4]
+
+
+def test_timeout_without_acks_returns_false():
+    card = FakeCard(ack=False)
+    sender = make_sender(card, 4, rto=0.01, max_retries=1000)
+    start = time.monotonic()
+    assert not sender.run(timeout=0.1)
+    assert time.monotonic() - start < 1.0
+
+
+def test_retry_limit_stops_transfer():
+    card = FakeCard(ack=False)
+    sender = make_sender(card, 4, window=4, rto=0.005, max_retries=2)
+    assert not sender.run(timeout=5.0)
+    assert sender.retransmits == 2
+    assert card.sent.count(0) == 3
+
+
+def test_send_failure_stops_transfer():
+    sender = WindowedScriptSender('Bank1', 4, lambda seq: False)
+    assert not sender.run(timeout=1.0)
+
+
+def test_queued_send_starts_rto_when_datagram_leaves():
+    # 송신 큐 흉내(단일 송신 스레드, 데이터그램당 30ms): RTO(10ms)를 큐 적재 시점부터 재면 불필요한 재전송이 생김
+    card = FakeCard()
+
+    def slow_send(seq):
+        time.sleep(0.03)
+        return card.send_chunk(seq)
+
+    with ThreadPoolExecutor(max_workers=1) as queue:
+        sender = WindowedScriptSender('Bank1', 8, lambda seq: queue.submit(slow_send, seq), window=4, rto=0.01)
+        card.sender = sender
+        assert sender.run(timeout=5.0)
+    assert sorted(card.sent) == list(range(8))
+    assert sender.retransmits == 0
+
+
+def test_queued_send_failure_stops_transfer():
+    failed = Future()
+    failed.set_result(False)          # 송신 큐가 중지되며 False로 완료
+    sender = WindowedScriptSender('Bank1', 4, lambda seq: failed)
+    assert not sender.run(timeout=1.0)
+
+    pending = Future()                # 끝내 송신되지 않음 → 전송 timeout까지만 대기
+    sender = WindowedScriptSender('Bank1', 4, lambda seq: pending)
+    start = time.monotonic()
+    assert not sender.run(timeout=0.1)
+    assert time.monotonic() - start < 1.0
+
+
+def test_abort_from_another_thread():
+    card = FakeCard(ack=False)
+    sender = make_sender(card, 4, rto=10.0)
+    threading.Timer(0.05, sender.abort).start()
+    start = time.monotonic()
+    assert not sender.run(timeout=5.0)
+    assert time.monotonic() - start < 1.0
+
+
+def test_progress_reports_acked_count():
+    card = FakeCard()
+    progress = []
+    sender = make_sender(card, 16, window=4, on_progress=lambda acked, total: progress.append((acked, total)))
+    assert sender.run(timeout=2.0)
+    assert progress[0] == (0, 16)
+    assert all(total == 16 for _, total in progress)
+    assert [acked for acked, _ in progress] == sorted(acked for acked, _ in progress)
+
+
+def test_parse_ack():
+    assert c_script_transfer.parse_ack('SCRIPT_ACK 12') == ('ack', 12)
+    assert c_script_transfer.parse_ack('SCRIPT_NACK 3,') == ('nack', 3)
+    assert c_script_transfer.parse_ack('SCRIPT_ACK x') is None
+    assert c_script_transfer.parse_ack('SCRIPT_ACK') is None
+    assert c_script_transfer.parse_ack('Script save finished: MCU 1') is None
+
+
+def _decode_legacy(datagrams):
+    out = b''
+    for datagram in datagrams:
+        tag, size, b64 = datagram.rstrip(b'\n').split(b' ')
+        assert tag == b'SCRIPT_CHUNK'
+        chunk = base64.b64decode(b64)
+        assert len(chunk) == int(size)
+        out += chunk
+    return out
+
+
+def test_prepared_script_chunks_round_trip():
+    data = bytes(range(256)) * 10
+    prepared = c_script_transfer.PreparedScript('s.txt', data, 300)
+    assert len(prepared) == 9
+    assert _decode_legacy(prepared.legacy_datagrams) == data
+    assert prepared.digest == hashlib.sha256(data).hexdigest()
+
+
+def test_seq_datagrams_are_numbered_and_built_once():
+    prepared = c_script_transfer.PreparedScript('s.txt', b'abcdefghij', 4)
+    seq = prepared.seq_datagrams
+    assert seq is prepared.seq_datagrams
+    fields = [d.rstrip(b'\n').split(b' ') for d in seq]
+    assert [f[1] for f in fields] == [b'0', b'1', b'2']
+    assert b''.join(base64.b64decode(f[3]) for f in fields) == b'abcdefghij'
+
+
+def test_is_current_tracks_file_changes(tmp_path):
+    path = tmp_path / 'script.txt'
+    path.write_bytes(b'line 1\n')
+    prepared = c_script_transfer.PreparedScript.load(str(path), 64)
+    assert prepared.is_current(str(path), 64)
+    assert not prepared.is_current(str(path), 128)
+    path.write_bytes(b'line 1\nline 2\n')
+    assert not prepared.is_current(str(path), 64)
+
+
+def test_deflated_script_inflates_to_original_and_keeps_digest():
+    data = b'SET_PIN 1 HIGH\nWAIT 10\n' * 200
+    prepared = c_script_transfer.PreparedScript('s.txt', data, 256)
+    deflated = prepared.deflated()
+    assert deflated is prepared.deflated()
+    assert deflated.encoding == 'deflate'
+    assert deflated.wire_size < prepared.wire_size
+    assert deflated.raw_size == len(data)
+    assert deflated.digest == prepared.digest
+    assert zlib.decompress(_decode_legacy(deflated.legacy_datagrams)) == data
+
+
+def test_frame_datagrams_carry_raw_chunks_per_bank():
+    data = bytes(range(256)) * 3
+    prepared = c_script_transfer.PreparedScript('s.txt', data, 100)
+    frames = [next(c_udp_frame.iter_frames(d)) for d in prepared.frame_datagrams(2)]
+    assert [f.seq for f in frames] == list(range(len(prepared)))
+    assert {f.bank for f in frames} == {2}
+    assert {f.msg_type for f in frames} == {c_udp_frame.MSG_SCRIPT_CHUNK}
+    assert b''.join(bytes(f.payload) for f in frames) == data
+    assert prepared.frame_datagrams(2) is prepared.frame_datagrams(2)
+
+
+def test_frame_datagrams_refuse_more_chunks_than_seq_can_number():
+    prepared = c_script_transfer.PreparedScript('s.txt', bytes(c_udp_frame.MAX_PAYLOAD + 2), 1)
+    with pytest.raises(c_udp_frame.FrameError):
+        prepared.frame_datagrams(1)
@@ -0,0 +1,94 @@
+import pytest
+
+import c_udp_frame as F
+
+
+def test_encode_and_iterate_single_frame():
+    data = F.encode(F.MSG_SCRIPT_CHUNK, b'payload', bank=3, seq=513, flags=1)
+    assert F.is_frame(data)
+    assert len(data) == F.HEADER_SIZE + 7
+    (frame,) = list(F.iter_frames(data))
+    assert (frame.msg_type, frame.bank, frame.seq, frame.flags) == (F.MSG_SCRIPT_CHUNK, 3, 513, 1)
+    assert bytes(frame.payload) == b'payload'
+
+
+def test_multiple_frames_per_datagram():
+    data = F.encode_text('Mapping start', bank=5) + F.encode(F.MSG_SCRIPT_ACK, seq=7) + F.encode(F.MSG_TEXT)
+    frames = list(F.iter_frames(data))
+    assert [f.msg_type for f in frames] == [F.MSG_TEXT, F.MSG_SCRIPT_ACK, F.MSG_TEXT]
+    assert bytes(frames[0].payload) == b'Mapping start'
+    assert frames[1].seq == 7
+    assert bytes(frames[2].payload) == b''
+
+
+def test_text_is_not_a_frame():
+    assert not F.is_frame(b'Script save finished: MCU 1\n')
+    assert not F.is_frame(F.MAGIC_BYTES)   # 헤더보다 짧음
+
+
+def test_truncated_header():
+    data = F.encode_text('ok') + F.encode_text('next')[:F.HEADER_SIZE - 1]
+    frames = F.iter_frames(data)
+    assert bytes(next(frames).payload) == b'ok'   # 오류 전까지의 프레임은 반환
+    with pytest.raises(F.FrameError, match='truncated header'):
+        next(frames)
+
+
+def test_truncated_payload():
+    with pytest.raises(F.FrameError, match='truncated payload'):
+        list(F.iter_frames(F.encode_text('Pusher down finished')[:-3]))
+
+
+def test_bad_magic_and_version():
+    data = bytearray(F.encode_text('x'))
+    data[0] ^= 0xFF
+    with pytest.raises(F.FrameError, match='bad magic'):
+        list(F.iter_frames(bytes(data)))
+    data = bytearray(F.encode_text('x'))
+    data[2] = F.VERSION + 1
+    with pytest.raises(F.FrameError, match='unsupported version'):
+        list(F.iter_frames(bytes(data)))
+
+
+def test_payload_too_large():
+    with pytest.raises(F.FrameError):
+        F.encode(F.MSG_TEXT, bytes(F.MAX_PAYLOAD + 1))
+
+
+def _message(data):
+    (frame,) = list(F.iter_frames(data))
+    return F.to_message(frame)
+
+
+def test_to_message_text_and_events():
+    assert _message(F.encode_text('Scan Stop')) == ('Scan Stop', None)
+    event = F.EVENT_IDS['Script save finished']
+    assert _message(F.encode(F.MSG_EVENT, bytes([event]) + b'MCU 2')) == ('Script save finished: MCU 2', None)
+    assert _message(F.encode(F.MSG_EVENT, bytes([F.EVENT_IDS['Mapping start']]))) == ('Mapping start', None)
+
+
+def test_to_message_rejects_bad_events():
+    with pytest.raises(F.FrameError, match='empty event'):
+        _message(F.encode(F.MSG_EVENT))
+    with pytest.raises(F.FrameError, match='unknown event'):
+        _message(F.encode(F.MSG_EVENT, b'\xfe'))
+
+
+def test_to_message_json_payloads():
+    sensor = {'Module1': 'ID1', 'Module2': None}
+    assert _message(F.encode_json(F.MSG_SENSOR_ID, sensor, bank=1)) == ('sensor_ID', sensor)
+    assert _message(F.encode_json(F.MSG_BARCODE_INFO, {'Module1': '한글'})) == ('barcode_info', {'Module1': '한글'})
+    with pytest.raises(F.FrameError, match='not an object'):
+        _message(F.encode_json(F.MSG_SENSOR_ID, ['ID1']))
+    with pytest.raises(F.FrameError, match='bad sensor_ID'):
+        _message(F.encode(F.MSG_SENSOR_ID, b'{"Module1": '))
+
+
+def test_to_message_rejects_transport_frames():
+    with pytest.raises(F.FrameError, match='unhandled'):
+        _message(F.encode(F.MSG_SCRIPT_ACK, seq=3))
+
+
+def test_describe():
+    assert F.describe(F.encode(F.MSG_SCRIPT_CHUNK, b'1234', seq=9)) == 'FRAME SCRIPT_CHUNK #9 4B'
+    assert F.describe(b'\xb5') == 'FRAME ?'
@@ -0,0 +1,228 @@
+import threading
+import time
+
+from c_udp_support import (BankRoutingTable, FlushTimerQueue, LineReassembler, TransmitQueue,
+                           TX_PRIORITY_MOTION, TX_PRIORITY_COMMAND, TX_PRIORITY_SCRIPT)
+
+
+def test_flush_timers_pop_due_in_deadline_order():
+    timers = FlushTimerQueue()
+    timers.schedule('Bank2', 2.0)
+    timers.schedule('Bank1', 1.0)
+    timers.schedule('Bank3', 3.0)
+    assert timers.next_deadline() == 1.0
+    assert timers.pop_due(2.5) == ['Bank1', 'Bank2']
+    assert timers.next_deadline() == 3.0
+    assert timers.pop_due(2.9) == []
+
+
+def test_flush_timers_reschedule_replaces_old_deadline():
+    timers = FlushTimerQueue()
+    timers.schedule('Bank1', 1.0)
+    timers.schedule('Bank1', 5.0)          # 새 datagram 수신 → deadline 연장
+    assert timers.next_deadline() == 5.0   # 이전 항목은 lazy 삭제
+    assert timers.pop_due(4.0) == []
+    assert timers.pop_due(5.0) == ['Bank1']
+    assert timers.pop_due(10.0) == []      # 한 번만 만료
+
+
+def test_flush_timers_cancel():
+    timers = FlushTimerQueue()
+    timers.schedule('Bank1', 1.0)
+    timers.schedule('Bank2', 2.0)
+    timers.cancel('Bank1')
+    timers.cancel('Bank9')                 # 없는 key는 무시
+    assert timers.next_deadline() == 2.0
+    assert timers.pop_due(3.0) == ['Bank2']
+    assert timers.next_deadline() is None
+
+
+def test_reassembler_splits_lines_across_datagrams():
+    buf = LineReassembler()
+    assert buf.feed(b'Mapping st') == []
+    assert buf.feed(b'art\nScript save finished: MCU 1\nNG') == ['Mapping start', 'Script save finished: MCU 1']
+    assert len(buf) == 2
+    assert buf.feed(b'\n\n') == ['NG', '']
+    assert len(buf) == 0
+
+
+def test_reassembler_flush_returns_partial_line():
+    buf = LineReassembler()
+    buf.feed(b'line1\npartial')
+    assert buf.flush() == 'partial'
+    assert len(buf) == 0 and buf.flush() == ''
+
+
+def test_reassembler_decodes_multibyte_split_between_datagrams():
+    data = '바코드 완료\n'.encode('utf-8')
+    buf = LineReassembler()
+    assert buf.feed(data[:4]) == []
+    assert buf.feed(data[4:]) == ['바코드 완료']
+    assert buf.decode_errors == 0
+
+
+def test_reassembler_skips_undecodable_line():
+    buf = LineReassembler()
+    assert buf.feed(b'\xff\xfe\nok\n') == ['ok']
+    assert buf.decode_errors == 1
+
+
+def test_reassembler_discards_overlong_line_until_newline():
+    buf = LineReassembler(max_line=8)
+    assert buf.feed(b'0123456789') == []
+    assert buf.overflows == 1 and len(buf) == 0
+    assert buf.feed(b'still-too-long') == []              # 같은 라인의 나머지도 버림
+    assert buf.overflows == 1
+    assert buf.feed(b'tail\nnext\n') == ['next']          # 개행 이후 정상 처리 재개
+    assert buf.flush() == ''
+
+
+def test_reassembler_compacts_consumed_bytes():
+    buf = LineReassembler(max_line=LineReassembler.COMPACT_AT * 2)
+    line = b'x' * 99 + b'\n'
+    lines = []
+    for _ in range(LineReassembler.COMPACT_AT // len(line) + 2):
+        lines += buf.feed(line + b'part')
+        lines += buf.feed(b'ial\n')
+    assert len(lines) == 2 * (LineReassembler.COMPACT_AT // len(line) + 2)
+    assert set(lines) == {'x' * 99, 'partial'}
+    assert len(buf._buf) < LineReassembler.COMPACT_AT + len(line) + 8
+
+
+class FakeSender:
+    """TransmitQueue send_func 흉내: (addr, data, 시각) 기록, gate가 열릴 때까지 첫 송신에서 대기"""
+
+    def __init__(self, result=True):
+        self.result = result
+        self.sent = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+
+    def block(self):
+        self.gate.clear()
+        self.entered.clear()
+
+    def __call__(self, addr, data):
+        self.entered.set()
+        self.gate.wait(5)
+        self.sent.append((addr, data, time.monotonic()))
+        return self.result
+
+
+def test_transmit_queue_sends_higher_priority_first_and_fifo_per_destination():
+    sender = FakeSender()
+    queue = TransmitQueue(sender)
+    sender.block()
+    first = queue.submit('Bank1', 'busy')             # 송신 스레드를 붙잡아 두고 나머지를 적재
+    assert sender.entered.wait(5)
+    futures = [queue.submit('Bank1', f'chunk{i}', priority=TX_PRIORITY_SCRIPT) for i in range(3)]
+    futures.append(queue.submit('Bank5', 'barcode_info', priority=TX_PRIORITY_COMMAND))
+    futures.append(queue.submit('Bank5', 'Pusher back', priority=TX_PRIORITY_MOTION))
+    assert queue.pending() == 5
+    sender.gate.set()
+    assert first.result(5) and all(f.result(5) for f in futures)
+    assert [data for _, data, _ in sender.sent] == ['busy', 'Pusher back', 'barcode_info',
+                                                     'chunk0', 'chunk1', 'chunk2']
+    stats = queue.stats()
+    assert stats['sent'] == {TX_PRIORITY_MOTION: 1, TX_PRIORITY_COMMAND: 2, TX_PRIORITY_SCRIPT: 3}
+    assert stats['queued'] == {TX_PRIORITY_MOTION: 0, TX_PRIORITY_COMMAND: 0, TX_PRIORITY_SCRIPT: 0}
+    queue.stop()
+
+
+def test_transmit_queue_paces_per_destination():
+    sender = FakeSender()
+    queue = TransmitQueue(sender)
+    interval = 0.1
+    futures = [queue.submit('Bank1', f'a{i}', priority=TX_PRIORITY_SCRIPT, interval=interval) for i in range(3)]
+    futures.append(queue.submit('Bank2', 'b0', priority=TX_PRIORITY_SCRIPT, interval=interval))
+    futures.append(queue.submit('Bank1', 'go_init', priority=TX_PRIORITY_MOTION))
+    assert all(f.result(5) for f in futures)
+    times = {data: ts for _, data, ts in sender.sent}
+    assert times['a1'] - times['a0'] >= interval * 0.9
+    assert times['a2'] - times['a1'] >= interval * 0.9
+    assert times['b0'] - times['a0'] < interval         # 다른 목적지는 기다리지 않음
+    assert times['go_init'] < times['a2']                # 동작 명령은 페이싱을 무시
+    queue.stop()
+
+
+def test_transmit_queue_normalises_destination_with_resolve():
+    sender = FakeSender()
+    routes = {'Bank1': ('192.168.0.11', 7000)}
+    queue = TransmitQueue(sender, resolve=routes.get)
+    interval = 0.1
+    futures = [queue.submit('Bank1', 'name', priority=TX_PRIORITY_SCRIPT, interval=interval),
+               queue.submit(('192.168.0.11', 7000), 'tuple', priority=TX_PRIORITY_SCRIPT, interval=interval),
+               queue.submit('Bank9', 'unknown')]       # 해석 불가 → 원래 값 그대로
+    assert all(f.result(5) for f in futures)
+    sent = {data: (addr, ts) for addr, data, ts in sender.sent}
+    assert sent['name'][0] == sent['tuple'][0] == ('192.168.0.11', 7000)
+    assert sent['tuple'][1] - sent['name'][1] >= interval * 0.9   # 같은 카드로 보고 페이싱
+    assert sent['unknown'][0] == 'Bank9'
+    queue.stop()
+
+
+def test_transmit_queue_reports_send_failure_and_callback():
+    results = []
+    queue = TransmitQueue(FakeSender(result=False))
+    future = queue.submit('Bank1', 'Script query', callback=results.append)
+    assert future.result(5) is False
+    assert results == [False]
+
+    def broken(addr, data):
+        raise OSError('unreachable')
+
+    queue2 = TransmitQueue(broken)
+    assert queue2.submit('Bank1', 'x').result(5) is False
+    queue.stop()
+    queue2.stop()
+
+
+def test_transmit_queue_stop_completes_pending_with_false():
+    sender = FakeSender()
+    queue = TransmitQueue(sender)
+    sender.block()
+    first = queue.submit('Bank1', 'busy')
+    assert sender.entered.wait(5)
+    pending = [queue.submit('Bank1', f'chunk{i}', priority=TX_PRIORITY_SCRIPT) for i in range(3)]
+    queue.stop()
+    assert [f.result(1) for f in pending] == [False, False, False]
+    assert queue.pending() == 0
+    assert queue.submit('Bank1', 'late') is None       # 중지 후 적재 불가
+    sender.gate.set()
+    assert first.result(5) is True                    # 이미 송신 중이던 항목은 그대로 완료
+    assert [data for _, data, _ in sender.sent] == ['busy']
+
+
+SYSINFO = """<sysInfo><clients>
+<bank ip="192.168.0.11" number="1"/><bank ip="192.168.0.12" number="2"/><bank ip="192.168.0.11" number="9"/>
+</clients></sysInfo>"""
+
+
+def test_routing_table_lookup_and_stats(tmp_path):
+    path = tmp_path / 'sysInfo.xml'
+    path.write_text(SYSINFO, encoding='utf-8')
+    routes = BankRoutingTable(str(path))
+    assert routes.load()
+    assert routes.lookup('192.168.0.11') == '1'          # 중복 IP는 첫 항목
+    assert routes.lookup('10.0.0.1') is None
+    assert routes.stats() == {'hits': 1, 'misses': 1, 'reloads': 0, 'entries': 2}
+
+
+def test_routing_table_counters_are_consistent_across_threads(tmp_path):
+    path = tmp_path / 'sysInfo.xml'
+    path.write_text(SYSINFO, encoding='utf-8')
+    routes = BankRoutingTable(str(path))
+    routes.load()
+
+    def worker():
+        for i in range(2000):
+            routes.lookup('192.168.0.12' if i % 2 else '10.0.0.1')
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats = routes.stats()
+    assert (stats['hits'], stats['misses']) == (4000, 4000)